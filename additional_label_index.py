@@ -0,0 +1,108 @@
+import os
+import re
+import threading
+import time
+
+from dir_crawler import list_files, walk
+
+_SUFFIX_PATTERN = re.compile(r'(_conf\d+)?(_TP|_FP)?$')
+
+
+def clean_base_name(base_name):
+    """파일명(확장자 제외)에서 '_conf', '_TP', '_FP' 접미사 제거"""
+    return _SUFFIX_PATTERN.sub('', base_name)
+
+
+def _group_label_files(dir_path, file_names):
+    """폴더의 라벨 파일 이름 목록을 {접미사를 뗀 이름: [경로]}로 묶음"""
+    groups = {}
+    for file_name in sorted(file_names):
+        groups.setdefault(clean_base_name(os.path.splitext(file_name)[0]), []).append(
+            os.path.join(dir_path, file_name))
+    return groups
+
+
+class AdditionalLabelIndex:
+    """추가 라벨 폴더의 (상대 폴더, 접미사를 뗀 이름) -> 라벨 파일 경로 색인
+
+    - build()는 폴더 전체를 한 번 병렬로 읽어 색인을 만든다 (백그라운드 스레드에서 호출).
+    - 조회는 폴더 수정 시각 확인(stat 한 번)과 딕셔너리 조회뿐이다. 폴더 수정 시각이 바뀌었거나
+      아직 색인에 없는 폴더면 그 폴더만 다시 읽는다 (파일 추가/삭제/이름 변경은 폴더 수정 시각을 바꿈).
+    - build() 도중에도 조회할 수 있고, 그 사이 조회로 읽은 폴더는 build() 결과보다 우선한다.
+    """
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self._directories = {}  # 상대 폴더 ('' = 루트) -> (폴더 수정 시각 ns, {접미사를 뗀 이름: [경로]})
+        self._lock = threading.Lock()
+        self.ready = False
+        self.build_seconds = 0.0
+        self.lookups = 0
+        self.rescans = 0
+
+    def build(self, is_cancelled=None):
+        """폴더 전체를 읽어 색인 생성 - 끝까지 읽었으면 True, 취소되면 False"""
+        started = time.perf_counter()
+        cancel_event = threading.Event()
+        built = {}
+        for dir_path, file_names in walk(self.root_path, '.txt', cancel_event=cancel_event):
+            if is_cancelled is not None and is_cancelled():
+                cancel_event.set()
+                return False
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+            relative_dir = os.path.relpath(dir_path, self.root_path)
+            built['' if relative_dir == '.' else relative_dir] = (mtime_ns, _group_label_files(dir_path, file_names))
+
+        with self._lock:
+            # 만드는 사이 조회하며 다시 읽은 폴더는 더 최신이므로 유지
+            built.update(self._directories)
+            self._directories = built
+        self.ready = True
+        self.build_seconds = time.perf_counter() - started
+        return True
+
+    def _directory(self, relative_dir):
+        """상대 폴더의 {접미사를 뗀 이름: [경로]} - 바뀌었거나 색인에 없으면 다시 읽음"""
+        dir_path = os.path.join(self.root_path, relative_dir)
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return {}
+        with self._lock:
+            entry = self._directories.get(relative_dir)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1]
+
+        # 수정 시각을 먼저 읽고 목록을 읽으므로, 그 사이에 바뀌면 다음 조회에서 다시 읽힌다
+        groups = _group_label_files(dir_path, [os.path.basename(path) for path, _ in list_files(dir_path, '.txt')])
+        with self._lock:
+            self._directories[relative_dir] = (mtime_ns, groups)
+            self.rescans += 1
+        return groups
+
+    def lookup(self, relative_dir, base_name):
+        """상대 폴더에서 접미사를 뗀 이름이 base_name과 같은 라벨 파일 경로 목록"""
+        self.lookups += 1
+        return list(self._directory(relative_dir).get(clean_base_name(base_name), ()))
+
+    def label_paths(self, image_path, main_folder):
+        """메인 폴더 이미지에 대응하는 라벨 파일 경로 목록 (같은 상대 폴더, 접미사를 뗀 이름이 같은 파일)"""
+        relative_path = os.path.relpath(image_path, main_folder)
+        base_name = os.path.splitext(os.path.basename(relative_path))[0]
+        return self.lookup(os.path.dirname(relative_path), base_name)
+
+    def invalidate(self, relative_dir=None):
+        """폴더 하나 (None이면 전체)를 다음 조회에서 다시 읽게 함"""
+        with self._lock:
+            if relative_dir is None:
+                self._directories.clear()
+                self.ready = False
+            else:
+                self._directories.pop(relative_dir, None)
+
+    def stats(self):
+        return {"ready": self.ready, "directories": len(self._directories), "lookups": self.lookups,
+                "rescans": self.rescans, "build_seconds": self.build_seconds}
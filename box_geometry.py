@@ -0,0 +1,187 @@
+import time
+
+import numpy as np
+
+# 한 번에 계산할 박스 쌍 수 상한 (묶음 계산의 중간 배열 크기 제한, 쌍당 float32 여러 개)
+MAX_PAIRS_PER_CHUNK = 4_000_000
+# 이 이상 박스 쌍이 있는 이미지는 묶지 않고 따로 계산
+SMALL_IMAGE_PAIRS = 4096
+
+
+def yolo_to_corners(labels):
+    """YOLO 라벨 (N, 5) [class_id, x_center, y_center, width, height] 또는 (N, 4) 박스를
+    (N, 4) [x_min, y_min, x_max, y_max] float32 배열로 변환"""
+    labels = np.asarray(labels, dtype=np.float32)
+    boxes = labels[:, -4:] if labels.ndim == 2 else np.empty((0, 4), dtype=np.float32)
+    half_size = boxes[:, 2:4] / 2
+    return np.concatenate((boxes[:, 0:2] - half_size, boxes[:, 0:2] + half_size), axis=1)
+
+
+def labels_to_array(labels):
+    """라벨 딕셔너리 목록 ({'class_id', 'x_center', 'y_center', 'width', 'height'}) 또는 배열을 (N, 5) 배열로 변환"""
+    if isinstance(labels, np.ndarray):
+        return labels
+    if not labels:
+        return np.empty((0, 5), dtype=np.float32)
+    return np.array([[label['class_id'], label['x_center'], label['y_center'], label['width'], label['height']]
+                     for label in labels], dtype=np.float32)
+
+
+def _pair_iou(corners1, corners2):
+    """같은 모양의 모서리 좌표 배열끼리 원소별 IoU (브로드캐스팅 가능)"""
+    inter_width = np.minimum(corners1[..., 2], corners2[..., 2]) - np.maximum(corners1[..., 0], corners2[..., 0])
+    inter_height = np.minimum(corners1[..., 3], corners2[..., 3]) - np.maximum(corners1[..., 1], corners2[..., 1])
+    inter_area = np.clip(inter_width, 0, None) * np.clip(inter_height, 0, None)
+    area1 = (corners1[..., 2] - corners1[..., 0]) * (corners1[..., 3] - corners1[..., 1])
+    area2 = (corners2[..., 2] - corners2[..., 0]) * (corners2[..., 3] - corners2[..., 1])
+    union_area = area1 + area2 - inter_area
+    # 겹치지 않거나 면적이 0인 박스끼리는 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(inter_area > 0, inter_area / union_area, 0).astype(np.float32)
+
+
+def iou_matrix(labels1, labels2):
+    """두 라벨 세트의 (N, M) IoU 행렬 - [i, j]는 labels1의 i번째와 labels2의 j번째 박스의 IoU"""
+    corners1 = yolo_to_corners(labels1)
+    corners2 = yolo_to_corners(labels2)
+    return _pair_iou(corners1[:, None, :], corners2[None, :, :])
+
+
+def overlap_matrix(labels1, labels2):
+    """두 라벨 세트의 (N, M) 겹침 여부 행렬 (교집합 면적이 0보다 크면 True)"""
+    corners1 = yolo_to_corners(labels1)[:, None, :]
+    corners2 = yolo_to_corners(labels2)[None, :, :]
+    return ((np.minimum(corners1[..., 2], corners2[..., 2]) > np.maximum(corners1[..., 0], corners2[..., 0]))
+            & (np.minimum(corners1[..., 3], corners2[..., 3]) > np.maximum(corners1[..., 1], corners2[..., 1])))
+
+
+def any_iou_at_least(labels1, labels2, threshold=0.7):
+    """한 쌍이라도 IoU가 threshold 이상이면 True"""
+    if len(labels1) == 0 or len(labels2) == 0:
+        return False
+    return bool((iou_matrix(labels1, labels2) >= threshold).any())
+
+
+def batch_iou_matrices(label_pairs):
+    """여러 이미지의 (labels1, labels2) 쌍을 한 번에 계산해 이미지별 (N_i, M_i) IoU 행렬 목록 반환
+
+    - 박스 쌍이 적은 이미지들은 패딩 없이 모든 박스 쌍을 한 줄로 펼쳐 한 번에 계산한다
+      (이미지마다 iou_matrix를 부르는 호출 비용을 줄임).
+    - 박스 쌍이 SMALL_IMAGE_PAIRS 이상인 이미지는 펼치는 비용이 더 크므로 이미지별 브로드캐스팅으로 계산한다.
+    - 펼친 쌍이 MAX_PAIRS_PER_CHUNK를 넘으면 나눠 계산한다.
+    """
+    label_pairs = list(label_pairs)
+    matrices = [None] * len(label_pairs)
+    small, pair_count = [], 0
+    for position, (labels1, labels2) in enumerate(label_pairs):
+        count = len(labels1) * len(labels2)
+        if count >= SMALL_IMAGE_PAIRS:
+            matrices[position] = iou_matrix(labels1, labels2)
+            continue
+        if pair_count + count > MAX_PAIRS_PER_CHUNK:
+            _fill_batch(label_pairs, small, matrices)
+            small, pair_count = [], 0
+        small.append(position)
+        pair_count += count
+    _fill_batch(label_pairs, small, matrices)
+    return matrices
+
+
+def _fill_batch(label_pairs, positions, matrices):
+    if positions:
+        for position, matrix in zip(positions, _batch_chunk([label_pairs[position] for position in positions])):
+            matrices[position] = matrix
+
+
+def _batch_chunk(label_pairs):
+    counts1 = np.array([len(labels1) for labels1, _ in label_pairs], dtype=np.int64)
+    counts2 = np.array([len(labels2) for _, labels2 in label_pairs], dtype=np.int64)
+    pair_counts = counts1 * counts2
+    total = int(pair_counts.sum())
+    if total == 0:
+        return [np.zeros((n, m), dtype=np.float32) for n, m in zip(counts1, counts2)]
+
+    corners1 = yolo_to_corners(np.concatenate([labels1 for labels1, _ in label_pairs if len(labels1)]))
+    corners2 = yolo_to_corners(np.concatenate([labels2 for _, labels2 in label_pairs if len(labels2)]))
+    offsets1 = np.concatenate(([0], np.cumsum(counts1)[:-1]))
+    offsets2 = np.concatenate(([0], np.cumsum(counts2)[:-1]))
+    pair_starts = np.concatenate(([0], np.cumsum(pair_counts)))
+
+    # 펼친 쌍 k -> (이미지, 이미지 안의 i, j) -> 전체 박스 배열의 위치
+    image_of_pair = np.repeat(np.arange(len(label_pairs)), pair_counts)
+    local = np.arange(total) - pair_starts[image_of_pair]
+    columns = counts2[image_of_pair]
+    index1 = offsets1[image_of_pair] + local // columns
+    index2 = offsets2[image_of_pair] + local % columns
+    flat_iou = _pair_iou(corners1[index1], corners2[index2])
+
+    return [flat_iou[pair_starts[i]:pair_starts[i + 1]].reshape(counts1[i], counts2[i])
+            for i in range(len(label_pairs))]
+
+
+def batch_any_iou_at_least(label_pairs, threshold=0.7):
+    """여러 이미지의 (labels1, labels2) 쌍마다 IoU가 threshold 이상인 쌍이 있는지 (bool 배열)"""
+    return np.array([matrix.size > 0 and bool((matrix >= threshold).any())
+                     for matrix in batch_iou_matrices(label_pairs)], dtype=bool)
+
+
+def _loop_iou(box1, box2):
+    """벤치마크 비교용 - 기존 뷰의 박스 한 쌍 IoU 계산 (파이썬 루프)"""
+    x1_min, x1_max = box1[1] - box1[3] / 2, box1[1] + box1[3] / 2
+    y1_min, y1_max = box1[2] - box1[4] / 2, box1[2] + box1[4] / 2
+    x2_min, x2_max = box2[1] - box2[3] / 2, box2[1] + box2[3] / 2
+    y2_min, y2_max = box2[2] - box2[4] / 2, box2[2] + box2[4] / 2
+    x_inter_min, x_inter_max = max(x1_min, x2_min), min(x1_max, x2_max)
+    y_inter_min, y_inter_max = max(y1_min, y2_min), min(y1_max, y2_max)
+    if x_inter_max <= x_inter_min or y_inter_max <= y_inter_min:
+        return 0.0
+    inter_area = (x_inter_max - x_inter_min) * (y_inter_max - y_inter_min)
+    return inter_area / ((x1_max - x1_min) * (y1_max - y1_min) + (x2_max - x2_min) * (y2_max - y2_min) - inter_area)
+
+
+def random_labels(count, rng):
+    """벤치마크용 임의 YOLO 라벨 (count, 5)"""
+    labels = np.empty((count, 5), dtype=np.float32)
+    labels[:, 0] = rng.integers(0, 5, count)
+    labels[:, 3:5] = rng.uniform(0.005, 0.1, (count, 2))
+    labels[:, 1:3] = rng.uniform(0.05, 0.95, (count, 2))
+    return labels
+
+
+def benchmark(image_count=20, box_count=300, seed=0):
+    """파이썬 쌍 루프와 벡터화 IoU 행렬의 전체 쌍 계산 시간 비교 (초)"""
+    rng = np.random.default_rng(seed)
+    label_pairs = []
+    for _ in range(image_count):
+        labels1 = random_labels(box_count, rng)
+        labels2 = labels1.copy()
+        labels2[:, 1:3] += rng.normal(0, 0.005, (box_count, 2))
+        label_pairs.append((labels1, labels2))
+
+    started = time.perf_counter()
+    loop_results = [[[_loop_iou(box1, box2) for box2 in labels2.tolist()] for box1 in labels1.tolist()]
+                    for labels1, labels2 in label_pairs]
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix_results = [iou_matrix(labels1, labels2) for labels1, labels2 in label_pairs]
+    matrix_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_results = batch_iou_matrices(label_pairs)
+    batch_seconds = time.perf_counter() - started
+
+    for loop_result, matrix_result, batch_result in zip(loop_results, matrix_results, batch_results):
+        assert np.allclose(loop_result, matrix_result, atol=1e-5)
+        assert np.array_equal(matrix_result, batch_result)
+    return {"pairs": image_count * box_count * box_count, "loop": loop_seconds,
+            "matrix": matrix_seconds, "batch": batch_seconds}
+
+
+if __name__ == "__main__":
+    for box_count in (10, 100, 300, 1000):
+        result = benchmark(image_count=max(1, 6000 // box_count), box_count=box_count)
+        print(f"박스 {box_count:4d}개 x {max(1, 6000 // box_count):3d}장 ({result['pairs']:,} 쌍): "
+              f"루프 {result['loop']:.3f}s, 행렬 {result['matrix']:.4f}s "
+              f"({result['loop'] / result['matrix']:.0f}배), 묶음 {result['batch']:.4f}s "
+              f"({result['loop'] / result['batch']:.0f}배)")
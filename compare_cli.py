@@ -0,0 +1,116 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+
+from comparison_runner import CHUNK_SIZE, ComparisonRunner
+from label_matching import DEFAULT_MATCH_IOU, MODE_REPORT, REPORT_FIELDS
+
+
+class ReportWriter:
+    """이미지별 기록을 JSONL 또는 CSV로 쓰는 출력 - 묶음마다 flush"""
+
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.statuses = Counter()
+        if output_format == "csv":
+            self._csv_writer = csv.DictWriter(stream, fieldnames=REPORT_FIELDS)
+            self._csv_writer.writeheader()
+        else:
+            self._csv_writer = None
+
+    def write_rows(self, rows):
+        if self._csv_writer is not None:
+            self._csv_writer.writerows(rows)
+        else:
+            self.stream.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        self.stream.flush()
+        self.statuses.update(row["status"] for row in rows)
+
+
+class ProgressPrinter:
+    """진행 상황을 stderr에 interval초마다 한 줄씩 출력"""
+
+    def __init__(self, interval=5.0, quiet=False):
+        self.interval = interval
+        self.quiet = quiet
+        self.started = time.perf_counter()
+        self._last = 0.0
+
+    def __call__(self, done, total):
+        now = time.perf_counter()
+        if self.quiet or (now - self._last < self.interval and done < total):
+            return
+        self._last = now
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"{done}/{total} ({rate:.0f}장/초, {elapsed:.0f}초)", file=sys.stderr, flush=True)
+
+
+def output_format_for(output_path, requested=None):
+    """--format이 없으면 출력 파일 확장자로 결정 (.csv면 CSV, 나머지는 JSONL)"""
+    if requested:
+        return requested
+    return "csv" if output_path.lower().endswith(".csv") else "jsonl"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="메인 라벨(정답)과 추가 라벨(비교 대상) 폴더를 이미지별로 일대일 매칭해 비교")
+    parser.add_argument("main_folder", help="이미지와 메인 라벨(.txt)이 있는 데이터셋 루트")
+    parser.add_argument("additional_folder", help="같은 상대 경로에 추가 라벨(.txt)이 있는 폴더")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: 표준 출력)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="출력 형식 (기본: 확장자로 결정, 없으면 jsonl)")
+    parser.add_argument("--iou", type=float, default=DEFAULT_MATCH_IOU, help="매칭으로 인정하는 IoU")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: 코어 수)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="작업 프로세스에 한 번에 넘기는 이미지 수")
+    parser.add_argument("--quiet", action="store_true", help="진행 상황 출력 안 함")
+    args = parser.parse_args(argv)
+    if not 0 < args.iou <= 1:
+        parser.error(f"--iou는 0보다 크고 1 이하여야 함: {args.iou}")
+    for folder in (args.main_folder, args.additional_folder):
+        if not os.path.isdir(folder):
+            parser.error(f"폴더가 없음: {folder}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    runner = ComparisonRunner(MODE_REPORT, args.main_folder, args.additional_folder, args.iou,
+                              max_workers=args.workers, chunk_size=args.chunk_size)
+    progress = ProgressPrinter(quiet=args.quiet)
+    output_format = output_format_for(args.output, args.format)
+
+    completed = False
+    exit_code = 1
+    try:
+        stream = sys.stdout if args.output == "-" else open(args.output, 'w', newline='', encoding='utf-8')
+        writer = ReportWriter(stream, output_format)
+        try:
+            completed = runner.run(writer.write_rows, progress)
+            exit_code = 0
+        except KeyboardInterrupt:
+            runner.cancel()
+            exit_code = 130
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+    except (OSError, ValueError, BrokenProcessPool) as e:
+        print(f"라벨 비교 실패: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.perf_counter() - progress.started
+    state = "완료" if completed else "중단 (그때까지의 결과만 기록)"
+    print(f"{state}: 이미지 {runner.done}/{runner.total}장, {elapsed:.1f}초, 작업 프로세스 {runner.max_workers}개",
+          file=sys.stderr)
+    print("상태: " + ", ".join(f"{status} {count}" for status, count in sorted(writer.statuses.items())),
+          file=sys.stderr)
+    print(runner.report.summary(), file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PySide6.QtCore import QObject, Signal
+
+from comparison_runner import ComparisonRunner
+from label_matching import MODE_MATCH
+
+
+class ComparisonJob(QObject):
+    """라벨 비교를 백그라운드에서 실행하고 결과를 출력 파일에 바로바로 기록
+
+    - 작업 스레드 하나가 ComparisonRunner(프로세스 풀)를 돌리므로 GUI 스레드는 막히지 않는다.
+    - MODE_MATCH는 CSV (이미지 경로, 매칭, 누락, 추가), 나머지는 이미지 경로 목록 텍스트 파일
+    - 묶음마다 파일을 flush하므로 취소하거나 실패해도 그때까지의 결과는 파일에 남는다.
+    """
+    progress = Signal(int, int)  # (비교한 이미지 수, 전체 이미지 수) - 작업 스레드에서 emit
+    finished = Signal(bool)  # 끝까지 마쳤으면 True, 취소됐으면 False
+    failed = Signal(str)
+
+    def __init__(self, mode, main_folder, additional_folder, output_file, threshold, parent=None):
+        super().__init__(parent)
+        self.output_file = output_file
+        self.runner = ComparisonRunner(mode, main_folder, additional_folder, threshold)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="comparison")
+        self._running = False
+        self.started = None
+        self.seconds = 0.0
+
+    @property
+    def mode(self):
+        return self.runner.mode
+
+    @property
+    def report(self):
+        """MODE_MATCH의 전체 집계 (MatchReport) - 다른 방식이면 None"""
+        return self.runner.report
+
+    def start(self):
+        self._running = True
+        self.started = time.perf_counter()
+        self._executor.submit(self._run)
+
+    def cancel(self):
+        """남은 묶음은 버리고 중단 (이미 기록한 결과는 유지)"""
+        self.runner.cancel()
+
+    def is_running(self):
+        return self._running
+
+    def _run(self):
+        try:
+            with open(self.output_file, 'w', newline='') as f:
+                if self.mode == MODE_MATCH:
+                    writer = csv.writer(f)
+                    writer.writerow(["image_path", "matched", "missed", "extra"])
+                    write_rows = writer.writerows
+                else:
+                    write_rows = lambda rows: f.writelines(path + '\n' for path in rows)
+
+                def on_rows(rows):
+                    write_rows(rows)
+                    f.flush()
+
+                completed = self.runner.run(on_rows, self.progress.emit)
+        except (OSError, ValueError, BrokenProcessPool) as e:
+            print(f"라벨 비교 실패: {e}")
+            self._stop()
+            self.failed.emit(str(e))
+            return
+        self._stop()
+        self.finished.emit(completed)
+
+    def _stop(self):
+        self.seconds = time.perf_counter() - self.started
+        self._running = False
+        self._executor.shutdown(wait=False)
+
+    def summary(self):
+        """완료 창에 보여줄 요약 문구"""
+        runner = self.runner
+        lines = [f"이미지 {runner.done}/{runner.total}장 비교 ({self.seconds:.1f}초), 기록 {runner.recorded}건"]
+        if self.report is not None:
+            lines.append(self.report.summary())
+        lines.append(f"저장: {self.output_file}")
+        return "\n".join(lines)
+
+    def stats(self):
+        return {"running": self._running, "done": self.runner.done, "total": self.runner.total,
+                "recorded": self.runner.recorded, "workers": self.runner.max_workers}
@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from dir_crawler import crawl_paths
+from label_matching import (IMAGE_EXTENSIONS, MODE_MATCH, MODE_NON_OVERLAPPING, MODE_REPORT, MatchReport,
+                            compare_chunk, unique_base_name_paths)
+
+# 작업 프로세스에 한 번에 넘기는 이미지 수
+CHUNK_SIZE = 1024
+
+
+class ComparisonRunner:
+    """데이터셋 전체 라벨 비교를 프로세스 풀에서 이미지 묶음 단위로 실행 (Qt 없이 동작)
+
+    - 이미지 목록을 먼저 모아 정렬한 뒤 CHUNK_SIZE씩 나눠 작업 프로세스에 넘긴다.
+    - 결과는 넘긴 순서대로 on_rows로 바로 내보내므로 출력 파일이 실행 중에도 조금씩 채워진다.
+    - 작업 중인 묶음은 작업 수의 두 배까지만 두어 결과가 메모리에 쌓이지 않게 한다.
+    - cancel()하면 아직 시작하지 않은 묶음은 버리고 이미 내보낸 결과는 그대로 둔다.
+    """
+
+    def __init__(self, mode, main_folder, additional_folder, threshold, max_workers=None, chunk_size=CHUNK_SIZE):
+        self.mode = mode
+        self.main_folder = main_folder
+        self.additional_folder = additional_folder
+        self.threshold = threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.report = MatchReport(threshold) if mode in (MODE_MATCH, MODE_REPORT) else None
+        self.total = 0  # 비교할 이미지 수
+        self.done = 0  # 비교를 마친 이미지 수
+        self.recorded = 0  # 출력한 행 수
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def collect_image_paths(self):
+        """비교할 이미지 경로 (정렬, MODE_NON_OVERLAPPING이면 접미사를 뗀 이름이 같은 이미지는 첫 번째만)"""
+        image_paths = sorted(crawl_paths(self.main_folder, IMAGE_EXTENSIONS, cancel_event=self._cancel_event))
+        if self.mode == MODE_NON_OVERLAPPING:
+            image_paths = unique_base_name_paths(image_paths)
+        return image_paths
+
+    def run(self, on_rows, on_progress=None):
+        """비교 실행 - 끝까지 마쳤으면 True, 취소됐으면 False (작업 프로세스의 예외는 그대로 전달)
+
+        on_rows(rows)는 묶음마다 출력할 행 목록으로, on_progress(done, total)는 묶음마다 불린다.
+        """
+        image_paths = self.collect_image_paths()
+        self.total = len(image_paths)
+        if on_progress is not None:
+            on_progress(self.done, self.total)
+        if self.is_cancelled() or not image_paths:
+            return not self.is_cancelled()
+
+        # GUI 프로세스를 fork하지 않도록 spawn으로 작업 프로세스 시작
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        pending = deque()
+        try:
+            for start in range(0, self.total, self.chunk_size):
+                if self.is_cancelled():
+                    break
+                chunk = image_paths[start:start + self.chunk_size]
+                pending.append((len(chunk), executor.submit(compare_chunk, self.mode, chunk, self.main_folder,
+                                                            self.additional_folder, self.threshold)))
+                if len(pending) >= self.max_workers * 2:
+                    self._collect(pending.popleft(), on_rows, on_progress)
+            while pending and not self.is_cancelled():
+                self._collect(pending.popleft(), on_rows, on_progress)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return not self.is_cancelled()
+
+    def _collect(self, chunk_future, on_rows, on_progress):
+        count, future = chunk_future
+        rows, report = future.result()
+        if report is not None:
+            self.report.merge(report)
+        if rows:
+            on_rows(rows)
+        self.recorded += len(rows)
+        self.done += count
+        if on_progress is not None:
+            on_progress(self.done, self.total)
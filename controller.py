@@ -1,6 +1,8 @@
-from PySide6.QtWidgets import QFileDialog
+from PySide6.QtWidgets import QFileDialog, QInputDialog, QMessageBox
 from PySide6.QtCore import QObject, Qt, QSettings
+from label_query import LabelQuery
 from model import ImageViewerModel
+from triage import format_bins, parse_bins
 from view import ImageViewerView
 import numpy as np
 import os
@@ -12,6 +14,7 @@ class ImageViewerController(QObject):
 
         self.settings = QSettings("jameslee0227@gmail.com", "ImageViewer")
         self.recent_folders = self.load_recent_folders()
+        self.model.triage_bins = self.load_triage_bins()
 
         self.view = ImageViewerView(self)
         self.labels_visible = True
@@ -19,11 +22,36 @@ class ImageViewerController(QObject):
 
         # 모델 시그널을 뷰 슬롯에 연결
         self.model.image_changed.connect(self.view.display_image)
-        self.model.labels_changed.connect(self.view.display_labels)
+        self.model.prefetcher.image_ready.connect(self.view.on_full_image_ready)
+        self.model.dataset_changed.connect(self.view.on_dataset_changed)
+        self.model.move_failed.connect(self.view.on_move_failed)
+        self.model.triage_updated.connect(self.view.update_triage_status)
 
         # 뷰 시그널을 컨트롤러 슬롯에 연결
         self.view.tree_view.selectionModel().selectionChanged.connect(self.on_selection_changed)
 
+    def load_triage_bins(self):
+        """저장된 분류 폴더 단축키 설정 (없거나 잘못되면 기본값)"""
+        try:
+            return parse_bins(self.settings.value("triage_bins", ""))
+        except ValueError:
+            return dict(self.model.triage_bins)
+
+    def configure_triage_bins(self):
+        """분류 폴더 단축키 설정 대화상자"""
+        text, ok = QInputDialog.getText(self.view, "Triage Bins", "단축키=폴더 접미사 (예: 1=_cut, 2=_relabel, 3=_hard)",
+                                        text=format_bins(self.model.triage_bins))
+        if not ok:
+            return
+        try:
+            bins = parse_bins(text)
+        except ValueError as e:
+            QMessageBox.warning(self.view, "오류", f"잘못된 설정입니다: {e}")
+            return
+        self.model.triage_bins = bins
+        self.settings.setValue("triage_bins", format_bins(bins))
+        self.view.update_triage_status()
+
     def load_recent_folders(self):
         #folders = self.settings.value("recent_folders", [])
         #return list(dict.fromkeys(folders))[:10]
@@ -43,7 +71,8 @@ class ImageViewerController(QObject):
         indexes = self.view.tree_view.selectionModel().selectedIndexes()
         if indexes:
             image_path = self.model.get_image_path(indexes[0])
-            if image_path:
+            # 표시 중인 이미지에 트리를 맞춘 경우는 다시 불러오지 않음
+            if image_path and image_path != getattr(self.view, 'current_image_path', None):
                 self.load_image(image_path)
 
     def open_folder(self):
@@ -67,13 +96,37 @@ class ImageViewerController(QObject):
         self.view.update_recent_folders_menu()
 
 
+    def query_labels(self):
+        """라벨 쿼리를 입력받아 일치하는 이미지만 트리 뷰에 표시하고 첫 이미지로 이동"""
+        text, ok = QInputDialog.getText(self.view, "Query Labels",
+                                        "조건 (예: class=3 boxes>10 area<0.001 aspect>4 label=no)",
+                                        text=self.settings.value("last_label_query", ""))
+        if not ok or not text.strip():
+            return
+        try:
+            query = LabelQuery.parse(text)
+        except ValueError as e:
+            QMessageBox.warning(self.view, "오류", f"잘못된 쿼리입니다: {e}")
+            return
+        result = self.model.query_labels(query)
+        if result is None:
+            QMessageBox.information(self.view, "알림", "라벨 요약을 만드는 중입니다. 잠시 후 다시 시도하세요.")
+            return
+        self.settings.setValue("last_label_query", text)
+        self.view.show_query_result(result)
+        if result.image_paths:
+            self.load_image(result.image_paths[0])
+
+    def clear_label_query(self):
+        """라벨 쿼리 해제"""
+        self.model.clear_label_query()
+        self.view.show_query_result(None)
+
     def load_image(self, image_path):
         """이미지 로드 및 표시"""
         if image_path:
             self.view.save_scroll_position()
             self.model.image_changed.emit(image_path)
-            if self.labels_visible:
-                self.model.get_label_path(image_path)
 
     def create_cut_folder(self):
         """잘라내기 폴더 생성"""
@@ -81,12 +134,47 @@ class ImageViewerController(QObject):
             self.model.create_cut_folder()
 
     def move_data_file(self):
-        """현재 선택된 이미지 파일 이동"""
+        """현재 선택된 이미지 파일 이동 (잘라내기 폴더)"""
+        self.route_current_image("_cut")
+
+    def route_to_bin(self, key):
+        """단축키 1~9에 지정한 분류 폴더로 현재 이미지 이동"""
+        bin_suffix = self.model.triage_bins.get(key)
+        if bin_suffix is None:
+            self.view.statusBar().showMessage(f"{key}번 분류 폴더가 지정되지 않았습니다.", 3000)
+            return
+        self.route_current_image(bin_suffix)
+
+    def route_current_image(self, bin_suffix):
+        """현재 선택된 이미지를 분류 폴더로 이동 (이동은 백그라운드, 화면은 바로 다음 이미지)"""
         self.create_cut_folder()
         selected_image = self.view.get_current_image_path()
         if selected_image:
             self.view.save_scroll_position()
-            self.model.move_data_file(selected_image)
+            self.model.move_data_file(selected_image, bin_suffix)
+
+    def undo_move(self):
+        """마지막 잘라내기 되돌리기 (되돌린 이미지는 이동이 끝나면 표시)"""
+        if not self.model.undo_move():
+            self.view.statusBar().showMessage("되돌릴 이동이 없습니다.", 3000)
+
+    def redo_move(self):
+        """되돌린 잘라내기 다시 실행 - 보고 있던 이미지면 다음 이미지로"""
+        image_path = self.model.redo_move()
+        if image_path is None:
+            self.view.statusBar().showMessage("다시 할 이동이 없습니다.", 3000)
+        elif image_path == getattr(self.view, 'current_image_path', None):
+            self.load_image(self.model.get_next_image_path(image_path))
+
+    def undo_session_moves(self):
+        """이번 세션의 잘라내기를 모두 되돌리기"""
+        count = len(self.model.move_history.session_groups(self.model.move_session))
+        if not count:
+            self.view.statusBar().showMessage("이번 세션에 되돌릴 이동이 없습니다.", 3000)
+            return
+        answer = QMessageBox.question(self.view, "확인", f"이번 세션에 잘라낸 {count}개를 모두 되돌릴까요?")
+        if answer == QMessageBox.Yes:
+            self.model.undo_session_moves()
 
     def toggle_labels(self):
         """레이블 표시/숨김 전환"""
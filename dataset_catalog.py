@@ -0,0 +1,287 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+
+from PySide6.QtCore import QStandardPaths
+from PySide6.QtGui import QImageReader
+
+from dataset_index import IMAGE_EXTENSIONS, natural_sort_key, normalize_path
+from dir_crawler import read_directory, stat_paths
+from label_repository import read_label_file
+
+# 열 구성이 바뀌면 올림 - 다른 버전의 카탈로그는 지우고 다시 만듦 (파일 시스템에서 다시 읽을 수 있는 캐시)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    rel_dir TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS images (
+    rel_path TEXT PRIMARY KEY,
+    rel_dir TEXT NOT NULL,
+    position INTEGER,
+    size INTEGER,
+    mtime_ns INTEGER,
+    width INTEGER,
+    height INTEGER,
+    label_path TEXT,
+    label_mtime_ns INTEGER,
+    label_size INTEGER,
+    label_count INTEGER,
+    class_histogram TEXT
+);
+CREATE INDEX IF NOT EXISTS images_rel_dir ON images (rel_dir, position);
+CREATE INDEX IF NOT EXISTS images_position ON images (position);
+"""
+
+
+class CatalogScanResult:
+    """증분 스캔 결과 요약"""
+
+    def __init__(self):
+        self.scanned_dirs = 0
+        self.changed_dirs = 0
+        self.added = 0
+        self.updated = 0
+        self.removed = 0
+        self.seconds = 0.0
+        self.cancelled = False
+
+    @property
+    def changed(self):
+        return bool(self.added or self.updated or self.removed)
+
+    def __repr__(self):
+        return (f"CatalogScanResult(dirs={self.scanned_dirs}, changed_dirs={self.changed_dirs}, "
+                f"added={self.added}, updated={self.updated}, removed={self.removed}, "
+                f"seconds={self.seconds:.2f}, cancelled={self.cancelled})")
+
+
+class DatasetCatalog:
+    """데이터셋 루트별 SQLite 카탈로그 - 다시 열 때 파일 시스템을 훑지 않고 바로 목록을 보여주기 위함
+
+    - 이미지마다 상대 경로, 크기, 수정 시각, 픽셀 크기, 라벨 경로, 라벨 수, 클래스별 개수를 기록
+    - scan()은 수정 시각이 바뀐 폴더만 다시 읽는다 (같은 폴더의 라벨 추가/삭제/이름 변경은 폴더 수정 시각으로 감지)
+    - 제자리에서 다시 쓴 라벨은 폴더 수정 시각을 바꾸지 않으므로 라벨 파일마다 수정 시각/크기를 기록해 비교한다
+    - 기록된 폴더와 라벨 파일의 stat은 스캔 시작 때 스레드 풀에서 한꺼번에 구한다 (네트워크 드라이브 지연 숨김)
+    """
+
+    def __init__(self, root_path, catalog_path=None):
+        self.root_path = normalize_path(os.path.abspath(root_path)).rstrip('/')
+        self.catalog_path = catalog_path or self._default_catalog_path(self.root_path)
+        self._lock = threading.Lock()
+        with self._connect() as connection:
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.executescript("DROP TABLE IF EXISTS images; DROP TABLE IF EXISTS directories;")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            connection.executescript(SCHEMA)
+
+    @staticmethod
+    def _default_catalog_path(root_path):
+        """사용자 앱 데이터 폴더의 카탈로그 경로 (데이터셋 루트 경로의 해시) - 데이터셋 폴더에는 아무것도 쓰지 않음"""
+        catalog_dir = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), "catalogs")
+        os.makedirs(catalog_dir, exist_ok=True)
+        digest = hashlib.sha1(root_path.encode("utf-8")).hexdigest()
+        return os.path.join(catalog_dir, digest + ".sqlite3")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.catalog_path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _absolute(self, rel_path):
+        return f"{self.root_path}/{rel_path}" if rel_path else self.root_path
+
+    def _relative(self, path):
+        return normalize_path(os.path.abspath(path))[len(self.root_path) + 1:]
+
+    def __len__(self):
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def image_paths(self):
+        """카탈로그의 이미지 절대 경로 (트리 뷰 표시 순서)"""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT rel_path FROM images ORDER BY position").fetchall()
+        return [self._absolute(rel_path) for rel_path, in rows]
+
+    def directory_paths(self):
+        """카탈로그에 기록된 폴더 절대 경로 (이미지가 없는 폴더 포함)"""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT rel_dir FROM directories").fetchall()
+        return [self._absolute(rel_dir) for rel_dir, in rows]
+
+    def get_record(self, image_path):
+        """이미지 한 장의 기록 dict - 없으면 None"""
+        with self._connect() as connection:
+            connection.row_factory = sqlite3.Row
+            row = connection.execute("SELECT * FROM images WHERE rel_path = ?",
+                                     (self._relative(image_path),)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["class_histogram"] = {int(class_id): count
+                                     for class_id, count in json.loads(row["class_histogram"] or "{}").items()}
+        return record
+
+    def scan(self, is_cancelled=None):
+        """파일 시스템과 카탈로그를 맞춤 (바뀐 폴더만 다시 읽음) - CatalogScanResult 반환"""
+        started = time.perf_counter()
+        result = CatalogScanResult()
+        with self._lock, self._connect() as connection:
+            stored_dirs = {rel_dir: mtime_ns for rel_dir, mtime_ns in
+                           connection.execute("SELECT rel_dir, mtime_ns FROM directories")}
+            children = defaultdict(list)
+            for rel_dir, parent in connection.execute("SELECT rel_dir, parent FROM directories"):
+                if parent is not None:
+                    children[parent].append(rel_dir)
+            stored_labels = defaultdict(list)
+            for rel_dir, label_path, label_mtime_ns, label_size in connection.execute(
+                    "SELECT rel_dir, label_path, label_mtime_ns, label_size FROM images WHERE label_path IS NOT NULL"):
+                stored_labels[rel_dir].append((self._absolute(label_path), label_mtime_ns, label_size))
+            # 바뀌지 않았는지 확인할 폴더/라벨 파일의 stat을 미리 병렬로 구함
+            stats = stat_paths([self._absolute(rel_dir) for rel_dir in stored_dirs] +
+                               [label[0] for labels in stored_labels.values() for label in labels])
+
+            ordered = []
+            seen_dirs = set()
+            stack = [""]
+            while stack:
+                if is_cancelled is not None and is_cancelled():
+                    result.cancelled = True
+                    break
+                rel_dir = stack.pop()
+                if isinstance(rel_dir, list):
+                    # 하위 폴더를 모두 처리한 뒤의 현재 폴더 파일 목록
+                    ordered.extend(rel_dir)
+                    continue
+                dir_path = self._absolute(rel_dir)
+                try:
+                    stat = stats[dir_path] if dir_path in stats else os.stat(dir_path)
+                except OSError:
+                    continue
+                if stat is None:
+                    continue
+                mtime_ns = stat.st_mtime_ns
+                seen_dirs.add(rel_dir)
+                result.scanned_dirs += 1
+
+                if stored_dirs.get(rel_dir) == mtime_ns and not self._labels_changed(stored_labels[rel_dir], stats):
+                    sub_dirs = sorted(children[rel_dir], key=lambda path: natural_sort_key(path.rsplit('/', 1)[-1]))
+                    files = [rel_path for rel_path, in connection.execute(
+                        "SELECT rel_path FROM images WHERE rel_dir = ? ORDER BY position", (rel_dir,))]
+                else:
+                    result.changed_dirs += 1
+                    sub_dirs, files = self._reconcile_directory(connection, rel_dir, mtime_ns, result)
+                    for sub_dir in children[rel_dir]:
+                        if sub_dir not in sub_dirs:
+                            self._remove_directory(connection, sub_dir, result)
+
+                stack.append(files)
+                stack.extend(reversed(sub_dirs))
+
+            if result.cancelled:
+                # 새 기록의 표시 순서를 매기지 못했으므로 이번 스캔의 변경을 모두 되돌림 (다음 스캔에서 다시 읽음)
+                connection.rollback()
+            else:
+                for rel_dir in stored_dirs.keys() - seen_dirs:
+                    self._remove_directory(connection, rel_dir, result)
+                if result.changed_dirs:
+                    # 표시 순서 갱신
+                    connection.executemany("UPDATE images SET position = ? WHERE rel_path = ?",
+                                           ((position, rel_path) for position, rel_path in enumerate(ordered)))
+        result.seconds = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _labels_changed(labels, stats):
+        """폴더의 라벨 파일 [(경로, 기록된 수정 시각, 크기)] 중 제자리 수정(수정 시각/크기 변경)된 파일이 있는지 여부"""
+        for label_path, label_mtime_ns, label_size in labels:
+            stat = stats.get(label_path)
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != (label_mtime_ns, label_size):
+                return True
+        return False
+
+    def _reconcile_directory(self, connection, rel_dir, mtime_ns, result):
+        """바뀐 폴더 하나를 다시 읽어 이미지 기록 추가/갱신/삭제 - (하위 폴더 목록, 파일 목록) 반환"""
+        dir_path = self._absolute(rel_dir)
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        try:
+            files, sub_dir_paths = read_directory(dir_path, IMAGE_EXTENSIONS + ('.txt',), with_stat=True,
+                                                  skip_hidden=True)
+        except OSError:
+            return [], []
+        sub_dirs = [prefix + os.path.basename(path) for path in sub_dir_paths]
+        images, labels = {}, {}
+        for path, stat in files:
+            name = os.path.basename(path)
+            if name.lower().endswith('.txt'):
+                labels[name[:-4]] = (stat.st_mtime_ns, stat.st_size)
+            else:
+                images[name] = (stat.st_size, stat.st_mtime_ns)
+
+        stored = {row[0]: row[1:] for row in connection.execute(
+            "SELECT rel_path, size, mtime_ns, width, height, label_mtime_ns, label_size FROM images WHERE rel_dir = ?",
+            (rel_dir,))}
+        names = sorted(images, key=natural_sort_key)
+        for name in names:
+            rel_path = prefix + name
+            size, image_mtime_ns = images[name]
+            stem = name.rsplit('.', 1)[0]
+            label_mtime_ns, label_size = labels.get(stem, (None, None))
+            old = stored.pop(rel_path, None)
+            if old is not None and (old[0], old[1], old[4], old[5]) == (size, image_mtime_ns, label_mtime_ns,
+                                                                        label_size):
+                continue
+
+            if old is not None and (old[0], old[1]) == (size, image_mtime_ns):
+                width, height = old[2], old[3]
+            else:
+                image_size = QImageReader(f"{dir_path}/{name}").size()
+                width, height = (image_size.width(), image_size.height()) if image_size.isValid() else (None, None)
+
+            label_path = None
+            label_count, histogram = 0, {}
+            if label_mtime_ns is not None:
+                label_path = f"{prefix}{stem}.txt"
+                class_ids = read_label_file(f"{dir_path}/{stem}.txt")[:, 0].astype(int).tolist()
+                label_count = len(class_ids)
+                histogram = Counter(class_ids)
+
+            connection.execute(
+                "INSERT OR REPLACE INTO images (rel_path, rel_dir, position, size, mtime_ns, width, height, "
+                "label_path, label_mtime_ns, label_size, label_count, class_histogram) VALUES (?, ?, "
+                "(SELECT position FROM images WHERE rel_path = ?), ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (rel_path, rel_dir, rel_path, size, image_mtime_ns, width, height,
+                 label_path, label_mtime_ns, label_size, label_count, json.dumps(histogram)))
+            if old is None:
+                result.added += 1
+            else:
+                result.updated += 1
+
+        if stored:
+            connection.executemany("DELETE FROM images WHERE rel_path = ?", ((rel_path,) for rel_path in stored))
+            result.removed += len(stored)
+
+        parent = None if rel_dir == "" else (rel_dir.rsplit('/', 1)[0] if '/' in rel_dir else "")
+        connection.execute("INSERT OR REPLACE INTO directories (rel_dir, parent, mtime_ns) VALUES (?, ?, ?)",
+                           (rel_dir, parent, mtime_ns))
+        sub_dirs.sort(key=lambda path: natural_sort_key(path.rsplit('/', 1)[-1]))
+        return sub_dirs, [prefix + name for name in names]
+
+    @staticmethod
+    def _remove_directory(connection, rel_dir, result):
+        """사라진 폴더와 그 아래 기록 삭제"""
+        pattern = rel_dir.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'
+        removed = connection.execute("DELETE FROM images WHERE rel_dir = ? OR rel_dir LIKE ? ESCAPE '\\'",
+                                     (rel_dir, pattern)).rowcount
+        connection.execute("DELETE FROM directories WHERE rel_dir = ? OR rel_dir LIKE ? ESCAPE '\\'",
+                           (rel_dir, pattern))
+        result.removed += max(0, removed)
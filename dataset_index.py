@@ -0,0 +1,239 @@
+import bisect
+import os
+import re
+from collections import defaultdict
+
+from dir_crawler import read_directory, walk
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def natural_sort_key(name):
+    """트리 뷰와 같은 자연 정렬 키 (img2 < img10)"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', name)]
+
+
+def normalize_path(path):
+    """인덱스 내부 경로 표기 (Qt와 같은 '/' 구분자)"""
+    return path.replace('\\', '/')
+
+
+class DatasetIndex:
+    """데이터셋 루트 아래 이미지 전체를 트리 뷰 순서(폴더 우선, 자연 정렬)로 한 번 정렬해 둔 인덱스
+
+    - 경로 -> 위치 맵으로 다음/이전/처음 이미지를 O(1)에 찾는다.
+    - 이동/삭제는 항목을 제거 표시만 하고 (위치 유지), 새 항목을 삽입할 때 한 번에 압축한다.
+    """
+
+    def __init__(self, root_path, paths=None):
+        """paths를 주면 (카탈로그 등에서 이미 정렬된 목록) 폴더를 훑지 않고 그대로 사용"""
+        self.root_path = normalize_path(os.path.abspath(root_path)).rstrip('/')
+        self._paths = []
+        self._alive = bytearray()
+        self._positions = {}
+        self._removed_count = 0
+        if paths is None:
+            self.rebuild()
+        else:
+            self._set_paths([normalize_path(path) for path in paths])
+
+    def rebuild(self):
+        """루트 아래를 다시 훑어 인덱스 재생성"""
+        self._set_paths(self._scan(self.root_path))
+
+    def _set_paths(self, paths):
+        self._paths = paths
+        self._alive = bytearray(b'\x01') * len(self._paths)
+        self._positions = {path: position for position, path in enumerate(self._paths)}
+        self._removed_count = 0
+
+    @staticmethod
+    def list_directory(dir_path):
+        """폴더 하나의 (하위 폴더 경로 목록, 이미지 경로 목록) - 각각 자연 정렬, 읽을 수 없으면 None"""
+        try:
+            files, sub_dirs = read_directory(dir_path, IMAGE_EXTENSIONS, skip_hidden=True)
+        except OSError:
+            return None
+        dir_names = [os.path.basename(path) for path in sub_dirs]
+        file_names = [os.path.basename(path) for path, _ in files]
+        dir_names.sort(key=natural_sort_key)
+        file_names.sort(key=natural_sort_key)
+        return [f"{dir_path}/{name}" for name in dir_names], [f"{dir_path}/{name}" for name in file_names]
+
+    @staticmethod
+    def _scan(root_path):
+        """폴더를 병렬로 모두 읽은 뒤 깊이 우선으로 폴더를 먼저, 각 단계는 자연 정렬 순서로 이미지 경로 수집"""
+        file_names, sub_dirs = {}, defaultdict(list)
+        for dir_path, names in walk(root_path, IMAGE_EXTENSIONS, skip_hidden=True):
+            dir_path = normalize_path(dir_path)
+            file_names[dir_path] = names
+            if dir_path != root_path:
+                sub_dirs[dir_path.rsplit('/', 1)[0]].append(dir_path)
+
+        paths = []
+        stack = [root_path]
+        while stack:
+            dir_path = stack.pop()
+            if isinstance(dir_path, list):
+                # 하위 폴더를 모두 처리한 뒤의 현재 폴더 파일 목록
+                paths.extend(dir_path)
+                continue
+            if dir_path not in file_names:
+                continue
+            names = sorted(file_names[dir_path], key=natural_sort_key)
+            # 파일 목록을 하위 폴더 아래에 쌓아 폴더가 먼저 처리되게 함
+            stack.append([f"{dir_path}/{name}" for name in names])
+            sub_dirs[dir_path].sort(key=lambda path: natural_sort_key(path.rsplit('/', 1)[-1]))
+            stack.extend(reversed(sub_dirs[dir_path]))
+        return paths
+
+    @classmethod
+    def scan_paths(cls, dir_path):
+        """dir_path 아래 이미지 경로를 표시 순서로 수집 (인덱스에 새 폴더를 더할 때)"""
+        return cls._scan(normalize_path(dir_path).rstrip('/'))
+
+    def sort_key(self, path):
+        """트리 뷰 표시 순서 키 - 경로 단계별로 폴더(0)가 파일(1)보다 앞"""
+        parts = self._relative_parts(path)
+        return [(0, natural_sort_key(part)) for part in parts[:-1]] + [(1, natural_sort_key(parts[-1]))]
+
+    def _relative_parts(self, path):
+        return normalize_path(path)[len(self.root_path) + 1:].split('/')
+
+    def __len__(self):
+        return len(self._paths) - self._removed_count
+
+    def __contains__(self, path):
+        position = self._positions.get(normalize_path(path))
+        return position is not None and self._alive[position]
+
+    def contains_path(self, path):
+        """루트 아래 경로인지 여부"""
+        return normalize_path(os.path.abspath(path)).startswith(self.root_path + '/')
+
+    def paths(self):
+        """남아 있는 전체 이미지 경로 (표시 순서)"""
+        return [path for path, alive in zip(self._paths, self._alive) if alive]
+
+    def position_of(self, path):
+        """경로의 위치 (제거된 항목도 제거 전 위치 유지) - 인덱스에 없으면 None"""
+        return self._positions.get(normalize_path(path))
+
+    def first_path(self, dir_path=None):
+        """dir_path(기본 루트) 아래 첫 번째 이미지 경로"""
+        dir_path = self.root_path if dir_path is None else normalize_path(os.path.abspath(dir_path)).rstrip('/')
+        prefix = dir_path + '/'
+        if dir_path == self.root_path:
+            position = 0
+        elif not dir_path.startswith(self.root_path + '/'):
+            return None
+        else:
+            # 폴더 키는 그 아래 모든 항목 키의 앞부분이므로 이분 탐색으로 시작 위치를 찾음
+            dir_key = [(0, natural_sort_key(part)) for part in self._relative_parts(dir_path)]
+            position = bisect.bisect_left(self._paths, dir_key, key=self.sort_key)
+        for position in range(position, len(self._paths)):
+            path = self._paths[position]
+            if not path.startswith(prefix):
+                return None
+            if self._alive[position]:
+                return path
+        return None
+
+    def next_path(self, path, within_directory=False):
+        """다음 이미지 경로 (path가 제거됐어도 원래 위치 기준) - 없으면 None"""
+        paths = self._step(path, 1, 1, within_directory)
+        return paths[0] if paths else None
+
+    def previous_path(self, path, within_directory=False):
+        """이전 이미지 경로 - 없으면 None"""
+        paths = self._step(path, -1, 1, within_directory)
+        return paths[0] if paths else None
+
+    def neighbors(self, path, next_count, previous_count, within_directory=False):
+        """다음 next_count개, 이전 previous_count개 이미지 경로 (가까운 순)"""
+        return (self._step(path, 1, next_count, within_directory) +
+                self._step(path, -1, previous_count, within_directory))
+
+    def _step(self, path, direction, count, within_directory):
+        position = self.position_of(path)
+        if position is None or count <= 0:
+            return []
+        directory = os.path.dirname(self._paths[position]) if within_directory else None
+        found = []
+        position += direction
+        while 0 <= position < len(self._paths) and len(found) < count:
+            candidate = self._paths[position]
+            if directory is not None and os.path.dirname(candidate) != directory:
+                break
+            if self._alive[position]:
+                found.append(candidate)
+            position += direction
+        return found
+
+    def directory_paths(self):
+        """이미지가 있는 폴더와 그 상위 폴더 (루트 포함)"""
+        directories = {self.root_path}
+        # 인덱스 경로는 '/' 구분자로 정규화돼 있으므로 os.path.dirname 대신 rpartition 사용 (수십만 장에서 차이 큼)
+        for dir_path in {path.rpartition('/')[0] for path in self._paths}:
+            while dir_path.startswith(self.root_path + '/') and dir_path not in directories:
+                directories.add(dir_path)
+                dir_path = dir_path.rpartition('/')[0]
+        return directories
+
+    def paths_in_directory(self, dir_path):
+        """폴더 바로 아래의 이미지 경로 (하위 폴더 제외, 제거 표시 제외)"""
+        dir_path = normalize_path(os.path.abspath(dir_path)).rstrip('/')
+        if dir_path == self.root_path:
+            dir_key = []
+        elif dir_path.startswith(self.root_path + '/'):
+            dir_key = [(0, natural_sort_key(part)) for part in self._relative_parts(dir_path)]
+        else:
+            return []
+        # 폴더의 파일은 하위 폴더 항목 다음에 연속으로 놓임 - (1, []) 은 그 폴더 파일 키 중 가장 작음
+        position = bisect.bisect_left(self._paths, dir_key + [(1, [])], key=self.sort_key)
+        paths = []
+        while position < len(self._paths) and os.path.dirname(self._paths[position]) == dir_path:
+            if self._alive[position]:
+                paths.append(self._paths[position])
+            position += 1
+        return paths
+
+    def add(self, path):
+        """새 이미지 경로를 표시 순서 위치에 삽입 (이미 있으면 무시)"""
+        return self.add_paths([path])
+
+    def add_paths(self, paths):
+        """여러 이미지 경로를 표시 순서 위치에 삽입 (위치 맵은 한 번만 재생성) - 추가된 수 반환"""
+        revived = 0
+        inserted = {}
+        for path in paths:
+            path = normalize_path(os.path.abspath(path))
+            position = self._positions.get(path)
+            if position is not None:
+                if not self._alive[position]:
+                    self._alive[position] = 1
+                    self._removed_count -= 1
+                    revived += 1
+            elif self.contains_path(path):
+                inserted[path] = None
+        if not inserted:
+            return revived
+        self._compact()
+        for path in inserted:
+            self._paths.insert(bisect.bisect_left(self._paths, self.sort_key(path), key=self.sort_key), path)
+        self._set_paths(self._paths)
+        return revived + len(inserted)
+
+    def remove(self, path):
+        """이미지 경로 제거 표시 (이동/삭제 시) - 위치는 다음 이미지 계산을 위해 유지"""
+        position = self.position_of(path)
+        if position is None or not self._alive[position]:
+            return False
+        self._alive[position] = 0
+        self._removed_count += 1
+        return True
+
+    def _compact(self):
+        """제거 표시된 항목을 실제로 정리 (위치가 바뀌므로 삽입 전에만 수행)"""
+        if self._removed_count:
+            self._set_paths(self.paths())
@@ -0,0 +1,129 @@
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+
+class DatasetChange:
+    """인덱스에 반영한 변경 묶음 한 번"""
+
+    def __init__(self, first_event_time):
+        self.first_event_time = first_event_time
+        self.directories = set()  # 다시 읽은 폴더
+        self.files = set()  # 제자리 수정된 파일
+        self.added = []
+        self.removed = []
+
+    def touches(self, path):
+        """경로가 이 변경 묶음에 포함되는지 (해당 폴더가 바뀌었거나 파일 자체가 바뀜)"""
+        return bool(path) and (path in self.files or path.rsplit('/', 1)[0] in self.directories)
+
+
+class DatasetWatcher(QObject):
+    """열려 있는 데이터셋의 폴더 변경을 감시해 디바운스된 묶음으로 전달
+
+    - 폴더 감시: 파일 추가/삭제/이름 변경 (Linux에서는 QFileSystemWatcher가 inotify 사용)
+    - 파일 감시: 현재 이미지의 라벨처럼 제자리에서 덮어쓰는 파일 (폴더 감시로는 감지되지 않음)
+    - 첫 이벤트 후 debounce_ms 안에 들어온 변경은 한 번에 전달 (이후 이벤트로 연장하지 않아 지연 상한 유지)
+    """
+    # (변경된 폴더 목록, 변경된 파일 목록, 첫 이벤트 시각 perf_counter)
+    changes_ready = Signal(list, list, float)
+
+    def __init__(self, debounce_ms=200, parent=None):
+        super().__init__(parent)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._flush)
+        self._changed_dirs = {}
+        self._changed_files = {}
+        self._first_event_time = None
+        self._focus_files = []
+        self.latencies = deque(maxlen=200)  # 이벤트 -> 화면 반영까지 걸린 시간 (초)
+        self.batches = 0
+        self.events = 0
+
+    def watch_directories(self, dir_paths):
+        """감시할 폴더 추가 (이미 감시 중인 폴더는 무시)"""
+        watched = self.watched_directories()
+        new_paths = [path for path in dir_paths if path not in watched]
+        if new_paths:
+            failed = self._watcher.addPaths(new_paths)
+            if failed:
+                print(f"폴더 감시를 추가할 수 없음: {len(failed)}개 (감시 한도 확인)")
+
+    def watched_directories(self):
+        return set(self._watcher.directories())
+
+    def unwatch_directories(self, dir_paths):
+        watched = self.watched_directories()
+        paths = [path for path in dir_paths if path in watched]
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def set_focus_files(self, file_paths):
+        """제자리 수정까지 감시할 파일 교체 (현재 이미지의 라벨 파일 등)"""
+        file_paths = [path for path in file_paths if path]
+        if self._focus_files:
+            self._watcher.removePaths(self._focus_files)
+        self._focus_files = file_paths
+        if file_paths:
+            self._watcher.addPaths(file_paths)
+
+    def clear(self):
+        """감시 대상과 대기 중인 변경 모두 해제"""
+        self._timer.stop()
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._focus_files = []
+        self._changed_dirs.clear()
+        self._changed_files.clear()
+        self._first_event_time = None
+
+    def _note_event(self):
+        self.events += 1
+        if self._first_event_time is None:
+            self._first_event_time = time.perf_counter()
+            self._timer.start()
+
+    def _on_directory_changed(self, dir_path):
+        self._changed_dirs[dir_path] = None
+        self._note_event()
+
+    def _on_file_changed(self, file_path):
+        self._changed_files[file_path] = None
+        # 덮어쓰기(삭제 후 생성)로 감시가 풀린 파일은 다시 감시
+        if file_path in self._focus_files and file_path not in self._watcher.files():
+            self._watcher.addPath(file_path)
+        self._note_event()
+
+    def _flush(self):
+        dirs, files = list(self._changed_dirs), list(self._changed_files)
+        first_event_time = self._first_event_time
+        self._changed_dirs.clear()
+        self._changed_files.clear()
+        self._first_event_time = None
+        if first_event_time is None:
+            return
+        self.batches += 1
+        self.changes_ready.emit(dirs, files, first_event_time)
+
+    def record_latency(self, first_event_time):
+        """변경 묶음이 화면에 반영된 시점 기록"""
+        self.latencies.append(time.perf_counter() - first_event_time)
+
+    def stats(self):
+        """이벤트/묶음 수와 이벤트 -> 반영 지연 (ms)"""
+        latencies = sorted(self.latencies)
+        return {
+            "events": self.events,
+            "batches": self.batches,
+            "watched_dirs": len(self._watcher.directories()),
+            "latency_ms_last": self.latencies[-1] * 1000 if self.latencies else 0.0,
+            "latency_ms_p50": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            "latency_ms_max": latencies[-1] * 1000 if latencies else 0.0,
+        }
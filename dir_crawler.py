@@ -0,0 +1,158 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _matches(name, extensions):
+    return extensions is None or name.lower().endswith(extensions)
+
+
+def list_files(dir_path, extensions=None, with_stat=False):
+    """폴더 하나(하위 폴더 제외)의 파일 목록 [(경로, stat 또는 None)] - 읽을 수 없으면 빈 목록"""
+    extensions = _normalize_extensions(extensions)
+    files = []
+    try:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and _matches(entry.name, extensions):
+                        files.append((entry.path, entry.stat() if with_stat else None))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files
+
+
+def _normalize_extensions(extensions):
+    if extensions is None:
+        return None
+    if isinstance(extensions, str):
+        extensions = (extensions,)
+    return tuple(extension.lower() for extension in extensions)
+
+
+def read_directory(dir_path, extensions=None, with_stat=False, skip_hidden=False, follow_symlinks=False):
+    """폴더 하나를 읽어 ([(파일 경로, stat 또는 None)], [하위 폴더 경로]) 반환 - 폴더를 열 수 없으면 OSError"""
+    extensions = _normalize_extensions(extensions)
+    files, sub_dirs = [], []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if skip_hidden and entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    sub_dirs.append(entry.path)
+                elif _matches(entry.name, extensions):
+                    files.append((entry.path, entry.stat() if with_stat else None))
+            except OSError:
+                continue
+    return files, sub_dirs
+
+
+def _directory_key(dir_path):
+    """폴더의 (장치, inode) - 같은 폴더를 두 번 읽지 않기 위함, 알 수 없으면 None"""
+    try:
+        stat = os.stat(dir_path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino) if stat.st_ino else None
+
+
+def _scan_directory(dir_path, extensions, with_stat, skip_hidden, follow_symlinks):
+    """작업 스레드에서 폴더 하나를 읽어 (파일 목록, [(하위 폴더, 폴더 키)]) 반환 - 읽을 수 없으면 빈 목록"""
+    try:
+        files, sub_dirs = read_directory(dir_path, extensions, with_stat, skip_hidden, follow_symlinks)
+    except OSError:
+        return [], []
+    return files, [(sub_dir, _directory_key(sub_dir)) for sub_dir in sub_dirs]
+
+
+def _crawl_directories(root_path, extensions, with_stat, max_workers, cancel_event, skip_hidden,
+                       follow_symlinks=False):
+    """폴더를 스레드 풀에서 동시에 읽으며 읽기가 끝난 순서대로 (폴더 경로, [(경로, stat)]) 를 내보냄
+
+    이미 읽은 폴더((장치, inode)가 같은 폴더)는 다시 읽지 않으므로 상위 폴더를 가리키는 심볼릭 링크나
+    정션이 있어도 끝난다.
+    """
+    extensions = _normalize_extensions(extensions)
+    cancel_event = cancel_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawler")
+    scan_options = (extensions, with_stat, skip_hidden, follow_symlinks)
+    visited = {_directory_key(root_path)}
+    pending = {executor.submit(_scan_directory, root_path, *scan_options): root_path}
+    try:
+        while pending and not cancel_event.is_set():
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_path = pending.pop(future)
+                files, sub_dirs = future.result()
+                if cancel_event.is_set():
+                    return
+                for sub_dir, dir_key in sub_dirs:
+                    if dir_key is not None:
+                        if dir_key in visited:
+                            continue
+                        visited.add(dir_key)
+                    pending[executor.submit(_scan_directory, sub_dir, *scan_options)] = sub_dir
+                yield dir_path, files
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def crawl(root_path, extensions=None, with_stat=True, batch_size=512, max_workers=16,
+          cancel_event=None, skip_hidden=False):
+    """root_path 아래 파일을 여러 폴더 동시에 읽으며 [(경로, stat)] 묶음으로 바로바로 내보내는 제너레이터
+
+    - 네트워크 파일 시스템의 폴더당 지연을 스레드 풀로 겹쳐 숨긴다 (순서는 보장하지 않음).
+    - extensions: ('.jpg', '.png') 같은 확장자 필터 (대소문자 무시), None이면 모든 파일
+    - cancel_event(threading.Event)가 설정되거나 제너레이터를 닫으면 남은 폴더는 읽지 않는다.
+    """
+    batch = []
+    for _, files in _crawl_directories(root_path, extensions, with_stat, max_workers, cancel_event, skip_hidden):
+        batch.extend(files)
+        if len(batch) >= batch_size:
+            full_end = len(batch) - len(batch) % batch_size
+            for start in range(0, full_end, batch_size):
+                yield batch[start:start + batch_size]
+            batch = batch[full_end:]
+    if batch and not (cancel_event is not None and cancel_event.is_set()):
+        yield batch
+
+
+def walk(root_path, extensions=None, max_workers=16, cancel_event=None, skip_hidden=False, follow_symlinks=False):
+    """os.walk 대신 쓰는 병렬 탐색 - 폴더마다 (폴더 경로, 파일 이름 목록) 을 읽기가 끝난 순서대로 내보냄
+
+    follow_symlinks=True면 폴더 심볼릭 링크도 따라 들어간다 (이미 읽은 폴더로 돌아가는 링크는 건너뜀).
+    """
+    for dir_path, files in _crawl_directories(root_path, extensions, False, max_workers, cancel_event, skip_hidden,
+                                              follow_symlinks):
+        yield dir_path, [os.path.basename(path) for path, _ in files]
+
+
+def crawl_paths(root_path, extensions=None, **kwargs):
+    """crawl()의 경로만 하나씩 내보내는 편의 함수 (stat 생략)"""
+    for batch in crawl(root_path, extensions, with_stat=False, **kwargs):
+        for path, _ in batch:
+            yield path
+
+
+def _stat_chunk(paths):
+    stats = []
+    for path in paths:
+        try:
+            stats.append(os.stat(path))
+        except OSError:
+            stats.append(None)
+    return stats
+
+
+def stat_paths(paths, max_workers=16, chunk_size=256):
+    """여러 경로의 stat을 스레드 풀에서 동시에 구함 - {경로: stat 또는 None (없거나 읽을 수 없음)}"""
+    paths = list(paths)
+    chunks = [paths[start:start + chunk_size] for start in range(0, len(paths), chunk_size)]
+    if len(chunks) <= 1:
+        return dict(zip(paths, _stat_chunk(paths)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawler") as executor:
+        stats = [stat for chunk_stats in executor.map(_stat_chunk, chunks) for stat in chunk_stats]
+    return dict(zip(paths, stats))
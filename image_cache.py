@@ -0,0 +1,289 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+import numpy as np
+
+from tiled_image_item import should_tile
+
+
+def make_image_key(image_path):
+    """캐시 키 (경로, 수정 시각) 생성 - 파일이 없으면 None"""
+    try:
+        return image_path, os.stat(image_path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def read_proxy_image(image_path, target_size):
+    """target_size에 맞춘 축소 디코딩 (JPEG은 DCT 단계에서 축소) - 축소가 필요 없으면 None
+
+    반환값: (축소 이미지, 원본 크기)
+    """
+    reader = QImageReader(image_path)
+    full_size = reader.size()
+    if not full_size.isValid() or not target_size.isValid():
+        return None
+    # 원본이 목표 크기의 1.5배 이하면 축소본의 이득이 없음
+    if full_size.width() <= target_size.width() * 1.5 and full_size.height() <= target_size.height() * 1.5:
+        return None
+    reader.setScaledSize(full_size.scaled(target_size, Qt.KeepAspectRatio))
+    proxy = reader.read()
+    if proxy.isNull():
+        return None
+    return proxy, full_size
+
+
+class DecodedFrame:
+    """한 번 디코딩한 이미지를 QImage / NumPy 뷰 / QPixmap으로 공유하는 객체
+
+    - image: 원본 해상도 QImage (스레드 간 공유 가능)
+    - array: image 버퍼를 복사 없이 가리키는 (H, W, C) uint8 뷰 (32비트 포맷은 BGRA 순서)
+    - pixmap(): 표시용 QPixmap (GUI 스레드에서 처음 호출할 때 한 번만 변환)
+    """
+    # NumPy 뷰를 바로 만들 수 있는 포맷과 채널 수
+    _ARRAY_FORMATS = {
+        QImage.Format_RGB32: 4,
+        QImage.Format_ARGB32: 4,
+        QImage.Format_ARGB32_Premultiplied: 4,
+        QImage.Format_Grayscale8: 1,
+    }
+
+    def __init__(self, image_path, image, decode_seconds=0.0):
+        self.image_path = image_path
+        self.image = image
+        self.decode_seconds = decode_seconds
+        self._array = None
+        self._pixmap = None
+
+    @classmethod
+    def decode(cls, image_path):
+        """파일을 디코딩하여 프레임 생성 - 실패하면 None"""
+        started = time.perf_counter()
+        image = QImage(image_path)
+        if image.isNull():
+            return None
+        # NumPy 뷰를 만들 수 없는 포맷(인덱스 컬러 등)은 디코딩 시점에 한 번만 변환
+        if image.format() not in cls._ARRAY_FORMATS:
+            image = image.convertToFormat(QImage.Format_RGB32)
+        return cls(image_path, image, time.perf_counter() - started)
+
+    @property
+    def nbytes(self):
+        return self.image.sizeInBytes()
+
+    def width(self):
+        return self.image.width()
+
+    def height(self):
+        return self.image.height()
+
+    @property
+    def array(self):
+        """QImage 버퍼의 읽기 전용 NumPy 뷰"""
+        if self._array is None:
+            channels = self._ARRAY_FORMATS[self.image.format()]
+            height, width = self.image.height(), self.image.width()
+            buffer = np.frombuffer(self.image.constBits(), dtype=np.uint8)
+            rows = buffer[:height * self.image.bytesPerLine()].reshape(height, self.image.bytesPerLine())
+            self._array = rows[:, :width * channels].reshape(height, width, channels)
+        return self._array
+
+    def bgr_region(self, x, y, width, height):
+        """지정 영역의 BGR 뷰 (OpenCV 입력용, 이미지 밖은 잘라냄)"""
+        array = self.array
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(array.shape[1], x + width), min(array.shape[0], y + height)
+        region = array[y0:max(y0, y1), x0:max(x0, x1)]
+        if region.shape[2] == 1:
+            return np.repeat(region, 3, axis=2)
+        return region[..., :3]
+
+    def pixmap(self):
+        """표시용 QPixmap (GUI 스레드 전용)"""
+        if self._pixmap is None:
+            self._pixmap = QPixmap.fromImage(self.image)
+        return self._pixmap
+
+    def release_pixmap(self):
+        """화면에서 내려간 프레임의 QPixmap 해제 (QImage는 캐시에 유지)"""
+        self._pixmap = None
+
+
+class ImageCache:
+    """디코딩된 프레임을 바이트 예산 안에서 보관하는 LRU 캐시"""
+
+    def __init__(self, max_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """키에 해당하는 프레임을 반환하고 최근 사용으로 갱신"""
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is not None:
+                self._entries.move_to_end(key)
+            return frame
+
+    def put(self, key, frame):
+        """프레임을 캐시에 넣고 예산을 넘으면 오래된 항목부터 제거"""
+        size = frame.nbytes
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.nbytes
+            self._entries[key] = frame
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def discard_path(self, image_path):
+        """경로에 해당하는 모든 항목 제거 (이동/삭제된 파일)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == image_path]:
+                self.current_bytes -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class ImagePrefetcher(QObject):
+    """탐색 순서상 앞/뒤 이미지를 워커 풀에서 미리 디코딩"""
+    # 백그라운드 디코딩 완료 시그널 (이미지 경로)
+    image_ready = Signal(str)
+
+    def __init__(self, max_bytes=1024 * 1024 * 1024, max_workers=2):
+        super().__init__()
+        self.cache = ImageCache(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        # 원본 해상도 디코딩 횟수 (탐색 1회당 1회인지 확인용)
+        self.decodes = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._pending = {}
+        self._priority_key = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def is_cached(self, image_path):
+        """원본 해상도 이미지가 캐시에 있는지 확인"""
+        key = make_image_key(image_path)
+        return key is not None and key in self.cache
+
+    def request(self, image_path):
+        """현재 이미지의 원본 디코딩을 우선 요청 (prefetch()로 취소되지 않음)"""
+        key = make_image_key(image_path)
+        if key is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._priority_key = key
+            if key not in self._pending and key not in self.cache:
+                self._pending[key] = self._executor.submit(self._decode, key)
+
+    def get_frame(self, image_path):
+        """캐시에서 프레임을 반환하고, 없으면 진행 중인 디코딩을 기다리거나 직접 디코딩 - 실패하면 None"""
+        key = make_image_key(image_path)
+        if key is None:
+            return None
+
+        frame = self.cache.get(key)
+        if frame is not None:
+            self.hits += 1
+            return frame
+
+        self.misses += 1
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            try:
+                frame = future.result()
+            except CancelledError:
+                frame = None
+            if frame is not None:
+                return frame
+
+        frame = DecodedFrame.decode(image_path)
+        with self._lock:
+            self.decodes += 1
+        if frame is not None:
+            self.cache.put(key, frame)
+        return frame
+
+    def prefetch(self, image_paths):
+        """주어진 경로들을 순서대로 백그라운드 디코딩 요청 (목록에 없는 대기 작업은 취소)"""
+        keys = [key for key in (make_image_key(path) for path in image_paths) if key is not None]
+        wanted = set(keys)
+        with self._lock:
+            if self._closed:
+                return
+            for key, future in list(self._pending.items()):
+                if key not in wanted and key != self._priority_key and future.cancel():
+                    del self._pending[key]
+            for key in keys:
+                if key in self._pending or key in self.cache:
+                    continue
+                self._pending[key] = self._executor.submit(self._decode, key)
+
+    def _decode(self, key):
+        """워커 스레드에서 이미지 디코딩 (QImage는 스레드 간 사용 가능)"""
+        image_path = key[0]
+        try:
+            # 타일로 표시할 초대형 이미지는 통째로 디코딩하지 않음
+            if should_tile(QImageReader(image_path).size()):
+                return None
+            frame = DecodedFrame.decode(image_path)
+            # 작업 스레드 여러 개가 함께 세므로 잠금 안에서 증가
+            with self._lock:
+                self.decodes += 1
+            if frame is None:
+                return None
+            self.cache.put(key, frame)
+            return frame
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            self.image_ready.emit(image_path)
+
+    def discard(self, image_path):
+        """이동/삭제된 파일의 캐시 항목 제거"""
+        self.cache.discard_path(image_path)
+
+    def stats(self):
+        """캐시 적중/실패 카운터와 사용량 반환"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "decodes": self.decodes,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.cache),
+            "bytes": self.cache.current_bytes,
+            "pending": len(self._pending),
+        }
+
+    def shutdown(self):
+        """대기 중인 작업을 취소하고 워커 종료 (이후 요청은 무시)"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,312 @@
+import bisect
+import itertools
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+
+class ImageListModel(QAbstractItemModel):
+    """정렬된 데이터셋 인덱스에서 행을 바로 꺼내 보여주는 이미지 목록 모델 (QFileSystemModel 대체)
+
+    - 평면 모드: 루트 아래 모든 이미지가 한 목록 (상대 경로 표시)
+    - 폴더 묶음 모드: 폴더가 최상위 행, 그 아래 이미지 행
+    - 행 -> 경로는 목록 접근 한 번, 경로 -> 행은 이분 탐색
+    - 행은 PAGE_SIZE씩 fetchMore로 노출해 뷰가 한 번에 수십만 행을 배치하지 않게 함
+    """
+    PAGE_SIZE = 2000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.grouped = True
+        self._dataset_index = None
+        self._root_path = ""
+        self._paths = []
+        self._loaded = 0  # 평면 모드에서 노출한 행 수
+        self._group_dirs = []  # 폴더 묶음 모드의 폴더 경로 (표시 순서)
+        self._group_starts = []  # 각 폴더의 첫 이미지 위치 (_paths 기준)
+        # 폴더 묶음마다 고정 번호 (자식 인덱스의 internalId) - 위쪽에 묶음이 추가/제거돼도 자식 인덱스가 다른 묶음을 가리키지 않게 함
+        self._group_ids = []
+        self._next_group_id = 1  # 0은 묶음 행 자신
+        self._group_rows = {}  # 폴더 경로 -> 묶음 행
+        self._group_id_rows = {}  # 묶음 번호 -> 묶음 행
+        self._group_loaded = {}  # 묶음 번호 -> 노출한 자식 행 수
+
+    # ------------------------------------------------------------------ 데이터 교체
+    def set_dataset_index(self, dataset_index):
+        """데이터셋 인덱스로 목록 전체 교체"""
+        self.beginResetModel()
+        self._dataset_index = dataset_index
+        self._root_path = dataset_index.root_path if dataset_index is not None else ""
+        self._paths = dataset_index.paths() if dataset_index is not None else []
+        self._loaded = min(len(self._paths), self.PAGE_SIZE)
+        self._rebuild_groups()
+        self.endResetModel()
+
+    def set_grouped(self, grouped):
+        """폴더 묶음 모드 전환"""
+        if grouped == self.grouped:
+            return
+        self.beginResetModel()
+        self.grouped = grouped
+        self._loaded = min(len(self._paths), self.PAGE_SIZE)
+        self._rebuild_groups()
+        self.endResetModel()
+
+    def _rebuild_groups(self):
+        self._group_dirs, self._group_starts, self._group_ids = [], [], []
+        self._group_loaded = {}
+        if self.grouped:
+            position = 0
+            for dir_path, paths in itertools.groupby(self._paths, key=lambda path: path.rpartition('/')[0]):
+                self._group_dirs.append(dir_path)
+                self._group_starts.append(position)
+                self._group_ids.append(self._new_group_id())
+                position += sum(1 for _ in paths)
+        self._reindex_groups()
+
+    def _new_group_id(self):
+        group_id = self._next_group_id
+        self._next_group_id += 1
+        return group_id
+
+    def _reindex_groups(self):
+        self._group_rows = {dir_path: row for row, dir_path in enumerate(self._group_dirs)}
+        self._group_id_rows = {group_id: row for row, group_id in enumerate(self._group_ids)}
+
+    def _group_size(self, group_row):
+        end = self._group_starts[group_row + 1] if group_row + 1 < len(self._group_starts) else len(self._paths)
+        return end - self._group_starts[group_row]
+
+    def _group_loaded_count(self, group_row):
+        return self._group_loaded.get(self._group_ids[group_row], min(self._group_size(group_row), self.PAGE_SIZE))
+
+    # ------------------------------------------------------------------ 경로 <-> 인덱스
+    def row_of(self, image_path):
+        """전체 목록에서의 위치 - 없으면 None"""
+        if self._dataset_index is None or not self._paths:
+            return None
+        sort_key = self._dataset_index.sort_key
+        row = bisect.bisect_left(self._paths, sort_key(image_path), key=sort_key)
+        if row < len(self._paths) and self._paths[row] == image_path:
+            return row
+        return None
+
+    def image_path(self, index):
+        """인덱스의 이미지 경로 (폴더 행이면 그 폴더의 첫 이미지) - 없으면 None"""
+        if not index.isValid():
+            return None
+        if self.grouped and index.internalId() == 0:
+            return self._paths[self._group_starts[index.row()]]
+        return self._paths[self._flat_row(index)]
+
+    def _flat_row(self, index):
+        if self.grouped:
+            return self._group_starts[self._group_id_rows[index.internalId()]] + index.row()
+        return index.row()
+
+    def index_for_path(self, image_path):
+        """이미지 경로의 인덱스 (아직 노출하지 않은 페이지면 그 행까지 노출) - 없으면 무효 인덱스"""
+        row = self.row_of(image_path)
+        if row is None:
+            return QModelIndex()
+        if not self.grouped:
+            if row >= self._loaded:
+                self._expose_rows(QModelIndex(), row + 1)
+            return self.createIndex(row, 0, 0)
+        group_row = bisect.bisect_right(self._group_starts, row) - 1
+        child_row = row - self._group_starts[group_row]
+        group_index = self.createIndex(group_row, 0, 0)
+        if child_row >= self._group_loaded_count(group_row):
+            self._expose_rows(group_index, child_row + 1)
+        return self.createIndex(child_row, 0, self._group_ids[group_row])
+
+    def neighbor_path(self, image_path, step):
+        """목록 순서상 step만큼 떨어진 이미지 경로 - 없으면 None"""
+        row = self.row_of(image_path)
+        if row is None or not 0 <= row + step < len(self._paths):
+            return None
+        return self._paths[row + step]
+
+    # ------------------------------------------------------------------ 증분 갱신
+    def add_paths(self, image_paths):
+        """새 이미지 경로를 정렬 위치에 삽입 (이미 있으면 무시)"""
+        if self._dataset_index is None:
+            return
+        sort_key = self._dataset_index.sort_key
+        for image_path in image_paths:
+            if not image_path.startswith(self._root_path + '/') or self.row_of(image_path) is not None:
+                continue
+            row = bisect.bisect_left(self._paths, sort_key(image_path), key=sort_key)
+            if self.grouped:
+                self._insert_grouped(row, image_path)
+            else:
+                visible = row <= self._loaded and (row < self._loaded or self._loaded == len(self._paths))
+                if visible:
+                    self.beginInsertRows(QModelIndex(), row, row)
+                self._paths.insert(row, image_path)
+                if visible:
+                    self._loaded += 1
+                    self.endInsertRows()
+
+    def _insert_grouped(self, row, image_path):
+        dir_path = image_path.rpartition('/')[0]
+        group_row = self._group_rows.get(dir_path)
+        if group_row is None:
+            # 새 폴더 묶음
+            group_row = bisect.bisect_left(self._group_starts, row)
+            self.beginInsertRows(QModelIndex(), group_row, group_row)
+            self._paths.insert(row, image_path)
+            self._group_dirs.insert(group_row, dir_path)
+            self._group_starts.insert(group_row, row)
+            self._group_ids.insert(group_row, self._new_group_id())
+            for later in range(group_row + 1, len(self._group_starts)):
+                self._group_starts[later] += 1
+            self._reindex_groups()
+            self.endInsertRows()
+            return
+
+        child_row = row - self._group_starts[group_row]
+        loaded = self._group_loaded_count(group_row)
+        visible = child_row < loaded or loaded == self._group_size(group_row)
+        if visible:
+            self.beginInsertRows(self.createIndex(group_row, 0, 0), child_row, child_row)
+        self._paths.insert(row, image_path)
+        for later in range(group_row + 1, len(self._group_starts)):
+            self._group_starts[later] += 1
+        self._group_loaded[self._group_ids[group_row]] = loaded + 1 if visible else loaded
+        if visible:
+            self.endInsertRows()
+
+    def remove_paths(self, image_paths):
+        """이미지 경로 제거 (목록에 없으면 무시)"""
+        for image_path in image_paths:
+            row = self.row_of(image_path)
+            if row is None:
+                continue
+            if self.grouped:
+                self._remove_grouped(row)
+            else:
+                visible = row < self._loaded
+                if visible:
+                    self.beginRemoveRows(QModelIndex(), row, row)
+                del self._paths[row]
+                if visible:
+                    self._loaded -= 1
+                    self.endRemoveRows()
+
+    def _remove_grouped(self, row):
+        group_row = bisect.bisect_right(self._group_starts, row) - 1
+        if self._group_size(group_row) == 1:
+            # 마지막 이미지면 폴더 묶음째 제거
+            self.beginRemoveRows(QModelIndex(), group_row, group_row)
+            del self._paths[row]
+            del self._group_dirs[group_row]
+            del self._group_starts[group_row]
+            self._group_loaded.pop(self._group_ids.pop(group_row), None)
+            for later in range(group_row, len(self._group_starts)):
+                self._group_starts[later] -= 1
+            self._reindex_groups()
+            self.endRemoveRows()
+            return
+
+        child_row = row - self._group_starts[group_row]
+        loaded = self._group_loaded_count(group_row)
+        visible = child_row < loaded
+        if visible:
+            self.beginRemoveRows(self.createIndex(group_row, 0, 0), child_row, child_row)
+        del self._paths[row]
+        for later in range(group_row + 1, len(self._group_starts)):
+            self._group_starts[later] -= 1
+        self._group_loaded[self._group_ids[group_row]] = loaded - 1 if visible else loaded
+        if visible:
+            self.endRemoveRows()
+
+    # ------------------------------------------------------------------ QAbstractItemModel
+    def index(self, row, column, parent=QModelIndex()):
+        # 뷰가 배치할 때 행마다 부르므로 rowCount()를 거치지 않고 바로 범위 확인
+        if column != 0 or row < 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if row >= (len(self._group_dirs) if self.grouped else self._loaded):
+                return QModelIndex()
+            return self.createIndex(row, 0, 0)
+        if self.grouped and parent.internalId() == 0:
+            group_row = parent.row()
+            if row < self._group_loaded_count(group_row):
+                return self.createIndex(row, 0, self._group_ids[group_row])
+        return QModelIndex()
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        group_row = self._group_id_rows.get(index.internalId())
+        if group_row is None:
+            return QModelIndex()
+        return self.createIndex(group_row, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._group_dirs) if self.grouped else self._loaded
+        if self.grouped and parent.internalId() == 0:
+            return self._group_loaded_count(parent.row())
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._paths)
+        return self.grouped and parent.internalId() == 0
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return not self.grouped and self._loaded < len(self._paths)
+        if self.grouped and parent.internalId() == 0:
+            return self._group_loaded_count(parent.row()) < self._group_size(parent.row())
+        return False
+
+    def fetchMore(self, parent):
+        if not parent.isValid():
+            self._expose_rows(parent, self._loaded + self.PAGE_SIZE)
+        elif self.grouped and parent.internalId() == 0:
+            self._expose_rows(parent, self._group_loaded_count(parent.row()) + self.PAGE_SIZE)
+
+    def _expose_rows(self, parent, count):
+        """parent 아래 노출 행 수를 count까지 (페이지 단위로 올림) 늘림"""
+        count = -(-count // self.PAGE_SIZE) * self.PAGE_SIZE
+        if not parent.isValid():
+            count = min(count, len(self._paths))
+            if count > self._loaded:
+                self.beginInsertRows(parent, self._loaded, count - 1)
+                self._loaded = count
+                self.endInsertRows()
+            return
+        group_row = parent.row()
+        loaded = self._group_loaded_count(group_row)
+        count = min(count, self._group_size(group_row))
+        if count > loaded:
+            self.beginInsertRows(parent, loaded, count - 1)
+            self._group_loaded[self._group_ids[group_row]] = count
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        is_group = self.grouped and index.internalId() == 0
+        if role == Qt.DisplayRole:
+            if is_group:
+                dir_path = self._group_dirs[index.row()]
+                name = dir_path[len(self._root_path) + 1:] or dir_path.rpartition('/')[2]
+                return f"{name} ({self._group_size(index.row())})"
+            path = self._paths[self._flat_row(index)]
+            if self.grouped:
+                return path.rpartition('/')[2]
+            return path[len(self._root_path) + 1:]
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return self._group_dirs[index.row()] if is_group else self._paths[self._flat_row(index)]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return "Name"
+        return None
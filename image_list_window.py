@@ -8,12 +8,13 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QScrollArea,
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QPixmap
 
+from thumbnail_cache import default_thumbnail_cache
 
 
 class ImageWidget(QWidget):
     clicked = Signal(str)
 
-    def __init__(self, image_path):
+    def __init__(self, image_path, thumbnail=None):
         super().__init__()
         self.image_path = image_path
         self.is_selected = False
@@ -22,7 +23,9 @@ class ImageWidget(QWidget):
         self.layout_sub = QHBoxLayout(self)
 
         self.image_label = QLabel()
-        pixmap = QPixmap(image_path).scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if thumbnail is None:
+            thumbnail = default_thumbnail_cache().get_thumbnail(image_path, 100)
+        pixmap = QPixmap.fromImage(thumbnail)
         self.image_label.setPixmap(pixmap)
 
         self.image_name = QLabel(os.path.basename(image_path))  # 이미지 파일 이름을 버튼 텍스트로 설정
@@ -157,8 +160,10 @@ class ImageListWindow(QWidget):
             self._add_images_to_list(image_files)
 
     def _add_images_to_list(self, file_paths):
+        # 썸네일은 디스크 캐시에서 병렬로 준비
+        thumbnails = default_thumbnail_cache().get_thumbnails(file_paths, 100)
         for file_path in file_paths:
-            image_widget = ImageWidget(file_path)
+            image_widget = ImageWidget(file_path, thumbnails.get(file_path))
             image_widget.clicked.connect(self.on_image_clicked)
             self.scroll_layout.addWidget(image_widget)
             self.image_widgets.append(image_widget)
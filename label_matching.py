@@ -0,0 +1,309 @@
+import os
+
+import numpy as np
+
+import box_geometry
+from additional_label_index import AdditionalLabelIndex, clean_base_name
+from label_repository import read_label_file
+
+# 매칭으로 인정하는 기본 IoU
+DEFAULT_MATCH_IOU = 0.5
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+
+def greedy_match(iou, threshold=DEFAULT_MATCH_IOU, allowed=None):
+    """IoU 행렬에서 IoU가 큰 쌍부터 일대일로 짝지음 - (행 번호 배열, 열 번호 배열)
+
+    - threshold 미만이거나 전혀 겹치지 않는 (IoU 0) 쌍은 threshold가 0이어도 짝짓지 않는다.
+    - allowed (bool 행렬)를 주면 True인 쌍만 후보로 삼는다 (같은 클래스끼리 등).
+    - 후보 쌍끼리 행/열이 겹치지 않으면 (대부분의 이미지) 정렬과 루프 없이 그대로 반환한다.
+    """
+    candidates = (iou > 0) & (iou >= threshold)
+    if allowed is not None:
+        candidates &= allowed
+    rows, cols = np.nonzero(candidates)
+    if len(rows) == 0:
+        return rows, cols
+    if len(np.unique(rows)) == len(rows) and len(np.unique(cols)) == len(cols):
+        return rows, cols
+
+    order = np.argsort(-iou[rows, cols], kind='stable')
+    used_rows, used_cols = set(), set()
+    matched_rows, matched_cols = [], []
+    for row, col in zip(rows[order].tolist(), cols[order].tolist()):
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        matched_rows.append(row)
+        matched_cols.append(col)
+    return np.array(matched_rows, dtype=np.intp), np.array(matched_cols, dtype=np.intp)
+
+
+def same_class_mask(labels1, labels2):
+    """클래스가 같은 쌍이 True인 bool 행렬 (클래스별 매칭을 한 번에 하기 위함)"""
+    return labels1[:, 0][:, None] == labels2[:, 0][None, :]
+
+
+def match_labels(labels1, labels2, threshold=DEFAULT_MATCH_IOU, iou=None):
+    """같은 클래스끼리 일대일 매칭 - labels1 기준 정답, labels2 기준 비교 대상의 (행 번호, 열 번호)"""
+    if len(labels1) == 0 or len(labels2) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    if iou is None:
+        iou = box_geometry.iou_matrix(labels1, labels2)
+    return greedy_match(iou, threshold, same_class_mask(labels1, labels2))
+
+
+class ImageMatch:
+    """이미지 한 장의 매칭 결과 - 매칭, 누락 (정답에만 있음), 추가 (비교 대상에만 있음) 박스 수와 가장 큰 IoU"""
+    __slots__ = ("image_path", "matched", "missed", "extra", "best_iou")
+
+    def __init__(self, image_path, matched, missed, extra, best_iou=0.0):
+        self.image_path = image_path
+        self.matched = matched
+        self.missed = missed
+        self.extra = extra
+        self.best_iou = best_iou
+
+    def is_exact(self):
+        return self.missed == 0 and self.extra == 0
+
+    def to_dict(self):
+        return {"image_path": self.image_path, "matched": self.matched, "missed": self.missed, "extra": self.extra,
+                "best_iou": self.best_iou}
+
+
+class MatchReport:
+    """데이터셋 전체 매칭 집계 - 전체와 클래스별 정밀도/재현율
+
+    - 정밀도 = 매칭 / (매칭 + 추가), 재현율 = 매칭 / (매칭 + 누락)
+    - 이미지별 결과는 보관하지 않고 수만 더한다 (수십만 장이어도 메모리 일정)
+    """
+
+    def __init__(self, threshold=DEFAULT_MATCH_IOU):
+        self.threshold = threshold
+        self.image_count = 0
+        self.exact_count = 0
+        # 클래스 번호 -> [매칭, 누락, 추가]
+        self._class_counts = np.zeros((0, 3), dtype=np.int64)
+
+    def match_batch(self, image_paths, label_pairs):
+        """이미지 묶음을 매칭해 집계에 더하고 ImageMatch 목록 반환 (IoU와 클래스별 집계는 묶음 단위로 한 번에)"""
+        results = []
+        class_lists = ([], [], [])
+        for image_path, (labels1, labels2), iou in zip(image_paths, label_pairs,
+                                                        box_geometry.batch_iou_matrices(label_pairs)):
+            rows, cols = match_labels(labels1, labels2, self.threshold, iou)
+            result, classes = self._image_match(image_path, labels1, labels2, rows, cols)
+            # 클래스와 무관하게 가장 많이 겹친 박스 쌍의 IoU
+            result.best_iou = float(iou.max()) if iou.size else 0.0
+            results.append(result)
+            for class_list, image_classes in zip(class_lists, classes):
+                class_list.append(image_classes)
+        for column, class_list in enumerate(class_lists):
+            if class_list:
+                self._add_classes(column, np.concatenate(class_list))
+        return results
+
+    def add(self, image_path, labels1, labels2, rows, cols):
+        """매칭 결과 한 장을 집계에 더함"""
+        result, classes = self._image_match(image_path, labels1, labels2, rows, cols)
+        for column, image_classes in enumerate(classes):
+            self._add_classes(column, image_classes)
+        return result
+
+    def _image_match(self, image_path, labels1, labels2, rows, cols):
+        """ImageMatch와 (매칭, 누락, 추가) 박스의 클래스 배열"""
+        missed_mask = np.ones(len(labels1), dtype=bool)
+        missed_mask[rows] = False
+        extra_mask = np.ones(len(labels2), dtype=bool)
+        extra_mask[cols] = False
+        classes1 = labels1[:, 0].astype(np.int64)
+        classes = (classes1[rows], classes1[missed_mask], labels2[extra_mask, 0].astype(np.int64))
+
+        result = ImageMatch(image_path, len(rows), len(classes[1]), len(classes[2]))
+        self.image_count += 1
+        self.exact_count += result.is_exact()
+        return result, classes
+
+    def _add_classes(self, column, classes):
+        classes = classes[classes >= 0]
+        if not len(classes):
+            return
+        counts = np.bincount(classes)
+        if len(counts) > len(self._class_counts):
+            grown = np.zeros((len(counts), 3), dtype=np.int64)
+            grown[:len(self._class_counts)] = self._class_counts
+            self._class_counts = grown
+        self._class_counts[:len(counts), column] += counts
+
+    def merge(self, other):
+        """다른 집계 (나눠서 계산한 부분)를 더함"""
+        self.image_count += other.image_count
+        self.exact_count += other.exact_count
+        if len(other._class_counts) > len(self._class_counts):
+            self._class_counts, other_counts = other._class_counts.copy(), self._class_counts
+        else:
+            other_counts = other._class_counts
+        self._class_counts[:len(other_counts)] += other_counts
+
+    def totals(self):
+        """(매칭, 누락, 추가) 전체 박스 수"""
+        matched, missed, extra = self._class_counts.sum(axis=0).tolist() if len(self._class_counts) else (0, 0, 0)
+        return matched, missed, extra
+
+    @staticmethod
+    def _rates(matched, missed, extra):
+        precision = matched / (matched + extra) if matched + extra else 1.0
+        recall = matched / (matched + missed) if matched + missed else 1.0
+        return precision, recall
+
+    def precision_recall(self):
+        return self._rates(*self.totals())
+
+    def per_class(self):
+        """클래스 번호 -> {matched, missed, extra, precision, recall} (박스가 있었던 클래스만)"""
+        per_class = {}
+        for class_id, (matched, missed, extra) in enumerate(self._class_counts.tolist()):
+            if matched or missed or extra:
+                precision, recall = self._rates(matched, missed, extra)
+                per_class[class_id] = {"matched": matched, "missed": missed, "extra": extra,
+                                       "precision": precision, "recall": recall}
+        return per_class
+
+    def summary(self):
+        """결과 창에 보여줄 요약 문구"""
+        matched, missed, extra = self.totals()
+        precision, recall = self.precision_recall()
+        lines = [f"이미지 {self.image_count}장 (라벨 일치 {self.exact_count}장), IoU 기준 {self.threshold}",
+                 f"매칭 {matched}, 누락 {missed}, 추가 {extra}",
+                 f"정밀도 {precision:.4f}, 재현율 {recall:.4f}"]
+        for class_id, counts in self.per_class().items():
+            lines.append(f"  클래스 {class_id}: 정밀도 {counts['precision']:.4f}, 재현율 {counts['recall']:.4f} "
+                         f"(매칭 {counts['matched']}, 누락 {counts['missed']}, 추가 {counts['extra']})")
+        return "\n".join(lines)
+
+
+def additional_label_path_for(image_path, main_folder, additional_folder):
+    """메인 폴더 이미지에 대응하는 추가 라벨 폴더의 라벨 경로 (같은 상대 경로)"""
+    relative_path = os.path.relpath(image_path, main_folder)
+    return os.path.splitext(os.path.join(additional_folder, relative_path))[0] + '.txt'
+
+
+def read_label_pairs(image_paths, main_folder, additional_folder):
+    """이미지마다 (메인 라벨, 추가 라벨) 배열 쌍 - 라벨 파일이 없으면 빈 배열"""
+    return [(read_label_file(image_path.rsplit('.', 1)[0] + ".txt"),
+             read_label_file(additional_label_path_for(image_path, main_folder, additional_folder)))
+            for image_path in image_paths]
+
+
+# ---------------------------------------------------------------------- 비교 작업 단위 (작업 프로세스에서 실행)
+# 비교 방식
+MODE_OVERLAP = "overlap"  # 같은 상대 경로의 추가 라벨과 라벨 수가 다르거나 겹치는 박스가 없는 이미지 목록
+MODE_NON_OVERLAPPING = "non_overlapping"  # 접미사를 뗀 이름이 같은 추가 라벨 중 일치하는 것이 없는 이미지 목록
+MODE_MATCH = "match"  # 일대일 매칭 결과 (이미지별 매칭/누락/추가 수)
+MODE_REPORT = "report"  # 일대일 매칭 결과에 라벨 수, 가장 큰 IoU, 상태를 더한 이미지별 기록 (명령줄 비교)
+
+# MODE_REPORT의 이미지 상태
+STATUS_EXACT = "exact"  # 모든 박스가 짝지어짐
+STATUS_MISMATCH = "mismatch"  # 누락 또는 추가 박스가 있음
+STATUS_MISSING_MAIN = "missing_main"  # 메인 라벨 파일 없음
+STATUS_MISSING_ADDITIONAL = "missing_additional"  # 추가 라벨 파일 없음
+STATUS_MISSING_BOTH = "missing_both"  # 두 라벨 파일 모두 없음
+
+
+def compare_chunk(mode, image_paths, main_folder, additional_folder, threshold):
+    """이미지 묶음 하나를 비교 - (출력할 행 목록, MODE_MATCH면 부분 집계 아니면 None)
+
+    - MODE_OVERLAP / MODE_NON_OVERLAPPING: 행은 기록할 이미지 경로
+    - MODE_MATCH: 행은 (이미지 경로, 매칭, 누락, 추가)
+    - MODE_REPORT: 행은 REPORT_FIELDS 키의 딕셔너리
+    """
+    if mode == MODE_REPORT:
+        return report_chunk(image_paths, main_folder, additional_folder, threshold)
+
+    if mode == MODE_MATCH:
+        report = MatchReport(threshold)
+        results = report.match_batch(image_paths, read_label_pairs(image_paths, main_folder, additional_folder))
+        return [(result.image_path, result.matched, result.missed, result.extra) for result in results], report
+
+    if mode == MODE_OVERLAP:
+        compared, label_pairs = [], []
+        for image_path, (main_labels, additional_labels) in zip(
+                image_paths, read_label_pairs(image_paths, main_folder, additional_folder)):
+            # 라벨 개수가 다르면 IoU 계산 없이 기록 대상
+            if len(main_labels) == len(additional_labels):
+                compared.append(image_path)
+                label_pairs.append((main_labels, additional_labels))
+        overlapped = dict(zip(compared, box_geometry.batch_any_iou_at_least(label_pairs, threshold)))
+        # 입력 순서 유지
+        return [image_path for image_path in image_paths if not overlapped.get(image_path, False)], None
+
+    if mode == MODE_NON_OVERLAPPING:
+        # 작업 단위 안에서는 폴더당 한 번만 읽도록 색인을 빈 상태로 두고 조회하며 채움
+        label_index = AdditionalLabelIndex(additional_folder)
+        owners, label_pairs, recorded = [], [], set()
+        for image_path in image_paths:
+            main_label_path = image_path.rsplit('.', 1)[0] + ".txt"
+            if not os.path.exists(main_label_path):
+                continue
+            additional_label_paths = label_index.label_paths(image_path, main_folder)
+
+            # 라벨 수가 같은 추가 라벨만 IoU 비교 대상
+            main_labels = read_label_file(main_label_path)
+            recorded.add(image_path)
+            for additional_labels in map(read_label_file, additional_label_paths):
+                if len(additional_labels) == len(main_labels):
+                    owners.append(image_path)
+                    label_pairs.append((main_labels, additional_labels))
+        for image_path, has_overlap in zip(owners, box_geometry.batch_any_iou_at_least(label_pairs, threshold)):
+            if has_overlap:
+                recorded.discard(image_path)
+        return [image_path for image_path in image_paths if image_path in recorded], None
+
+    raise ValueError(f"알 수 없는 비교 방식: {mode}")
+
+
+def unique_base_name_paths(image_paths):
+    """정렬된 이미지 경로 중 접미사를 뗀 파일명이 처음 나온 것만 (MODE_NON_OVERLAPPING의 중복 제거)"""
+    seen = set()
+    unique_paths = []
+    for image_path in image_paths:
+        base_name = clean_base_name(os.path.splitext(os.path.basename(image_path))[0])
+        if base_name not in seen:
+            seen.add(base_name)
+            unique_paths.append(image_path)
+    return unique_paths
+
+
+# MODE_REPORT 행의 필드 (CSV 열 순서)
+REPORT_FIELDS = ("image_path", "status", "main_count", "additional_count", "matched", "missed", "extra", "best_iou")
+
+
+def _report_status(has_main, has_additional, result):
+    if not has_main:
+        return STATUS_MISSING_BOTH if not has_additional else STATUS_MISSING_MAIN
+    if not has_additional:
+        return STATUS_MISSING_ADDITIONAL
+    return STATUS_EXACT if result.is_exact() else STATUS_MISMATCH
+
+
+def report_chunk(image_paths, main_folder, additional_folder, threshold):
+    """MODE_REPORT 작업 단위 - (이미지별 기록 딕셔너리 목록, 부분 집계)
+
+    라벨 파일이 없는 쪽은 빈 라벨로 매칭하므로 집계에서는 누락/추가 박스로 센다.
+    """
+    report = MatchReport(threshold)
+    label_pairs = read_label_pairs(image_paths, main_folder, additional_folder)
+    rows = []
+    for image_path, (labels1, labels2), result in zip(image_paths, label_pairs,
+                                                       report.match_batch(image_paths, label_pairs)):
+        # 빈 파일과 없는 파일을 구분하기 위해 라벨이 없을 때만 존재 여부 확인
+        has_main = len(labels1) > 0 or os.path.exists(image_path.rsplit('.', 1)[0] + ".txt")
+        has_additional = len(labels2) > 0 or os.path.exists(
+            additional_label_path_for(image_path, main_folder, additional_folder))
+        rows.append({"image_path": image_path, "status": _report_status(has_main, has_additional, result),
+                     "main_count": len(labels1), "additional_count": len(labels2), "matched": result.matched,
+                     "missed": result.missed, "extra": result.extra, "best_iou": round(result.best_iou, 4)})
+    return rows, report
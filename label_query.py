@@ -0,0 +1,285 @@
+import os
+import re
+import time
+
+import numpy as np
+
+from label_repository import read_label_file
+
+def summary_path_for(catalog_path):
+    """카탈로그 파일 옆에 두는 라벨 요약 캐시 경로"""
+    return catalog_path.rsplit('.', 1)[0] + ".labels.npz"
+
+
+def label_path_for(image_path):
+    """이미지와 같은 위치의 라벨 경로 (파일 존재 여부와 무관)"""
+    return image_path.rsplit('.', 1)[0] + ".txt"
+
+
+class LabelSummary:
+    """데이터셋 전체 라벨을 열 단위 배열로 모아 둔 요약 - 쿼리를 파일 읽기 없이 벡터 연산으로 평가하기 위함
+
+    - 이미지 열: 경로, 라벨 파일 수정 시각 (-1이면 라벨 없음), 박스 수
+    - 박스 열: 이미지 번호, 클래스, 너비, 높이 (정규화 좌표)
+    - 다시 만들 때 라벨 수정 시각이 같은 이미지는 이전 요약의 박스를 그대로 사용
+    """
+
+    def __init__(self, image_paths, label_mtimes, box_image, box_class, box_width, box_height):
+        self.image_paths = list(image_paths)
+        self.label_mtimes = np.asarray(label_mtimes, dtype=np.int64)
+        self.box_image = np.asarray(box_image, dtype=np.int32)
+        self.box_class = np.asarray(box_class, dtype=np.int32)
+        self.box_width = np.asarray(box_width, dtype=np.float32)
+        self.box_height = np.asarray(box_height, dtype=np.float32)
+        self._update_derived()
+
+    def _update_derived(self):
+        self.box_count = np.bincount(self.box_image, minlength=len(self.image_paths)).astype(np.int32)
+        self.box_area = self.box_width * self.box_height
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.box_aspect = np.where(self.box_height > 0, self.box_width / self.box_height, np.inf).astype(np.float32)
+        self._rows = None
+        self._box_starts = None
+
+    def __len__(self):
+        return len(self.image_paths)
+
+    @property
+    def has_label(self):
+        return self.label_mtimes >= 0
+
+    def row_of(self, image_path):
+        """이미지 경로의 행 번호 - 없으면 None"""
+        if self._rows is None:
+            self._rows = {path: row for row, path in enumerate(self.image_paths)}
+        return self._rows.get(image_path)
+
+    @classmethod
+    def build(cls, image_paths, previous=None, is_cancelled=None):
+        """이미지 경로 목록의 라벨을 읽어 요약 생성 (previous와 수정 시각이 같으면 재사용) - 취소되면 None"""
+        label_mtimes = np.full(len(image_paths), -1, dtype=np.int64)
+        box_rows, box_labels = [], []
+        for row, image_path in enumerate(image_paths):
+            if is_cancelled is not None and row % 4096 == 0 and is_cancelled():
+                return None
+            try:
+                mtime_ns = os.stat(label_path_for(image_path)).st_mtime_ns
+            except OSError:
+                continue
+            label_mtimes[row] = mtime_ns
+            labels = previous.boxes_if_unchanged(image_path, mtime_ns) if previous is not None else None
+            if labels is None:
+                labels = read_label_file(label_path_for(image_path))
+            if len(labels):
+                box_rows.append(np.full(len(labels), row, dtype=np.int32))
+                box_labels.append(labels)
+        if box_labels:
+            boxes = np.concatenate(box_labels)
+            box_image = np.concatenate(box_rows)
+        else:
+            boxes = np.empty((0, 5), dtype=np.float32)
+            box_image = np.empty(0, dtype=np.int32)
+        return cls(image_paths, label_mtimes, box_image, boxes[:, 0].astype(np.int32), boxes[:, 3], boxes[:, 4])
+
+    def boxes_if_unchanged(self, image_path, mtime_ns):
+        """수정 시각이 같으면 그 이미지의 박스 (N, 5) 배열, 아니면 None"""
+        row = self.row_of(image_path)
+        if row is None or self.label_mtimes[row] != mtime_ns:
+            return None
+        if self._box_starts is None:
+            # 박스는 이미지 순서로 쌓여 있으므로 이미지별 시작 위치만 계산
+            self._box_starts = np.concatenate(([0], np.cumsum(self.box_count)))
+        start, end = self._box_starts[row], self._box_starts[row + 1]
+        boxes = np.zeros((end - start, 5), dtype=np.float32)
+        boxes[:, 0] = self.box_class[start:end]
+        boxes[:, 3] = self.box_width[start:end]
+        boxes[:, 4] = self.box_height[start:end]
+        return boxes
+
+    def refresh(self, image_paths):
+        """일부 이미지의 라벨만 다시 읽어 반영 (폴더 감시로 바뀐 라벨) - 요약에 없는 경로(새 이미지)는 끝에 행 추가"""
+        new_paths = [path for path in dict.fromkeys(image_paths) if self.row_of(path) is None]
+        if new_paths:
+            start = len(self.image_paths)
+            self.image_paths.extend(new_paths)
+            self.label_mtimes = np.concatenate((self.label_mtimes, np.full(len(new_paths), -1, dtype=np.int64)))
+            self._rows.update((path, start + offset) for offset, path in enumerate(new_paths))
+        rows = sorted({row for row in map(self.row_of, image_paths) if row is not None})
+        if not rows:
+            return
+        keep = ~np.isin(self.box_image, rows)
+        box_image, box_class = [self.box_image[keep]], [self.box_class[keep]]
+        box_width, box_height = [self.box_width[keep]], [self.box_height[keep]]
+        for row in rows:
+            label_path = label_path_for(self.image_paths[row])
+            try:
+                self.label_mtimes[row] = os.stat(label_path).st_mtime_ns
+            except OSError:
+                self.label_mtimes[row] = -1
+                continue
+            labels = read_label_file(label_path)
+            box_image.append(np.full(len(labels), row, dtype=np.int32))
+            box_class.append(labels[:, 0].astype(np.int32))
+            box_width.append(labels[:, 3])
+            box_height.append(labels[:, 4])
+        box_image = np.concatenate(box_image)
+        order = np.argsort(box_image, kind='stable')
+        self.box_image = box_image[order]
+        self.box_class = np.concatenate(box_class)[order]
+        self.box_width = np.concatenate(box_width)[order]
+        self.box_height = np.concatenate(box_height)[order]
+        self._update_derived()
+
+    def snapshot(self):
+        """다른 스레드에 넘길 사본 - 이후 refresh()로 이 요약이 바뀌어도 사본은 그대로"""
+        return LabelSummary(list(self.image_paths), self.label_mtimes.copy(), self.box_image.copy(),
+                            self.box_class.copy(), self.box_width.copy(), self.box_height.copy())
+
+    def save(self, summary_path):
+        """압축 npz 파일로 저장 (임시 파일에 쓴 뒤 교체) - 경로는 NUL로 이은 UTF-8 바이트 하나로 저장"""
+        temp_path = summary_path + ".tmp.npz"
+        paths_blob = "\0".join(self.image_paths).encode("utf-8", "surrogateescape")
+        np.savez_compressed(temp_path, image_paths_utf8=np.frombuffer(paths_blob, dtype=np.uint8),
+                            label_mtimes=self.label_mtimes, box_image=self.box_image, box_class=self.box_class,
+                            box_width=self.box_width, box_height=self.box_height)
+        os.replace(temp_path, summary_path)
+
+    @classmethod
+    def load(cls, summary_path):
+        """저장한 요약 읽기 - 없거나 읽을 수 없으면 None"""
+        try:
+            with np.load(summary_path, allow_pickle=False) as data:
+                paths_blob = data["image_paths_utf8"].tobytes().decode("utf-8", "surrogateescape")
+                image_paths = paths_blob.split("\0") if paths_blob else []
+                return cls(image_paths, data["label_mtimes"], data["box_image"],
+                           data["box_class"], data["box_width"], data["box_height"])
+        except (OSError, ValueError, KeyError) as e:
+            if os.path.exists(summary_path):
+                print(f"라벨 요약을 읽을 수 없음: {e}")
+            return None
+
+
+class LabelQuery:
+    """라벨 내용으로 이미지를 고르는 조건
+
+    - 박스 조건(클래스, 면적, 가로세로 비)을 모두 만족하는 박스 수가 min_boxes~max_boxes인 이미지
+      (박스 조건이 있고 min_boxes를 주지 않으면 1개 이상)
+    - has_label: True면 라벨 파일이 있는 이미지만, False면 없는 이미지만
+    - 면적은 정규화 좌표 기준 (이미지 전체 = 1.0), 가로세로 비는 너비 / 높이
+    """
+    # parse()가 받는 비교 조건 키 -> 속성 이름 (min_/max_ 접두어)
+    _FIELDS = {"box": "boxes", "boxes": "boxes", "area": "area", "aspect": "aspect"}
+
+    def __init__(self, class_ids=None, min_boxes=None, max_boxes=None, min_area=None, max_area=None,
+                 min_aspect=None, max_aspect=None, has_label=None):
+        self.class_ids = None if class_ids is None else sorted(set(int(class_id) for class_id in class_ids))
+        self.min_boxes = min_boxes
+        self.max_boxes = max_boxes
+        self.min_area = min_area
+        self.max_area = max_area
+        self.min_aspect = min_aspect
+        self.max_aspect = max_aspect
+        self.has_label = has_label
+
+    def has_box_conditions(self):
+        return any(value is not None for value in (self.class_ids, self.min_area, self.max_area,
+                                                     self.min_aspect, self.max_aspect))
+
+    def box_mask(self, summary):
+        """박스 조건을 만족하는 박스 (박스 열 길이의 bool 배열)"""
+        mask = np.ones(len(summary.box_image), dtype=bool)
+        if self.class_ids is not None:
+            mask &= np.isin(summary.box_class, self.class_ids)
+        for values, low, high in ((summary.box_area, self.min_area, self.max_area),
+                                  (summary.box_aspect, self.min_aspect, self.max_aspect)):
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+    def evaluate(self, summary):
+        """조건을 만족하는 이미지 (이미지 열 길이의 bool 배열)"""
+        if self.has_box_conditions():
+            matched = np.bincount(summary.box_image[self.box_mask(summary)], minlength=len(summary))
+        else:
+            matched = summary.box_count
+        min_boxes = self.min_boxes
+        if min_boxes is None and self.has_box_conditions():
+            min_boxes = 1
+        mask = np.ones(len(summary), dtype=bool)
+        if min_boxes is not None:
+            mask &= matched >= min_boxes
+        if self.max_boxes is not None:
+            mask &= matched <= self.max_boxes
+        if self.has_label is not None:
+            mask &= summary.has_label == self.has_label
+        return mask
+
+    def select(self, summary):
+        """조건을 만족하는 이미지 경로 (요약 순서 - 요약을 만든 뒤 추가된 이미지는 끝)"""
+        return [summary.image_paths[row] for row in np.flatnonzero(self.evaluate(summary))]
+
+    @classmethod
+    def parse(cls, text):
+        """'class=3,5 boxes>10 area<0.001 aspect>=4 label=no' 같은 문자열을 쿼리로 변환 (잘못되면 ValueError)
+
+        - class=ID[,ID...]   박스 클래스
+        - boxes OP N         (박스 조건을 만족하는) 박스 수, OP는 > >= < <= =
+        - area OP X / aspect OP X   박스 면적 / 가로세로 비
+        - label=yes|no       라벨 파일 존재 여부
+        """
+        query = cls()
+        for term in text.split():
+            match = re.fullmatch(r'([a-z]+)(>=|<=|>|<|=)(.+)', term.lower())
+            if match is None:
+                raise ValueError(f"알 수 없는 조건: {term}")
+            key, operator, value = match.groups()
+            if key in ("class", "classes") and operator == "=":
+                query.class_ids = sorted(set(int(class_id) for class_id in value.split(',')))
+            elif key == "label" and operator == "=" and value in ("yes", "no", "true", "false", "1", "0"):
+                query.has_label = value in ("yes", "true", "1")
+            elif key in cls._FIELDS:
+                name = cls._FIELDS[key]
+                if name == "boxes":
+                    number = int(value)
+                    low, high = {">": (number + 1, None), ">=": (number, None), "<": (None, number - 1),
+                                 "<=": (None, number), "=": (number, number)}[operator]
+                else:
+                    # 요약의 면적/가로세로 비는 float32이므로 > / <는 바로 다음 float32 값을 포함 경계로 사용
+                    number = np.float32(value)
+                    above = float(np.nextafter(number, np.float32(np.inf)))
+                    below = float(np.nextafter(number, np.float32(-np.inf)))
+                    number = float(number)
+                    low, high = {">": (above, None), ">=": (number, None), "<": (None, below),
+                                 "<=": (None, number), "=": (number, number)}[operator]
+                if low is not None:
+                    setattr(query, f"min_{name}", low)
+                if high is not None:
+                    setattr(query, f"max_{name}", high)
+            else:
+                raise ValueError(f"알 수 없는 조건: {term}")
+        return query
+
+    def __repr__(self):
+        fields = {key: value for key, value in vars(self).items() if value is not None}
+        return f"LabelQuery({', '.join(f'{key}={value!r}' for key, value in fields.items())})"
+
+
+class QueryResult:
+    """쿼리 한 번의 결과 - 일치한 이미지 경로와 평가 시간"""
+
+    def __init__(self, query, image_paths, seconds):
+        self.query = query
+        self.image_paths = image_paths
+        self.seconds = seconds
+
+    def __len__(self):
+        return len(self.image_paths)
+
+
+def run_query(summary, query):
+    """요약에 쿼리를 적용해 QueryResult 반환"""
+    started = time.perf_counter()
+    image_paths = query.select(summary)
+    return QueryResult(query, image_paths, time.perf_counter() - started)
@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# 빈 라벨 (라벨 파일이 없거나 유효한 줄이 없을 때)
+EMPTY_LABELS = np.empty((0, 5), dtype=np.float32)
+EMPTY_LABELS.setflags(write=False)
+
+
+def parse_label_text(text):
+    """YOLO 라벨 텍스트를 (N, 5) float32 배열 [class_id, x_center, y_center, width, height]로 변환
+
+    다섯 값이 아닌 줄이나 숫자가 아닌 줄은 건너뛴다.
+    """
+    lines = [parts for parts in (line.split() for line in text.splitlines()) if parts]
+    if not lines:
+        return EMPTY_LABELS
+    # 빠른 경로: 줄마다 다섯 값이면 한 번에 변환 (전체 개수만 맞는 4값/6값 줄 섞임은 아래에서 줄 단위로)
+    if all(len(parts) == 5 for parts in lines):
+        try:
+            return np.array(lines, dtype=np.float32).reshape(-1, 5)
+        except ValueError:
+            pass
+
+    rows = []
+    for parts in lines:
+        if len(parts) != 5:
+            continue
+        try:
+            rows.append([float(part) for part in parts])
+        except ValueError:
+            continue
+    if not rows:
+        return EMPTY_LABELS
+    return np.array(rows, dtype=np.float32)
+
+
+def read_label_file(label_path):
+    """라벨 파일을 읽어 (N, 5) 배열로 반환 - 파일이 없으면 빈 배열"""
+    try:
+        with open(label_path, 'r') as file:
+            return parse_label_text(file.read())
+    except OSError:
+        return EMPTY_LABELS
+
+
+class LabelRepository:
+    """라벨 파일 파싱 결과를 (경로, 수정 시각, 크기) 기준으로 한 번만 파싱해 공유하는 저장소
+
+    반환하는 배열은 여러 곳에서 공유하므로 읽기 전용이다.
+    """
+
+    def __init__(self, max_entries=8192):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.parse_seconds = 0.0
+        self._entries = OrderedDict()  # 경로 -> (mtime_ns, size, 배열)
+        self._lock = threading.Lock()
+
+    def get(self, label_path):
+        """라벨 배열 (N, 5) 반환 - 파일이 바뀌었으면 다시 파싱, 없으면 빈 배열"""
+        if not label_path:
+            return EMPTY_LABELS
+        try:
+            stat = os.stat(label_path)
+        except OSError:
+            self.invalidate(label_path)
+            return EMPTY_LABELS
+
+        with self._lock:
+            entry = self._entries.get(label_path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(label_path)
+                self.hits += 1
+                return entry[2]
+
+        started = time.perf_counter()
+        labels = read_label_file(label_path)
+        labels.setflags(write=False)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.misses += 1
+            self.parse_seconds += elapsed
+            self._entries[label_path] = (stat.st_mtime_ns, stat.st_size, labels)
+            self._entries.move_to_end(label_path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return labels
+
+    def invalidate(self, label_path):
+        """캐시 항목 제거 (파일 이동/삭제 시)"""
+        with self._lock:
+            self._entries.pop(label_path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """적중/파싱 횟수와 누적 파싱 시간"""
+        return {
+            "hits": self.hits,
+            "parses": self.misses,
+            "parse_ms": self.parse_seconds * 1000,
+            "parse_ms_avg": self.parse_seconds * 1000 / self.misses if self.misses else 0.0,
+            "entries": len(self._entries),
+        }
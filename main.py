@@ -1,3 +1,4 @@
+import multiprocessing
 import sys
 from PySide6.QtWidgets import QApplication
 from controller import ImageViewerController
@@ -14,7 +15,11 @@ Controller (ImageViewerController):
 '''
 
 if __name__ == "__main__":
+    # 라벨 비교 작업 프로세스 (실행 파일로 묶었을 때도 spawn으로 시작되게)
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
+    # 카탈로그 등 사용자 데이터 폴더 이름 (QStandardPaths.AppDataLocation)
+    app.setApplicationName("ImageReviewTool")
     controller = ImageViewerController()
     controller.view.show()
     sys.exit(app.exec())
\ No newline at end of file
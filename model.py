@@ -1,21 +1,93 @@
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-from PySide6.QtWidgets import QFileSystemModel
-from PySide6.QtCore import QDir, QModelIndex, QDirIterator, QFileInfo, QFile, QObject, Signal
+from PySide6.QtCore import QDir, QModelIndex, QFileInfo, QObject, Signal
+
+from additional_label_index import AdditionalLabelIndex
+from dataset_catalog import DatasetCatalog
+from dataset_index import IMAGE_EXTENSIONS, DatasetIndex, natural_sort_key, normalize_path
+from dir_crawler import crawl_paths
+from image_list_model import ImageListModel
+from dataset_watcher import DatasetChange, DatasetWatcher
+from image_cache import ImagePrefetcher
+from label_query import LabelSummary, run_query, summary_path_for
+from label_repository import LabelRepository
+from move_journal import JOURNAL_FILE_NAME, FileMover, MoveHistory, MoveJournal, MoveRequest
+from triage import DEFAULT_BINS, TriageStats
 
 
 class ImageViewerModel(QObject):
+    # 이동 기록이 이 줄 수를 넘으면 열 때 현재 되돌리기 상태만 남기고 압축
+    MOVE_JOURNAL_COMPACT_RECORDS = 20000
+    # 색인을 유지하는 추가 라벨 루트 수
+    ADDITIONAL_LABEL_INDEX_LIMIT = 4
+
     # 이미지 변경 시그널
     image_changed = Signal(str)
-    # 레이블 변경 시그널
-    labels_changed = Signal(str)
+    # 카탈로그 백그라운드 정리 완료 시그널 (CatalogScanResult)
+    dataset_reconciled = Signal(object)
+    # 폴더 감시로 인덱스를 갱신한 뒤의 시그널 (DatasetChange)
+    dataset_changed = Signal(object)
+    # 라벨 요약 준비 완료 시그널 (LabelSummary)
+    label_summary_ready = Signal(object)
+    # 파일 이동 실패 시그널 (이미지 경로, 오류 메시지) - 인덱스는 이미 되돌린 뒤
+    move_failed = Signal(str, str)
+    # 분류 폴더별 이동 수가 바뀜
+    triage_updated = Signal()
+    # 작업 스레드 -> GUI 스레드 전달용 (카탈로그, 스캔 결과)
+    _catalog_scanned = Signal(object, object)
+    # 작업 스레드 -> GUI 스레드 전달용 (카탈로그, 라벨 요약)
+    _label_summary_built = Signal(object, object)
 
     def __init__(self):
         super().__init__()
         self.current_folder = None
         self.cut_folder = None
-        self.file_model = QFileSystemModel()
+        # 트리 뷰에 보여줄 이미지 목록 (데이터셋 인덱스에서 바로 행을 꺼냄)
+        self.image_list_model = ImageListModel()
         self.folder_path = ""  # 이미지 루트 디렉토리 추가
+        self.dataset_index = None  # 루트 아래 이미지의 정렬된 인덱스 (set_folder마다 한 번 생성)
+        self.dataset_catalog = None  # 루트별 SQLite 카탈로그 (다시 열 때 즉시 표시)
+        self._catalog_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog")
+        self._catalog_cancel = threading.Event()
+        self._moved_paths = set()  # 카탈로그 정리 중 이동된 이미지 (인덱스 재생성 시 다시 제거)
+        self._catalog_scanned.connect(self.on_catalog_scanned)
+        self.label_summary = None  # 라벨 쿼리용 열 단위 요약 (백그라운드에서 생성)
+        self.playlist = None  # 라벨 쿼리 결과 인덱스 - 있으면 트리 뷰와 다음/이전 이동이 이 목록을 따름
+        self.last_query_result = None
+        self._label_summary_built.connect(self.on_label_summary_built)
+        # 추가 라벨 루트 -> 라벨 파일 색인 (최근 ADDITIONAL_LABEL_INDEX_LIMIT개, 백그라운드에서 미리 읽음)
+        self.additional_label_indexes = OrderedDict()
+        self._label_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="label-index")
+
+        # 다른 프로세스가 쓰는 이미지/라벨을 다시 열지 않고 반영
+        self.dataset_watcher = DatasetWatcher()
+        self.dataset_watcher.changes_ready.connect(self.apply_dataset_changes)
+
+        # 다음/이전 이미지 미리 디코딩
+        self.prefetcher = ImagePrefetcher()
+        self.prefetch_next_count = 4
+        self.prefetch_previous_count = 2
+
+        # 파싱한 라벨 배열 공유 저장소
+        self.label_repository = LabelRepository()
+
+        # 잘라내기 이동은 작업 스레드에서 묶어 처리 (화면은 인덱스를 먼저 갱신해 바로 다음 이미지로)
+        self.file_mover = FileMover()
+        self.file_mover.moves_finished.connect(self.on_moves_finished)
+        self.move_journal = None
+        # 잘라내기 되돌리기/다시 하기 (이동 기록에서 복원하므로 비정상 종료 뒤에도 유지)
+        self.move_history = MoveHistory()
+        self.move_session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self._moves_in_flight = set()  # 되돌리기/다시 하기를 요청했지만 아직 끝나지 않은 묶음
+        self._reveal_request = None  # 끝나면 되돌린 이미지를 표시할 요청
+        # 단축키 1~9 -> 분류 폴더 접미사, 폴더별 이동 수와 처리 속도
+        self.triage_bins = dict(DEFAULT_BINS)
+        self.triage_stats = TriageStats()
 
     def set_additional_label_dir(self, dir_path):
         """Set the directory path for additional labels"""
@@ -38,6 +110,7 @@ class ImageViewerModel(QObject):
         """현재 폴더를 설정하고 첫 번째 이미지를 로드"""
         self.folder_path = folder_path  # self.folder_path 설정 추가
         self.current_folder = folder_path
+        self.open_dataset(folder_path)
         self.image_changed.emit(self.get_first_image_path(folder_path))
 
     def get_first_image_path(self, folder_path):
@@ -46,34 +119,50 @@ class ImageViewerModel(QObject):
         :param folder_path:
         :return:
         '''
-        iterator = QDirIterator(folder_path, ["*.png", "*.jpg", "*.jpeg"], QDir.Files, QDirIterator.Subdirectories)
-        if iterator.hasNext():
-            return iterator.next()
+        if self.dataset_index is not None:
+            first_path = self.dataset_index.first_path(folder_path)
+            if first_path:
+                return first_path
+        # 인덱스 밖 폴더는 병렬 탐색으로 처음 찾은 이미지를 반환 (찾는 즉시 탐색 중단)
+        for image_path in crawl_paths(folder_path, IMAGE_EXTENSIONS):
+            return normalize_path(image_path)
         return None
 
     def get_image_path(self, index: QModelIndex):
-        """주어진 인덱스의 이미지 파일 경로를 반환"""
-        if self.file_model.isDir(index):
-            folder_path = self.file_model.filePath(index)
-            return self.get_first_image_path(folder_path)
-        file_path = self.file_model.filePath(index)
-        if file_path.lower().endswith(('.png', '.jpg', '.jpeg')):
-            return file_path
-        return None
+        """주어진 인덱스의 이미지 파일 경로를 반환 (폴더 행이면 폴더의 첫 이미지)"""
+        return self.image_list_model.image_path(index)
 
     def get_label_path(self, image_path):
-        """이미지 파일에 대응하는 레이블 파일 경로를 반환"""
+        """이미지 파일에 대응하는 레이블 파일 경로를 반환 (없으면 None, 시그널 없는 순수 조회)"""
         label_path = image_path.rsplit('.', 1)[0] + ".txt"
         if QFileInfo.exists(label_path):
-            self.labels_changed.emit(label_path)
             return label_path
         return None
 
+    def load_labels(self, label_path):
+        """라벨 파일을 (N, 5) 배열 [class_id, x_center, y_center, width, height]로 반환 (파싱 결과 공유)"""
+        return self.label_repository.get(label_path)
+
     def create_cut_folder(self):
         """잘라내기 폴더 생성"""
         if self.current_folder:
             self.cut_folder = f"{self.current_folder}_cut"
             QDir().mkpath(self.cut_folder)
+            if self.move_journal is None:
+                self.open_move_journal()
+
+    def open_move_journal(self):
+        """잘라내기 폴더의 이동 기록을 열어 끊긴 이동을 정리하고 되돌리기 스택 복원 (기록이 길면 압축)"""
+        self.move_journal = MoveJournal(os.path.join(self.cut_folder, JOURNAL_FILE_NAME))
+        self._moves_in_flight = set()
+        try:
+            records = self.move_journal.recover()
+            self.move_history = MoveHistory.replay(records)
+            if len(records) > self.MOVE_JOURNAL_COMPACT_RECORDS:
+                self.move_journal.compact(self.move_history)
+        except OSError as e:
+            print(f"이동 기록을 읽을 수 없음: {e}")
+            self.move_history = MoveHistory()
 
     def cut_folder_exists(self):
         """잘라내기 폴더 존재 여부 확인"""
@@ -82,34 +171,356 @@ class ImageViewerModel(QObject):
             return QDir(cut_folder_path).exists()
         return False
 
-    def move_data_file(self, image_path):
-        """이미지 파일과 관련 레이블 파일을 잘라내기 폴더로 이동"""
+    def move_data_file(self, image_path, bin_suffix="_cut"):
+        """이미지 파일과 관련 레이블 파일을 분류 폴더({데이터셋 폴더}{bin_suffix})로 이동
+
+        작업 스레드에서 처리하고 다음 이미지는 바로 표시한다. 이동 기록은 어느 폴더로 옮기든 잘라내기 폴더에 하나로 남긴다.
+        """
         if not self.cut_folder:
             self.create_cut_folder()
         if not image_path.lower().endswith(('.png', '.jpg', '.jpeg')):
             return
         relative_path = QDir(self.current_folder).relativeFilePath(image_path)
-        cut_image_path = QDir(self.cut_folder).filePath(relative_path)
-        QDir().mkpath(QFileInfo(cut_image_path).absolutePath())
-        QFile.rename(image_path, cut_image_path)
+        cut_image_path = QDir(f"{self.current_folder}{bin_suffix}").filePath(relative_path)
+        label_path = image_path.rsplit('.', 1)[0] + ".txt"
+        cut_label_path = cut_image_path.rsplit('.', 1)[0] + ".txt"
+        if self.move_journal is None:
+            self.open_move_journal()
+        self.file_mover.enqueue(MoveRequest(image_path, [(image_path, cut_image_path), (label_path, cut_label_path)],
+                                            optional=[label_path], journal=self.move_journal,
+                                            session=self.move_session))
+        self._remove_moved_image(image_path)
+        self.image_changed.emit(self.get_next_image_path(image_path))
 
+    def _remove_moved_image(self, image_path):
+        """이동이 끝나기 전에 인덱스에서 먼저 뺌 (실패하면 on_moves_finished에서 되돌림)"""
         label_path = image_path.rsplit('.', 1)[0] + ".txt"
-        if QFileInfo.exists(label_path):
-            cut_label_path = cut_image_path.rsplit('.', 1)[0] + ".txt"
-            QFile.rename(label_path, cut_label_path)
+        self.prefetcher.discard(image_path)
+        if self.dataset_index is not None:
+            self.dataset_index.remove(image_path)
+            self._moved_paths.add(image_path)
+        if self.playlist is not None:
+            self.playlist.remove(image_path)
+        self.image_list_model.remove_paths([image_path])
+        self.label_repository.invalidate(label_path)
 
-        self.image_changed.emit(self.get_next_image_path(image_path))
+    def _restore_moved_image(self, image_path):
+        """잘라냈던 이미지를 인덱스와 목록에 되돌림 (이동 실패 / 되돌리기 완료)"""
+        self._moved_paths.discard(image_path)
+        if self.dataset_index is None or not self.dataset_index.contains_path(image_path):
+            return
+        self.dataset_index.add_paths([image_path])
+        in_playlist = self.playlist is not None and self.playlist.position_of(image_path) is not None
+        if in_playlist:
+            self.playlist.add_paths([image_path])
+        if self.playlist is None or in_playlist:
+            self.image_list_model.add_paths([image_path])
+        self.label_repository.invalidate(image_path.rsplit('.', 1)[0] + ".txt")
+
+    def on_moves_finished(self, requests):
+        """작업 스레드의 이동 결과 반영 - 되돌리기 스택 갱신, 옮기지 못한 이미지는 인덱스에 되돌리고 알림"""
+        for request in requests:
+            self._moves_in_flight.discard(request.of)
+            if request.moved and request.journal is self.move_journal:
+                self.move_history.apply(request.to_group())
+            if request.kind == "undo" and request.moved:
+                self._restore_moved_image(request.image_path)
+                self.triage_stats.record_undo(self.bin_of(request.moves[0][0]))
+            elif request.kind in ("cut", "redo") and not request.moved:
+                self._restore_moved_image(request.image_path)
+            elif request.kind in ("cut", "redo"):
+                self.triage_stats.record(self.bin_of(request.moves[0][1]))
+            if request.error is not None:
+                self.move_failed.emit(request.image_path, request.error)
+            if request is self._reveal_request:
+                self._reveal_request = None
+                if request.moved:
+                    self.image_changed.emit(request.image_path)
+        self.triage_updated.emit()
+
+    def bin_of(self, path):
+        """분류 폴더 안 경로의 폴더 접미사 (현재 데이터셋 기준) - 모르면 '_cut'"""
+        for suffix in sorted(set(self.triage_bins.values()) | {"_cut"}, key=len, reverse=True):
+            if path.startswith(f"{self.current_folder}{suffix}/"):
+                return suffix
+        return "_cut"
+
+    def undo_move(self):
+        """가장 최근 잘라내기를 되돌림 - 되돌릴 것이 없으면 False"""
+        group = next((group for group in reversed(self.move_history.undo_stack)
+                      if group.group not in self._moves_in_flight), None)
+        if group is None:
+            return False
+        self._reveal_request = self._enqueue_undo(group)
+        return True
+
+    def undo_session_moves(self):
+        """이번 세션에서 잘라낸 이미지를 모두 되돌림 (작업 스레드에서 동시에 복원) - 되돌린 묶음 수"""
+        groups = [group for group in self.move_history.session_groups(self.move_session)
+                  if group.group not in self._moves_in_flight]
+        for group in groups:
+            self._enqueue_undo(group)
+        return len(groups)
+
+    def _enqueue_undo(self, group):
+        self._moves_in_flight.add(group.group)
+        request = MoveRequest(group.image_path, [(dst, src) for src, dst in reversed(group.moves)],
+                              journal=self.move_journal, kind="undo", of=group.group, session=self.move_session)
+        self.file_mover.enqueue(request)
+        return request
+
+    def redo_move(self):
+        """가장 최근에 되돌린 잘라내기를 다시 실행 - 다시 잘라낸 이미지 경로, 없으면 None"""
+        group = next((group for group in reversed(self.move_history.redo_stack)
+                      if group.group not in self._moves_in_flight), None)
+        if group is None:
+            return None
+        self._moves_in_flight.add(group.group)
+        self.file_mover.enqueue(MoveRequest(group.image_path, group.moves, journal=self.move_journal,
+                                            kind="redo", of=group.group, session=self.move_session))
+        self._remove_moved_image(group.image_path)
+        return group.image_path
+
+    def open_dataset(self, folder_path):
+        """카탈로그가 있으면 카탈로그로 즉시 인덱스를 만들고, 파일 시스템과는 백그라운드에서 맞춤"""
+        self._catalog_cancel.set()
+        self._catalog_cancel = threading.Event()
+        self._moved_paths = set()
+        # 잘라내기 폴더와 이동 기록은 데이터셋마다 따로
+        self.cut_folder = f"{folder_path}_cut" if QDir(f"{folder_path}_cut").exists() else None
+        self.move_journal = None
+        self.move_history = MoveHistory()
+        if self.cut_folder:
+            self.open_move_journal()
+        self.playlist = None
+        self.label_summary = None
+        self.last_query_result = None
+        try:
+            self.dataset_catalog = DatasetCatalog(folder_path)
+            catalog_paths = self.dataset_catalog.image_paths()
+        except (sqlite3.Error, OSError) as e:
+            print(f"카탈로그를 열 수 없음: {e}")
+            self.dataset_catalog = None
+            catalog_paths = []
+        # 처음 여는 폴더는 직접 훑고, 카탈로그가 있으면 목록을 그대로 사용
+        self.set_dataset_index(DatasetIndex(folder_path, paths=catalog_paths or None))
+        self.dataset_watcher.clear()
+        self.dataset_watcher.watch_directories(self.dataset_index.directory_paths())
+        if self.dataset_catalog is not None:
+            self.reconcile_catalog()
+            self.build_label_summary()
+
+    def set_dataset_index(self, dataset_index):
+        """데이터셋 인덱스 교체 (라벨 쿼리 목록이 없으면 이미지 목록 모델도 함께 교체)"""
+        self.dataset_index = dataset_index
+        if self.playlist is None:
+            self.image_list_model.set_dataset_index(dataset_index)
+
+    def reconcile_catalog(self):
+        """바뀐 폴더만 다시 읽어 카탈로그 갱신 (백그라운드)"""
+        catalog = self.dataset_catalog
+        cancel = self._catalog_cancel
+
+        def scan():
+            try:
+                result = catalog.scan(cancel.is_set)
+            except (sqlite3.Error, OSError) as e:
+                print(f"카탈로그 갱신 중 오류 발생: {e}")
+                return
+            if not result.cancelled:
+                self._catalog_scanned.emit(catalog, result)
+
+        self._catalog_executor.submit(scan)
+
+    def on_catalog_scanned(self, catalog, result):
+        """카탈로그 정리 결과가 현재 인덱스와 다르면 인덱스 교체"""
+        if catalog is not self.dataset_catalog:
+            return
+        if result.changed:
+            paths = catalog.image_paths()
+            if paths != self.dataset_index.paths():
+                dataset_index = DatasetIndex(catalog.root_path, paths=paths)
+                for moved_path in self._moved_paths:
+                    dataset_index.remove(moved_path)
+                self.set_dataset_index(dataset_index)
+                self.build_label_summary()
+        self.dataset_watcher.watch_directories(self.dataset_index.directory_paths() |
+                                               set(catalog.directory_paths()))
+        self.dataset_reconciled.emit(result)
+
+    def build_label_summary(self):
+        """현재 인덱스의 라벨 요약 생성 (백그라운드, 카탈로그 옆 캐시에서 바뀐 라벨만 다시 읽음)"""
+        catalog = self.dataset_catalog
+        cancel = self._catalog_cancel
+        image_paths = self.dataset_index.paths()
+        summary_path = summary_path_for(catalog.catalog_path)
+        # GUI 스레드의 refresh()와 겹치지 않도록 작업 스레드에는 사본을 넘김
+        previous = self.label_summary.snapshot() if self.label_summary is not None else None
+
+        def build():
+            cached = previous or LabelSummary.load(summary_path)
+            summary = LabelSummary.build(image_paths, previous=cached, is_cancelled=cancel.is_set)
+            if summary is None:
+                return
+            try:
+                summary.save(summary_path)
+            except OSError as e:
+                print(f"라벨 요약을 저장할 수 없음: {e}")
+            self._label_summary_built.emit(catalog, summary)
+
+        self._catalog_executor.submit(build)
+
+    def on_label_summary_built(self, catalog, summary):
+        if catalog is not self.dataset_catalog:
+            return
+        self.label_summary = summary
+        self.label_summary_ready.emit(summary)
+
+    def shutdown(self):
+        """종료 시 정리 - 백그라운드 스캔과 미리 읽기를 중단하고 대기 중인 파일 이동은 끝까지 처리 (기록에 남김)"""
+        self._catalog_cancel.set()
+        self.prefetcher.shutdown()
+        self.file_mover.wait()
+
+    def additional_label_index(self, root_path):
+        """추가 라벨 루트의 색인 - 처음이면 만들고 백그라운드에서 전체를 미리 읽기 시작 (다 읽기 전에도 조회 가능)"""
+        index = self.additional_label_indexes.get(root_path)
+        if index is not None:
+            self.additional_label_indexes.move_to_end(root_path)
+            return index
+        index = AdditionalLabelIndex(root_path)
+        self.additional_label_indexes[root_path] = index
+        while len(self.additional_label_indexes) > self.ADDITIONAL_LABEL_INDEX_LIMIT:
+            self.additional_label_indexes.popitem(last=False)
+        # 미리 읽는 중에 목록에서 밀려나면 중단
+        self._label_index_executor.submit(
+            index.build, lambda: self.additional_label_indexes.get(root_path) is not index)
+        return index
+
+    def query_labels(self, query):
+        """라벨 쿼리를 실행해 결과 목록을 트리 뷰와 다음/이전 이동 대상으로 설정 - 요약이 아직 없으면 None"""
+        if self.label_summary is None:
+            return None
+        result = run_query(self.label_summary, query)
+        # 요약 생성 뒤 이동된 이미지는 제외하고 트리 뷰 표시 순서로 정렬
+        image_paths = sorted((path for path in result.image_paths if path in self.dataset_index),
+                             key=self.dataset_index.position_of)
+        result.image_paths = image_paths
+        self.last_query_result = result
+        self.playlist = DatasetIndex(self.dataset_index.root_path, paths=image_paths)
+        self.image_list_model.set_dataset_index(self.playlist)
+        return result
+
+    def clear_label_query(self):
+        """라벨 쿼리 해제 - 전체 데이터셋 목록으로 복귀"""
+        if self.playlist is None:
+            return
+        self.playlist = None
+        self.last_query_result = None
+        self.image_list_model.set_dataset_index(self.dataset_index)
+
+    def watch_label_file(self, label_path):
+        """현재 라벨 파일의 제자리 수정 감시 (폴더 감시로는 감지되지 않음)"""
+        self.dataset_watcher.set_focus_files([label_path] if label_path else [])
+
+    def apply_dataset_changes(self, dir_paths, file_paths, first_event_time):
+        """변경된 폴더만 다시 읽어 인덱스와 라벨 캐시를 증분 갱신 (전체 재스캔 없음)"""
+        if self.dataset_index is None:
+            return
+        index = self.dataset_index
+        change = DatasetChange(first_event_time)
+        change.files.update(normalize_path(path) for path in file_paths)
+        added, removed, new_dirs = [], [], []
+        watched_dirs = self.dataset_watcher.watched_directories()
+        for dir_path in map(normalize_path, dir_paths):
+            change.directories.add(dir_path)
+            listing = DatasetIndex.list_directory(dir_path)
+            if listing is None:
+                # 폴더가 사라짐 - 그 아래 항목 모두 제거
+                removed += [path for path in index.paths() if path.startswith(dir_path + '/')]
+                self.dataset_watcher.unwatch_directories([dir_path])
+                continue
+            sub_dirs, image_paths = listing
+            current = set(index.paths_in_directory(dir_path))
+            added += [path for path in image_paths if path not in current]
+            removed += list(current.difference(image_paths))
+            for sub_dir in sub_dirs:
+                if sub_dir not in watched_dirs:
+                    new_dirs.append(sub_dir)
+                    added += DatasetIndex.scan_paths(sub_dir)
+
+        index.add_paths(added)
+        if self.playlist is None:
+            # 라벨 쿼리 목록에는 새 이미지를 넣지 않음 (쿼리를 다시 실행하면 포함)
+            self.image_list_model.add_paths(added)
+        self.image_list_model.remove_paths(removed)
+        for image_path in removed:
+            index.remove(image_path)
+            if self.playlist is not None:
+                self.playlist.remove(image_path)
+            self.prefetcher.discard(image_path)
+            self.label_repository.invalidate(image_path.rsplit('.', 1)[0] + ".txt")
+        for file_path in change.files:
+            self.label_repository.invalidate(file_path)
+        if self.label_summary is not None:
+            # 바뀐 폴더의 라벨 요약 갱신 (다음 쿼리부터 반영)
+            # 새 이미지(하위 폴더 포함)는 요약에 행이 추가됨
+            touched = [path for dir_path in change.directories for path in index.paths_in_directory(dir_path)]
+            touched += added
+            candidates = (path.rsplit('.', 1)[0] + ext for path in change.files for ext in IMAGE_EXTENSIONS)
+            touched += [path for path in candidates if path in index]
+            self.label_summary.refresh(touched)
+        if added:
+            new_dirs += [path.rsplit('/', 1)[0] for path in added]
+        self.dataset_watcher.watch_directories(set(new_dirs))
+
+        change.added, change.removed = added, removed
+        self.dataset_changed.emit(change)
+        self.dataset_watcher.record_latency(first_event_time)
+
+    def is_indexed(self, image_path):
+        """이미지가 현재 데이터셋 인덱스에 있는지 여부 (이동되어 제거 표시된 경로 포함)"""
+        return self.dataset_index is not None and self.dataset_index.position_of(image_path) is not None
+
+    def _navigation_index(self, image_path):
+        """(이동에 쓸 인덱스, 폴더 안에서만 이동 여부) - 라벨 쿼리 목록의 이미지면 목록을 따라 폴더를 넘어 이동"""
+        if self.playlist is not None and self.playlist.position_of(image_path) is not None:
+            return self.playlist, False
+        return self.dataset_index, True
+
+    def list_images_in_dir(self, dir_path):
+        """디렉토리 안의 이미지 파일 경로를 트리 뷰와 같은 순서로 반환"""
+        names = QDir(dir_path).entryList(["*.png", "*.jpg", "*.jpeg"], QDir.Files)
+        names.sort(key=natural_sort_key)
+        return [QDir(dir_path).filePath(name) for name in names]
 
     def get_next_image_path(self, current_image_path):
-        """현재 이미지의 다음 이미지 경로를 반환"""
+        """현재 이미지의 다음 이미지 경로를 반환 (이동되어 사라진 파일이면 그 다음 위치)"""
+        if self.is_indexed(current_image_path):
+            index, within_directory = self._navigation_index(current_image_path)
+            return index.next_path(current_image_path, within_directory=within_directory)
         current_dir = QFileInfo(current_image_path).absolutePath()
-        iterator = QDirIterator(current_dir, ["*.png", "*.jpg", "*.jpeg"], QDir.Files)
-        found_current = False
-        while iterator.hasNext():
-            next_path = iterator.next()
-            if found_current:
+        current_key = natural_sort_key(QFileInfo(current_image_path).fileName())
+        for next_path in self.list_images_in_dir(current_dir):
+            if natural_sort_key(QFileInfo(next_path).fileName()) > current_key:
                 return next_path
-            if next_path == current_image_path:
-                found_current = True
         return None
 
+    def get_neighbor_image_paths(self, image_path, next_count, previous_count):
+        """탐색 순서상 다음 next_count개, 이전 previous_count개 이미지 경로 반환 (가까운 순)"""
+        if self.is_indexed(image_path):
+            index, within_directory = self._navigation_index(image_path)
+            return index.neighbors(image_path, next_count, previous_count, within_directory=within_directory)
+        paths = self.list_images_in_dir(QFileInfo(image_path).absolutePath())
+        if image_path not in paths:
+            return []
+        position = paths.index(image_path)
+        next_paths = paths[position + 1:position + 1 + next_count]
+        previous_paths = paths[max(0, position - previous_count):position][::-1]
+        return next_paths + previous_paths
+
+    def prefetch_around(self, image_path):
+        """현재 이미지 주변 이미지를 백그라운드에서 미리 디코딩"""
+        if image_path:
+            self.prefetcher.prefetch(self.get_neighbor_image_paths(
+                image_path, self.prefetch_next_count, self.prefetch_previous_count))
@@ -0,0 +1,451 @@
+import errno
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+# 잘라내기 폴더 루트에 두는 이동 기록 (점으로 시작해 트리 뷰에는 보이지 않음)
+JOURNAL_FILE_NAME = ".imagereviewtool_moves.jsonl"
+
+
+def _fsync_directory(dir_path):
+    """폴더 항목 변경(생성/삭제)을 디스크에 반영 - 지원하지 않는 플랫폼은 무시"""
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _destination_exists_error(dst_path):
+    return FileExistsError(errno.EEXIST, "대상 파일이 이미 있음", dst_path)
+
+
+def _link_or_rename(src_path, dst_path):
+    """대상을 덮어쓰지 않는 이름 변경 - 하드 링크 후 원본 삭제, 하드 링크를 못 쓰는 파일 시스템은 확인 후 rename"""
+    try:
+        os.link(src_path, dst_path)
+    except OSError as e:
+        if e.errno in (errno.EEXIST, errno.EXDEV):
+            raise
+        # FAT/exFAT, 일부 네트워크 드라이브 등 - 확인과 rename 사이의 틈은 남지만 Windows의 rename은 덮어쓰지 않음
+        if os.path.lexists(dst_path):
+            raise _destination_exists_error(dst_path)
+        os.rename(src_path, dst_path)
+        return
+    os.remove(src_path)
+
+
+def move_file(src_path, dst_path):
+    """파일 이동 - 같은 장치면 이름 변경, 다른 장치면 복사 + fsync 후 원본 삭제 (실패하면 OSError)
+
+    대상 파일이 이미 있으면 덮어쓰지 않고 FileExistsError
+    """
+    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+    if os.path.lexists(dst_path):
+        raise _destination_exists_error(dst_path)
+    try:
+        _link_or_rename(src_path, dst_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # 다른 장치: 임시 이름으로 끝까지 쓴 뒤 대상 이름을 붙여 중간에 끊겨도 반쯤 쓴 대상 파일이 남지 않게 함
+    temp_path = dst_path + ".moving"
+    try:
+        with open(src_path, 'rb') as src, open(temp_path, 'xb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+            dst.flush()
+            os.fsync(dst.fileno())
+        shutil.copystat(src_path, temp_path)
+        _link_or_rename(temp_path, dst_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(os.path.dirname(dst_path))
+    os.remove(src_path)
+    _fsync_directory(os.path.dirname(src_path))
+
+
+def _same_content(src_path, dst_path):
+    """대상이 이 이동으로 생긴 파일인지 (하드 링크면 같은 파일, 복사면 크기와 수정 시각이 같음)"""
+    try:
+        if os.path.samefile(src_path, dst_path):
+            return True
+        src_stat, dst_stat = os.stat(src_path), os.stat(dst_path)
+    except OSError:
+        return False
+    return src_stat.st_size == dst_stat.st_size and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+
+
+class MoveJournal:
+    """추가만 하는 이동 기록 (JSON Lines)
+
+    - 이동 전에 {"op": "move", id, group, src, dst}를, 끝나면 {"op": "done"|"failed", id}를 남긴다.
+    - group은 함께 이동한 파일 묶음 (이미지 + 라벨)
+    - 완료 기록이 없는 move는 중간에 끊긴 작업이다 (pending()).
+    """
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._next_id = itertools.count(self._last_id() + 1)
+
+    def _last_id(self):
+        return max((record.get("id", 0) for record in self.records()), default=0)
+
+    def new_id(self):
+        return next(self._next_id)
+
+    def append(self, records):
+        """기록 여러 줄을 한 번에 쓰고 fsync"""
+        if not records:
+            return
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def records(self):
+        """기록 전체 (마지막 줄이 쓰다 만 줄이면 건너뜀)"""
+        records = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return records
+
+    def pending(self, records=None):
+        """완료/실패 기록이 없는 move 기록 (중간에 끊긴 이동)"""
+        moves = {}
+        for record in self.records() if records is None else records:
+            if record.get("op") == "move":
+                moves[record["id"]] = record
+            elif record.get("op") in ("done", "failed"):
+                moves.pop(record.get("id"), None)
+        return list(moves.values())
+
+    def recover(self):
+        """중간에 끊긴 이동을 파일 상태로 판정해 완료/실패 기록을 남김 - 기록 전체를 반환
+
+        - 대상만 있으면 끝난 이동, 원본만 있으면 시작 전에 끊긴 이동
+        - 둘 다 있고 대상이 원본과 같은 파일(하드 링크/복사본)이면 원본 삭제 전에 끊긴 것이므로 원본을 지우고 완료 처리,
+          다른 파일이면 원래 있던 파일이라 이동하지 않은 것이므로 실패 처리
+        """
+        records = self.records()
+        results = []
+        for record in self.pending(records):
+            src_path, dst_path = record["src"], record["dst"]
+            try:
+                os.remove(dst_path + ".moving")
+            except OSError:
+                pass
+            src_exists, dst_exists = os.path.exists(src_path), os.path.exists(dst_path)
+            if dst_exists and src_exists:
+                if not _same_content(src_path, dst_path):
+                    results.append({"op": "failed", "id": record["id"], "error": "destination exists"})
+                    continue
+                try:
+                    os.remove(src_path)
+                except OSError as e:
+                    results.append({"op": "failed", "id": record["id"], "error": f"recover: {e}"})
+                    continue
+            if dst_exists:
+                results.append({"op": "done", "id": record["id"], "recovered": True})
+            else:
+                results.append({"op": "failed", "id": record["id"], "error": "interrupted"})
+        if results:
+            self.append(results)
+            records += results
+        return records
+
+    def compact(self, history):
+        """기록을 현재 되돌리기/다시 하기 상태만 남기도록 다시 씀 (임시 파일에 쓴 뒤 교체, 묶음 번호는 새로 매김)"""
+        next_id = itertools.count(1)
+        records = []
+        for group in history.undo_stack:
+            group.group, group.kind, group.of = next(next_id), "cut", None
+            records += group.to_records(next_id)
+        for group in history.redo_stack:
+            group.group, group.kind, group.of = next(next_id), "undone", None
+            records += group.to_records(next_id)
+        temp_path = self.journal_path + ".tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                file.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.journal_path)
+            _fsync_directory(os.path.dirname(self.journal_path))
+            self._next_id = next_id
+
+
+class MoveGroup:
+    """함께 이동한 파일 묶음 하나의 기록 (잘라내기 / 되돌리기 / 다시 하기)"""
+
+    def __init__(self, group, kind, session, image_path, moves, of=None):
+        self.group = group
+        self.kind = kind  # "cut" | "undo" | "redo" | "undone" (압축한 기록의 되돌린 상태)
+        self.session = session
+        self.image_path = image_path  # 잘라내기 전 이미지 경로
+        self.moves = list(moves)  # 실제로 옮긴 [(원본 경로, 대상 경로)]
+        self.of = of  # 되돌리기/다시 하기 대상 묶음
+
+    def to_records(self, next_id):
+        """압축할 때 다시 쓰는 기록 줄 (move + done)"""
+        records = []
+        for src_path, dst_path in self.moves:
+            record_id = next(next_id)
+            records.append({"op": "move", "id": record_id, "group": self.group, "kind": self.kind,
+                            "of": self.of, "session": self.session, "image": self.image_path,
+                            "src": src_path, "dst": dst_path})
+            records.append({"op": "done", "id": record_id})
+        return records
+
+
+class MoveHistory:
+    """이동 기록에서 복원한 되돌리기/다시 하기 스택
+
+    - undo_stack: 현재 잘라낸 상태인 묶음 (마지막이 가장 최근)
+    - redo_stack: 되돌린 묶음 (마지막이 가장 최근에 되돌린 것)
+    """
+
+    def __init__(self):
+        self.undo_stack = []
+        self.redo_stack = []
+
+    @classmethod
+    def replay(cls, records):
+        """기록을 처음부터 한 번 훑어 스택 복원 (기록 수에 비례)"""
+        groups = {}
+        group_of_id = {}
+        moved = {}
+        for record in records:
+            op = record.get("op")
+            if op == "move":
+                group = record["group"]
+                if group not in groups:
+                    groups[group] = MoveGroup(group, record.get("kind", "cut"), record.get("session"),
+                                              record.get("image", record["src"]), [], of=record.get("of"))
+                group_of_id[record["id"]] = group
+                moved[record["id"]] = (record["src"], record["dst"])
+            elif op == "done" and record.get("id") in group_of_id:
+                groups[group_of_id[record["id"]]].moves.append(moved[record["id"]])
+        history = cls()
+        for group_id in sorted(groups):
+            group = groups[group_id]
+            if group.moves:
+                history.apply(group)
+        return history
+
+    def apply(self, group):
+        """끝난 이동 묶음 하나를 스택에 반영"""
+        if group.kind == "cut":
+            self.undo_stack.append(group)
+            self.redo_stack.clear()
+        elif group.kind == "undo":
+            target = self._pop(self.undo_stack, group.of)
+            if target is not None:
+                self.redo_stack.append(target)
+        elif group.kind == "redo":
+            target = self._pop(self.redo_stack, group.of)
+            if target is not None:
+                self.undo_stack.append(group)
+        elif group.kind == "undone":
+            self.redo_stack.append(group)
+
+    @staticmethod
+    def _pop(stack, group_id):
+        for position in range(len(stack) - 1, -1, -1):
+            if stack[position].group == group_id:
+                return stack.pop(position)
+        return None
+
+    def session_groups(self, session):
+        """이번 세션에 잘라낸 상태로 남아 있는 묶음 (최근 것부터)"""
+        return [group for group in reversed(self.undo_stack) if group.session == session]
+
+
+class MoveRequest:
+    """함께 이동할 파일 묶음 하나 (이미지와 라벨) - 없는 파일은 optional이면 건너뜀"""
+
+    def __init__(self, image_path, moves, optional=(), journal=None, kind="cut", of=None, session=None):
+        self.image_path = image_path
+        self.journal = journal  # 이동을 기록할 MoveJournal (None이면 기록하지 않음)
+        self.kind = kind  # "cut" | "undo" | "redo"
+        self.of = of  # 되돌리기/다시 하기 대상 묶음 번호
+        self.session = session
+        self.group = None  # 작업 스레드에서 기록할 때 정해지는 묶음 번호
+        self.moves = list(moves)  # [(원본 경로, 대상 경로)]
+        self.optional = set(optional)  # 없어도 오류가 아닌 원본 경로 (라벨 등)
+        self.queued_time = time.perf_counter()
+        self.error = None
+        self.moved = []  # 실제로 옮긴 [(원본 경로, 대상 경로)]
+
+    def to_group(self):
+        """끝난 요청을 되돌리기 기록 묶음으로"""
+        return MoveGroup(self.group, self.kind, self.session, self.image_path, self.moved, of=self.of)
+
+
+class FileMover(QObject):
+    """파일 이동을 작업 스레드 하나에서 묶어 처리하고 이동 기록에 남김
+
+    - enqueue()는 바로 반환하고, 큐에 쌓인 요청은 한 번에 꺼내 기록 -> 이동 -> 완료 기록 순으로 처리
+    - 요청 안의 앞 파일(이미지) 이동이 실패하면 나머지는 옮기지 않고 request.error에 남김
+    - 한 묶음의 요청들은 서로 다른 파일이면 동시에 옮긴다 (세션 전체 되돌리기 등)
+    """
+    # 처리가 끝난 요청 목록 (MoveRequest, 작업 스레드에서 emit)
+    moves_finished = Signal(list)
+
+    def __init__(self, max_batch=256, max_parallel=8, parent=None):
+        super().__init__(parent)
+        self.max_batch = max_batch
+        self.max_parallel = max_parallel  # 한 묶음 안에서 동시에 옮기는 요청 수 (NAS 지연을 겹쳐 숨김)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mover")
+        self._io_pool = None
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._draining = False
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=200)  # 요청 -> 이동 완료까지 걸린 시간 (초)
+
+    def enqueue(self, request):
+        """이동 요청 추가 (GUI 스레드에서 바로 반환)"""
+        with self._lock:
+            self._queue.append(request)
+            if self._draining:
+                return
+            self._draining = True
+        self._executor.submit(self._drain)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._queue)
+
+    def wait(self):
+        """대기 중인 이동을 모두 처리할 때까지 대기 (종료 시)"""
+        while True:
+            with self._lock:
+                if not self._queue and not self._draining:
+                    return
+            time.sleep(0.01)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._draining = False
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+            try:
+                self._process(batch)
+            except Exception as e:
+                # 기록 파일을 쓸 수 없는 경우 등 - 묶음 전체를 실패로 처리
+                for request in batch:
+                    if request.error is None and not request.moved:
+                        request.error = str(e)
+            for request in batch:
+                if request.error is None:
+                    self.completed += 1
+                    self.latencies.append(time.perf_counter() - request.queued_time)
+                else:
+                    self.failed += 1
+                    print(f"파일 이동 실패: {request.image_path} ({request.error})")
+            self.batches += 1
+            self.moves_finished.emit(batch)
+
+    def _process(self, batch):
+        planned = {}  # 요청 -> [(기록 번호, move 기록)]
+        for request in batch:
+            journal = request.journal
+            request.group = journal.new_id() if journal is not None else 0
+            planned[request] = []
+            for src_path, dst_path in request.moves:
+                if src_path in request.optional and not os.path.exists(src_path):
+                    continue
+                record_id = journal.new_id() if journal is not None else 0
+                planned[request].append((record_id, {
+                    "op": "move", "id": record_id, "group": request.group, "kind": request.kind,
+                    "of": request.of, "session": request.session, "image": request.image_path,
+                    "src": src_path, "dst": dst_path, "time": time.time()}))
+        self._append_records((request.journal, record) for request, records in planned.items()
+                             for _, record in records)
+
+        # 묶음 안에서 같은 파일을 두 번 옮기지 않으면 (잘라낸 뒤 바로 되돌리기 등) 요청끼리 동시에 옮김
+        paths = [path for request in batch for move in request.moves for path in move]
+        if len(batch) > 1 and len(paths) == len(set(paths)):
+            results = list(self._io_executor().map(self._move_request, planned.items()))
+        else:
+            results = [self._move_request(item) for item in planned.items()]
+        self._append_records(record for request_results in results for record in request_results)
+
+    def _io_executor(self):
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="mover-io")
+        return self._io_pool
+
+    @staticmethod
+    def _move_request(item):
+        """요청 하나의 파일을 순서대로 이동 - [(기록, 완료/실패 기록)] 반환"""
+        request, records = item
+        results = []
+        for record_id, record in records:
+            if request.error is not None:
+                # 같은 요청의 앞 파일이 실패하면 나머지는 옮기지 않음
+                results.append((request.journal, {"op": "failed", "id": record_id, "error": "skipped"}))
+                continue
+            try:
+                move_file(record["src"], record["dst"])
+            except OSError as e:
+                request.error = str(e)
+                results.append((request.journal, {"op": "failed", "id": record_id, "error": str(e)}))
+                continue
+            request.moved.append((record["src"], record["dst"]))
+            results.append((request.journal, {"op": "done", "id": record_id}))
+        return results
+
+    @staticmethod
+    def _append_records(journal_records):
+        """(기록, 기록 줄) 목록을 기록 파일별로 한 번씩 씀"""
+        by_journal = {}
+        for journal, record in journal_records:
+            if journal is not None:
+                by_journal.setdefault(journal, []).append(record)
+        for journal, records in by_journal.items():
+            journal.append(records)
+
+    def stats(self):
+        """완료/실패/대기 수와 요청 -> 완료 지연 (ms)"""
+        latencies = sorted(self.latencies)
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": self.pending_count(),
+            "batches": self.batches,
+            "latency_ms_p50": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            "latency_ms_max": latencies[-1] * 1000 if latencies else 0.0,
+        }
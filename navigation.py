@@ -0,0 +1,67 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# 이미지 이동 한 번을 구성하는 단계 (이 순서로 한 번씩 실행)
+NAVIGATION_STAGES = ("resolve", "load_image", "load_labels", "render")
+
+
+class Navigation:
+    """이미지 이동 한 번의 단계별 결과와 소요 시간
+
+    - resolve: 이미지에 대응하는 라벨 경로 결정 (시그널 없는 순수 조회)
+    - load_image: 이미지(축소본/원본/타일) 준비
+    - load_labels: 표시할 라벨 소스의 배열 읽기
+    - render: 씬 오버레이와 줌 박스 갱신
+    """
+
+    def __init__(self, image_path):
+        self.image_path = image_path
+        self.label_path = None
+        self.additional_label_paths = []
+        self.additional_label_paths_2 = []
+        self.labels = None
+        self.additional_labels = None
+        self.additional_labels_2 = None
+        self.timings = {}  # 단계 이름 -> 소요 시간 (초)
+
+    @contextmanager
+    def stage(self, name):
+        """단계 실행 구간 - 같은 단계가 두 번 실행되면 오류"""
+        if name not in NAVIGATION_STAGES:
+            raise ValueError(f"알 수 없는 단계: {name}")
+        if name in self.timings:
+            raise RuntimeError(f"단계가 이미 실행됨: {name}")
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def total_seconds(self):
+        return sum(self.timings.values())
+
+
+class NavigationHistory:
+    """최근 이미지 이동의 단계별 소요 시간 기록"""
+
+    def __init__(self, max_entries=100):
+        self.navigations = deque(maxlen=max_entries)
+
+    def add(self, navigation):
+        self.navigations.append(navigation)
+
+    @property
+    def last(self):
+        return self.navigations[-1] if self.navigations else None
+
+    def stats(self):
+        """마지막 이동과 최근 평균의 단계별 소요 시간 (ms)"""
+        stats = {"navigations": len(self.navigations)}
+        last = self.last
+        for name in NAVIGATION_STAGES:
+            samples = [navigation.timings[name] for navigation in self.navigations if name in navigation.timings]
+            stats[f"{name}_ms"] = last.timings.get(name, 0.0) * 1000 if last else 0.0
+            stats[f"{name}_ms_avg"] = sum(samples) * 1000 / len(samples) if samples else 0.0
+        stats["total_ms"] = last.total_seconds() * 1000 if last else 0.0
+        return stats
@@ -1,8 +1,13 @@
 import os
+import sys
 import shutil
 import re
 import logging
 
+# 상위 폴더의 공유 병렬 폴더 탐색기 사용
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dir_crawler import walk
+
 
 # # 로깅 설정 # 필요시 주석 해제
 # logging.basicConfig(
@@ -82,8 +87,8 @@ def copy_file(src, dst):
         logging.error(f"Error copying file '{src}' to '{dst}': {e}")
 
 
-# os.walk를 사용하여 모든 하위 디렉토리를 순회합니다.
-for root, _, files in os.walk(source_dir):
+# 병렬 탐색기로 모든 하위 디렉토리를 순회합니다.
+for root, files in walk(source_dir, image_extensions):
     for filename in files:
         # 이미지 파일만 처리합니다.
         if filename.lower().endswith(image_extensions):
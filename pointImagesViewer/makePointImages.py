@@ -1,6 +1,11 @@
 import os
+import sys
 import cv2
 
+# 상위 폴더의 공유 병렬 폴더 탐색기 사용
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dir_crawler import walk
+
 def make_point_images(image_folder):
     # 대상 폴더 이름 추출
     folder_name = os.path.basename(image_folder.rstrip(os.sep))
@@ -10,7 +15,7 @@ def make_point_images(image_folder):
     if not os.path.exists(point_images_base_folder):
         os.makedirs(point_images_base_folder)
 
-    for root, _, files in os.walk(image_folder):
+    for root, files in walk(image_folder):
         for filename in files:
             if filename.endswith('.jpg') or filename.endswith('.png'):
                 image_path = os.path.join(root, filename)
@@ -1,7 +1,12 @@
 import os
+import sys
 import cv2
 import traceback
 
+# 상위 폴더의 공유 병렬 폴더 탐색기 사용
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dir_crawler import walk
+
 def make_point_images(base_folder):
     try:
         # 최상위 폴더 이름 추출
@@ -14,8 +19,8 @@ def make_point_images(base_folder):
         if not os.path.exists(point_images_base_folder):
             os.makedirs(point_images_base_folder)
 
-        # os.walk로 하위 폴더들까지 모두 순회
-        for root, _, files in os.walk(base_folder, topdown=True):
+        # 하위 폴더들까지 병렬로 순회 (폴더 순서는 읽기가 끝난 순서)
+        for root, files in walk(base_folder):
             # root 경로에서 base_folder와의 상대 경로 계산
             relative_path = os.path.relpath(root, base_folder)
 
@@ -6,9 +6,14 @@ from PySide6.QtWidgets import (
     QSizePolicy, QFileDialog, QSplitter, QTableWidget, QTableWidgetItem,
     QAbstractScrollArea, QAbstractItemView, QScrollArea, QGridLayout
 )
-from PySide6.QtGui import QPixmap, QIcon
+from PySide6.QtGui import QPixmap, QIcon, QImageReader
 from PySide6.QtCore import Qt
 
+# 상위 폴더의 공유 썸네일 캐시와 병렬 폴더 탐색기 사용
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dir_crawler import walk
+from thumbnail_cache import default_thumbnail_cache
+
 
 class ImageViewer(QWidget):
     def __init__(self):
@@ -142,6 +147,20 @@ class ImageViewer(QWidget):
             if child.widget():
                 child.widget().deleteLater()
 
+    def prepare_thumbnails(self, image_paths, size):
+        """썸네일을 디스크 캐시에서 병렬로 준비 - {경로: QImage} (size가 0이면 원본을 쓰므로 빈 dict)"""
+        if size <= 0:
+            return {}
+        return default_thumbnail_cache().get_thumbnails(image_paths, size)
+
+    def load_thumbnail(self, img_path, size, thumbnails=None):
+        """디스크 썸네일 캐시에서 축소 이미지 로드 (size가 0이면 원본)"""
+        if size <= 0:
+            return QPixmap(img_path)
+        if thumbnails and img_path in thumbnails:
+            return QPixmap.fromImage(thumbnails[img_path])
+        return QPixmap.fromImage(default_thumbnail_cache().get_thumbnail(img_path, size))
+
     def load_folders(self):
         self.folder_list.clear()
         self.folders_info = []
@@ -157,10 +176,9 @@ class ImageViewer(QWidget):
             folder_path = os.path.join(self.root_folder, folder_name)
             if os.path.isdir(folder_path):
                 images = []
-                # os.walk를 사용하여 하위 폴더까지 모든 파일 탐색
-                for root, dirs, files in os.walk(folder_path):
-                    images.extend(
-                        [os.path.join(root, f) for f in sorted(files) if f.lower().endswith(image_extensions)])
+                # 병렬 탐색기로 하위 폴더까지 모든 파일 탐색 (폴더 순서가 일정하도록 정렬)
+                for root, files in sorted(walk(folder_path, image_extensions)):
+                    images.extend([os.path.join(root, f) for f in sorted(files)])
 
                 image_count = len(images)
                 preview_image = images[0] if image_count > 0 else None
@@ -178,10 +196,7 @@ class ImageViewer(QWidget):
                 item = QListWidgetItem(item_text)
                 item.setData(Qt.UserRole, folder_info)
                 if preview_image:
-                    img_path = preview_image
-                    pixmap = QPixmap(img_path)
-                    if pixmap.width() > 50 or pixmap.height() > 50:
-                        pixmap = pixmap.scaled(50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    pixmap = self.load_thumbnail(preview_image, 50)
                     if not pixmap.isNull():  # 이미지가 제대로 로드되었는지 확인
                         item.setIcon(QIcon(pixmap))
                 self.folder_list.addItem(item)
@@ -215,6 +230,11 @@ class ImageViewer(QWidget):
         self.table_widget.setHorizontalHeaderLabels(headers)
         self.table_widget.verticalHeader().setVisible(False)
 
+        # 모든 폴더의 썸네일을 병렬로 미리 준비
+        thumbnails = self.prepare_thumbnails(
+            [os.path.join(folder_info['path'], image) for folder_info in self.folders_info
+             for image in folder_info['images']], self.image_size)
+
         for row_idx, folder_info in enumerate(self.folders_info):
             # 인덱스 번호
             index_item = QTableWidgetItem(str(row_idx + 1))
@@ -228,9 +248,10 @@ class ImageViewer(QWidget):
             # 첫 번째 이미지의 크기 (픽셀)
             if folder_info['images']:
                 first_image_path = os.path.join(folder_info['path'], folder_info['images'][0])
-                pixmap = QPixmap(first_image_path)
-                width = pixmap.width()
-                height = pixmap.height()
+                # 크기는 헤더만 읽어서 확인
+                image_size = QImageReader(first_image_path).size()
+                width = image_size.width()
+                height = image_size.height()
                 size_str = f"{width} x {height} px"
             else:
                 size_str = "N/A"
@@ -244,9 +265,7 @@ class ImageViewer(QWidget):
             # 이미지 추가
             for col_idx, img_name in enumerate(folder_info['images']):
                 img_path = os.path.join(folder_info['path'], img_name)
-                pixmap = QPixmap(img_path)
-                if self.image_size > 0:
-                    pixmap = pixmap.scaled(self.image_size, self.image_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap = self.load_thumbnail(img_path, self.image_size, thumbnails)
                 label = QLabel()
                 label.setPixmap(pixmap)
                 label.setAlignment(Qt.AlignCenter)
@@ -275,14 +294,14 @@ class ImageViewer(QWidget):
 
         images = folder_info['images']
         if images:
+            thumbnails = self.prepare_thumbnails(
+                [os.path.join(folder_info['path'], image) for image in images], self.image_size)
             col_count = self.calculate_columns()
             row = 1
             col = 0
             for img_name in images:
                 img_path = os.path.join(folder_info['path'], img_name)
-                pixmap = QPixmap(img_path)
-                if self.image_size > 0:
-                    pixmap = pixmap.scaled(self.image_size, self.image_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                pixmap = self.load_thumbnail(img_path, self.image_size, thumbnails)
                 label = QLabel()
                 label.setPixmap(pixmap)
                 label.setAlignment(Qt.AlignCenter)
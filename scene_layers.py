@@ -0,0 +1,122 @@
+import numpy as np
+from PySide6.QtWidgets import QGraphicsItem, QGraphicsPixmapItem
+from PySide6.QtCore import Qt, QRectF
+
+
+class LabelOverlayItem(QGraphicsItem):
+    """한 라벨 소스의 모든 박스를 NumPy 배열로 보관하고 paint() 한 번에 그리는 아이템
+
+    - 노출 영역(exposedRect) 밖의 박스는 벡터 연산으로 걸러낸 뒤 그린다.
+    - 표시/숨김은 setVisible 한 번 (박스 수와 무관).
+    - 그리기용 QRectF 목록은 박스를 바꿀 때가 아니라 처음 그릴 때 한 번 만들어 재사용한다
+      (숨긴 오버레이는 이미지를 넘겨도 QRectF를 만들지 않음).
+    """
+
+    def __init__(self, pen, z_value=0, padding=0.0):
+        super().__init__()
+        self.pen = pen
+        self.padding = padding  # 박스 폭/높이에 더할 픽셀 (추가 라벨 1은 2px)
+        self.boxes = np.empty((0, 4), dtype=np.float64)  # 픽셀 좌표 (x, y, w, h)
+        self.loaded_path = None  # 박스를 불러온 이미지 경로
+        self._rects = None  # 그릴 때 만드는 QRectF 목록 (박스가 바뀌면 None)
+        self.allocations = 0  # 지금까지 만든 QRectF 수
+        self._bounding_rect = QRectF()
+        self.setZValue(z_value)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def append_boxes(self, labels, image_rect):
+        """YOLO 정규화 라벨 배열 (N, 5) [class, xc, yc, w, h]를 픽셀 박스로 변환해 추가"""
+        labels = np.asarray(labels, dtype=np.float64).reshape(-1, 5)
+        if len(labels) == 0:
+            return
+        width, height = image_rect.width(), image_rect.height()
+        boxes = np.empty((len(labels), 4), dtype=np.float64)
+        boxes[:, 0] = (labels[:, 1] - labels[:, 3] / 2) * width
+        boxes[:, 1] = (labels[:, 2] - labels[:, 4] / 2) * height
+        boxes[:, 2] = labels[:, 3] * width + self.padding
+        boxes[:, 3] = labels[:, 4] * height + self.padding
+        self.set_pixel_boxes(np.vstack([self.boxes, boxes]))
+
+    def set_pixel_boxes(self, boxes):
+        """픽셀 박스 배열 (N, 4) 교체"""
+        self.prepareGeometryChange()
+        self.boxes = boxes
+        self._rects = None
+        if len(boxes):
+            margin = self.pen.widthF()
+            left, top = boxes[:, 0].min(), boxes[:, 1].min()
+            right, bottom = (boxes[:, 0] + boxes[:, 2]).max(), (boxes[:, 1] + boxes[:, 3]).max()
+            self._bounding_rect = QRectF(left, top, right - left, bottom - top).adjusted(-margin, -margin,
+                                                                                       margin, margin)
+        else:
+            self._bounding_rect = QRectF()
+        self.update()
+
+    def reset(self):
+        """박스를 모두 비우고 불러온 이미지 정보 초기화"""
+        self.loaded_path = None
+        self.set_pixel_boxes(np.empty((0, 4), dtype=np.float64))
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def boundingRect(self):
+        return self._bounding_rect
+
+    def _paint_rects(self):
+        if self._rects is None:
+            self._rects = [QRectF(*box) for box in self.boxes.tolist()]
+            self.allocations += len(self._rects)
+        return self._rects
+
+    def paint(self, painter, option, widget=None):
+        if len(self.boxes) == 0:
+            return
+        exposed = option.exposedRect
+        boxes = self.boxes
+        visible = np.flatnonzero((boxes[:, 0] <= exposed.right()) &
+                                 (boxes[:, 0] + boxes[:, 2] >= exposed.left()) &
+                                 (boxes[:, 1] <= exposed.bottom()) &
+                                 (boxes[:, 1] + boxes[:, 3] >= exposed.top()))
+        if len(visible) == 0:
+            return
+        painter.setPen(self.pen)
+        painter.setBrush(Qt.NoBrush)
+        rects = self._paint_rects()
+        if len(visible) == len(rects):
+            painter.drawRects(rects)
+        else:
+            painter.drawRects([rects[index] for index in visible])
+
+
+class SceneLayers:
+    """씬의 영구 레이어 - 재사용하는 이미지 아이템 하나와 라벨 소스별 일괄 오버레이 아이템"""
+
+    def __init__(self, scene, label_pen, additional_label_pen, additional_label_pen_2):
+        self.scene = scene
+        self.pixmap_item = QGraphicsPixmapItem()
+        self.pixmap_item.setZValue(-1)  # 라벨/오버레이보다 항상 뒤
+        self.scene.addItem(self.pixmap_item)
+        self.label_overlay = LabelOverlayItem(label_pen, 0)
+        self.additional_label_overlay = LabelOverlayItem(additional_label_pen, 1, padding=2)
+        self.additional_label_overlay_2 = LabelOverlayItem(additional_label_pen_2, 2)
+        for overlay in self.overlays():
+            self.scene.addItem(overlay)
+        # 이후로는 아이템을 새로 만들지 않으므로 생성 수는 고정 (이미지 아이템 + 오버레이 3개)
+        self.item_allocations = 1 + len(self.overlays())
+
+    def overlays(self):
+        return [self.label_overlay, self.additional_label_overlay, self.additional_label_overlay_2]
+
+    def stats(self):
+        """씬 아이템 수, 아이템/라벨 사각형 생성 수, 오버레이별 박스 수"""
+        items = self.scene.items()
+        return {
+            "scene_items": len(items),
+            "visible_items": sum(1 for item in items if item.isVisible()),
+            "item_allocations": self.item_allocations,
+            "label_allocations": sum(overlay.allocations for overlay in self.overlays()),
+            "label_boxes": len(self.label_overlay),
+            "additional_label_boxes": len(self.additional_label_overlay),
+            "additional_label_boxes_2": len(self.additional_label_overlay_2),
+        }
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 테스트에서 최상위 모듈(dataset_catalog 등)을 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,73 @@
+import os
+
+from dataset_catalog import DatasetCatalog
+from dataset_index import DatasetIndex
+
+
+def _touch(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(text)
+
+
+def _make_dataset(root):
+    _touch(os.path.join(root, "a.jpg"))
+    _touch(os.path.join(root, "a.txt"), "0 0.5 0.5 0.1 0.1\n")
+    _touch(os.path.join(root, "sub", "x.jpg"))
+
+
+def _cancel_after(calls):
+    """calls번째 확인부터 취소를 알리는 is_cancelled"""
+    state = {"calls": 0}
+
+    def is_cancelled():
+        state["calls"] += 1
+        return state["calls"] > calls
+    return is_cancelled
+
+
+def test_scan_orders_like_dataset_index(tmp_path):
+    root = str(tmp_path / "ds")
+    _make_dataset(root)
+    catalog = DatasetCatalog(root, catalog_path=str(tmp_path / "catalog.sqlite3"))
+
+    result = catalog.scan()
+
+    assert result.added == 2
+    assert catalog.image_paths() == DatasetIndex(root).paths()
+
+
+def test_cancelled_scan_is_rolled_back_and_rescanned(tmp_path):
+    root = str(tmp_path / "ds")
+    _make_dataset(root)
+    catalog = DatasetCatalog(root, catalog_path=str(tmp_path / "catalog.sqlite3"))
+    catalog.scan()
+
+    # 루트에 새 이미지를 추가하고 루트 폴더만 다시 읽은 직후 취소
+    _touch(os.path.join(root, "0new.jpg"))
+    cancelled = catalog.scan(_cancel_after(1))
+    assert cancelled.cancelled
+    assert catalog.get_record(os.path.join(root, "0new.jpg")) is None
+
+    result = catalog.scan()
+
+    assert result.added == 1
+    assert catalog.image_paths() == DatasetIndex(root).paths()
+    index = DatasetIndex(root, paths=catalog.image_paths())
+    assert index.paths_in_directory(index.root_path) == [f"{index.root_path}/0new.jpg", f"{index.root_path}/a.jpg"]
+
+
+def test_label_rewritten_in_place_is_rescanned(tmp_path):
+    root = str(tmp_path / "ds")
+    _make_dataset(root)
+    catalog = DatasetCatalog(root, catalog_path=str(tmp_path / "catalog.sqlite3"))
+    catalog.scan()
+
+    dir_stat = os.stat(root)
+    _touch(os.path.join(root, "a.txt"), "3 0.5 0.5 0.1 0.1\n3 0.2 0.2 0.1 0.1\n")
+    os.utime(root, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    result = catalog.scan()
+
+    assert result.updated == 1
+    assert catalog.get_record(os.path.join(root, "a.jpg"))["class_histogram"] == {3: 2}
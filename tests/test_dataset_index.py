@@ -0,0 +1,31 @@
+import os
+
+from dataset_index import DatasetIndex
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+def test_scan_orders_folders_first_with_natural_sort(tmp_path):
+    root = tmp_path / "ds"
+    for name in ("img10.jpg", "img2.jpg", "b/x.png", "a10/y.jpg", "a2/z.jpeg", ".hidden/h.jpg", "a2/notes.txt"):
+        _touch(str(root / name))
+
+    index = DatasetIndex(str(root))
+
+    relative = [path[len(index.root_path) + 1:] for path in index.paths()]
+    assert relative == ["a2/z.jpeg", "a10/y.jpg", "b/x.png", "img2.jpg", "img10.jpg"]
+
+
+def test_directory_symlink_loop_is_not_followed(tmp_path):
+    root = tmp_path / "ds"
+    _touch(str(root / "a" / "img.jpg"))
+    os.symlink("..", str(root / "a" / "loop"))
+
+    index = DatasetIndex(str(root))
+
+    assert index.paths() == [f"{index.root_path}/a/img.jpg"]
+    sub_dirs, _ = DatasetIndex.list_directory(f"{index.root_path}/a")
+    assert sub_dirs == []
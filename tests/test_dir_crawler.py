@@ -0,0 +1,32 @@
+import os
+
+from dir_crawler import crawl_paths, walk
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').close()
+
+
+def test_walk_lists_every_folder_once(tmp_path):
+    for name in ("a.jpg", "sub/b.jpg", "sub/deep/c.txt"):
+        _touch(str(tmp_path / name))
+
+    folders = dict(walk(str(tmp_path), '.jpg'))
+
+    assert sorted(os.path.relpath(path, tmp_path) for path in folders) == [".", "sub", os.path.join("sub", "deep")]
+    assert folders[os.path.join(str(tmp_path), "sub")] == ["b.jpg"]
+
+
+def test_walk_following_symlinks_stops_at_loops(tmp_path):
+    _touch(str(tmp_path / "a" / "img.jpg"))
+    os.symlink("..", str(tmp_path / "a" / "loop"))
+    os.symlink(str(tmp_path / "a"), str(tmp_path / "alias"))
+
+    folders = list(walk(str(tmp_path), '.jpg', follow_symlinks=True))
+    paths = list(crawl_paths(str(tmp_path), '.jpg'))
+
+    # 루트와 a(또는 같은 폴더인 alias) 한 번씩만
+    assert len(folders) == 2
+    assert sum(len(names) for _, names in folders) == 1
+    assert paths == [str(tmp_path / "a" / "img.jpg")]
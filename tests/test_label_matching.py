@@ -0,0 +1,36 @@
+import numpy as np
+
+from label_matching import MatchReport, greedy_match, match_labels
+
+
+def _labels(*rows):
+    return np.array(rows, dtype=np.float32).reshape(-1, 5)
+
+
+def test_greedy_match_prefers_higher_iou_one_to_one():
+    iou = np.array([[0.9, 0.6], [0.7, 0.0]])
+
+    rows, cols = greedy_match(iou, 0.5)
+
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 0)]
+
+
+def test_zero_threshold_never_matches_disjoint_or_other_class_boxes():
+    main = _labels([1, 0.1, 0.1, 0.1, 0.1], [2, 0.5, 0.5, 0.2, 0.2])
+    additional = _labels([1, 0.9, 0.9, 0.1, 0.1], [3, 0.5, 0.5, 0.2, 0.2])
+
+    rows, cols = match_labels(main, additional, threshold=0.0)
+
+    assert len(rows) == 0 and len(cols) == 0
+    result = MatchReport(0.0).add("image.jpg", main, additional, rows, cols)
+    assert (result.matched, result.missed, result.extra) == (0, 2, 2)
+    assert not result.is_exact()
+
+
+def test_same_class_overlapping_boxes_match():
+    main = _labels([1, 0.5, 0.5, 0.2, 0.2])
+    additional = _labels([1, 0.52, 0.5, 0.2, 0.2])
+
+    rows, cols = match_labels(main, additional, threshold=0.5)
+
+    assert (rows.tolist(), cols.tolist()) == ([0], [0])
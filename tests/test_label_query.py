@@ -0,0 +1,45 @@
+from label_query import LabelQuery, LabelSummary
+
+
+def _summary(tmp_path):
+    paths = []
+    for name, text in (("a", "0 0.5 0.5 0.5 1.0\n"), ("b", "0 0.5 0.5 0.25 1.0\n"), ("c", "1 0.5 0.5 1.0 1.0\n")):
+        (tmp_path / f"{name}.txt").write_text(text)
+        (tmp_path / f"{name}.jpg").write_bytes(b"")
+        paths.append(str(tmp_path / f"{name}.jpg"))
+    return LabelSummary.build(paths), paths
+
+
+def test_save_and_load_round_trip(tmp_path):
+    summary, paths = _summary(tmp_path)
+    # 라벨 없는 이미지 (한글/공백 경로)
+    summary.refresh([str(tmp_path / "경로 with spaces.jpg")])
+
+    summary.save(str(tmp_path / "summary.npz"))
+    loaded = LabelSummary.load(str(tmp_path / "summary.npz"))
+
+    assert loaded.image_paths == summary.image_paths
+    assert loaded.box_count.tolist() == [1, 1, 1, 0]
+
+
+def test_strict_comparisons(tmp_path):
+    summary, paths = _summary(tmp_path)
+
+    assert LabelQuery.parse("aspect>0.5").select(summary) == [paths[2]]
+    assert LabelQuery.parse("aspect>=0.5").select(summary) == [paths[0], paths[2]]
+    assert LabelQuery.parse("aspect<0.5").select(summary) == [paths[1]]
+    assert LabelQuery.parse("area<=0.25 class=0").select(summary) == [paths[1]]
+    assert LabelQuery.parse("area<0.25").select(summary) == []
+
+
+def test_refresh_appends_new_images_without_touching_snapshots(tmp_path):
+    summary, paths = _summary(tmp_path)
+    snapshot = summary.snapshot()
+    (tmp_path / "d.txt").write_text("3 0.5 0.5 0.1 0.1\n")
+    (tmp_path / "d.jpg").write_bytes(b"")
+
+    summary.refresh([str(tmp_path / "d.jpg")])
+
+    assert LabelQuery.parse("class=3").select(summary) == [str(tmp_path / "d.jpg")]
+    assert len(snapshot) == 3
+    assert LabelQuery.parse("class=3").select(snapshot) == []
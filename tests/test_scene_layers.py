@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QRectF, Qt  # noqa: E402
+from PySide6.QtGui import QImage, QPainter, QPen  # noqa: E402
+from PySide6.QtWidgets import QApplication, QGraphicsScene  # noqa: E402
+
+from scene_layers import SceneLayers  # noqa: E402
+
+_app = QApplication.instance() or QApplication([])
+
+
+def _render(scene):
+    image = QImage(200, 100, QImage.Format_ARGB32)
+    painter = QPainter(image)
+    scene.render(painter, QRectF(0, 0, 200, 100), QRectF(0, 0, 200, 100))
+    painter.end()
+
+
+def _layers():
+    scene = QGraphicsScene()
+    scene.setSceneRect(0, 0, 200, 100)
+    pen = QPen(Qt.red)
+    return scene, SceneLayers(scene, pen, pen, pen)
+
+
+def test_rects_are_built_only_when_painted():
+    scene, layers = _layers()
+    labels = np.array([[0, 0.25, 0.5, 0.1, 0.2], [1, 0.75, 0.5, 0.1, 0.2]])
+
+    for _ in range(3):
+        layers.label_overlay.reset()
+        layers.label_overlay.append_boxes(labels, QRectF(0, 0, 200, 100))
+    assert layers.stats()["label_allocations"] == 0
+
+    _render(scene)
+    _render(scene)
+
+    stats = layers.stats()
+    assert stats["label_allocations"] == 2
+    assert stats["item_allocations"] == 4
+    assert stats["label_boxes"] == 2
@@ -0,0 +1,33 @@
+from PySide6.QtGui import QColor, QImage
+
+from thumbnail_cache import ThumbnailCache
+
+
+def _image(tmp_path, width, height):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(20, 120, 220))
+    path = str(tmp_path / f"image_{width}x{height}.png")
+    assert image.save(path)
+    return path
+
+
+def test_thumbnail_uses_bucket_and_cache(tmp_path):
+    cache = ThumbnailCache(cache_dir=str(tmp_path / "cache"), max_workers=1)
+    path = _image(tmp_path, 800, 400)
+
+    first = cache.get_thumbnail(path, 100)
+    second = cache.get_thumbnail(path, 100)
+
+    assert (first.width(), first.height()) == (100, 50)
+    assert (second.width(), second.height()) == (100, 50)
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_large_requests_are_not_capped_at_the_top_bucket(tmp_path):
+    cache = ThumbnailCache(cache_dir=str(tmp_path / "cache"), max_workers=1)
+    path = _image(tmp_path, 3000, 1500)
+
+    assert cache.get_thumbnail(path, 800).width() == 800
+    assert cache.get_thumbnail(path, 2000).width() == 2000
+    # 원본보다 큰 요청은 원본 크기
+    assert cache.get_thumbnail(path, 4000).width() == 3000
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtGui import QImage, QImageReader
+from PySide6.QtCore import Qt, QSize
+
+# 썸네일을 만들어 두는 크기 단계 (요청 크기보다 크거나 같은 가장 작은 단계를 사용)
+# 가장 큰 단계보다 큰 요청은 캐시하지 않고 그 크기로 바로 축소 디코딩
+SIZE_BUCKETS = (64, 128, 256, 512, 1024)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ImageReviewTool", "thumbnails")
+
+
+class ThumbnailCache:
+    """모든 뷰어가 공유하는 디스크 썸네일 캐시
+
+    - 키: (절대 경로, 크기 단계, 수정 시각, 파일 크기)의 해시 -> 원본이 바뀌면 자동으로 새 키
+    - 생성: 워커 풀에서 QImageReader 축소 디코딩 (JPEG은 DCT 단계 축소)
+    - 제거: 전체 용량이 max_bytes를 넘으면 오래 쓰지 않은 파일부터 삭제
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=2 * 1024 * 1024 * 1024, max_workers=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 2),
+                                            thread_name_prefix="thumbnail")
+        self._lock = threading.Lock()
+        self._written_bytes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def bucket_for(size):
+        """요청 크기를 담을 수 있는 가장 작은 크기 단계 - 가장 큰 단계보다 크면 None"""
+        for bucket in SIZE_BUCKETS:
+            if size <= bucket:
+                return bucket
+        return None
+
+    def cache_path(self, image_path, bucket):
+        """원본 경로/크기 단계/수정 시각으로 만든 캐시 파일 경로 - 원본이 없으면 None"""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(image_path)}|{bucket}|{stat.st_mtime_ns}|{stat.st_size}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".png")
+
+    def get_thumbnail(self, image_path, size):
+        """size 이내로 축소한 썸네일 QImage 반환 (캐시에 없으면 생성) - 실패하면 null QImage"""
+        bucket = self.bucket_for(size)
+        if bucket is None:
+            return self._decode(image_path, size)
+        thumbnail = self._load_or_create(image_path, bucket)
+        if thumbnail.isNull() or (thumbnail.width() <= size and thumbnail.height() <= size):
+            return thumbnail
+        return thumbnail.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def get_thumbnails(self, image_paths, size):
+        """여러 썸네일을 워커 풀에서 동시에 준비 - {경로: QImage}"""
+        thumbnails = self._executor.map(lambda path: self.get_thumbnail(path, size), image_paths)
+        return dict(zip(image_paths, thumbnails))
+
+    def _load_or_create(self, image_path, bucket):
+        cache_path = self.cache_path(image_path, bucket)
+        if cache_path is None:
+            return QImage()
+
+        if os.path.exists(cache_path):
+            thumbnail = QImage(cache_path)
+            if not thumbnail.isNull():
+                self.hits += 1
+                try:
+                    os.utime(cache_path)  # 최근 사용 시각 갱신 (제거 순서 기준)
+                except OSError:
+                    pass
+                return thumbnail
+
+        self.misses += 1
+        thumbnail = self._decode(image_path, bucket)
+        if thumbnail.isNull():
+            return thumbnail
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        if thumbnail.save(temp_path, "PNG"):
+            os.replace(temp_path, cache_path)
+            self._note_written(os.path.getsize(cache_path))
+        return thumbnail
+
+    @staticmethod
+    def _decode(image_path, size):
+        """size 이내로 축소 디코딩 (원본이 더 작으면 원본 크기)"""
+        reader = QImageReader(image_path)
+        image_size = reader.size()
+        if image_size.isValid() and (image_size.width() > size or image_size.height() > size):
+            reader.setScaledSize(image_size.scaled(QSize(size, size), Qt.KeepAspectRatio))
+        return reader.read()
+
+    def _note_written(self, size):
+        """새로 쓴 용량이 최대 용량의 1/10을 넘을 때마다 제거 검사"""
+        with self._lock:
+            self._written_bytes += size
+            if self._written_bytes < self.max_bytes // 10:
+                return
+            self._written_bytes = 0
+        self._executor.submit(self.evict)
+
+    def total_bytes(self):
+        return sum(size for _, _, size in self._cache_files())
+
+    def evict(self):
+        """전체 용량이 max_bytes 이하가 될 때까지 오래 쓰지 않은 썸네일부터 삭제"""
+        files = self._cache_files()
+        total = sum(size for _, _, size in files)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for path, _, size in sorted(files, key=lambda entry: entry[1]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def _cache_files(self):
+        """(경로, 최근 사용 시각, 크기) 목록"""
+        files = []
+        for bucket_dir in os.scandir(self.cache_dir):
+            if not bucket_dir.is_dir():
+                continue
+            for entry in os.scandir(bucket_dir.path):
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+
+_default_cache = None
+
+
+def default_thumbnail_cache():
+    """프로세스 전체에서 공유하는 썸네일 캐시"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ThumbnailCache()
+    return _default_cache
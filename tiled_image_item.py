@@ -0,0 +1,248 @@
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtWidgets import QGraphicsObject, QGraphicsItem, QStyleOptionGraphicsItem
+from PySide6.QtGui import QImage, QImageIOHandler, QImageReader, QPainter
+from PySide6.QtCore import Qt, QRect, QRectF, QSize, Signal
+
+# 이 픽셀 수를 넘는 이미지는 한 장의 QPixmap 대신 타일로 표시
+TILE_PIXEL_THRESHOLD = 64 * 1024 * 1024
+# QPixmap 한 변 최대 크기 (드라이버 한계)
+TILE_SIDE_THRESHOLD = 16384
+
+# 모든 타일 아이템이 공유하는 디코딩 워커 풀
+_tile_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tile")
+
+
+def should_tile(image_size):
+    """이미지 크기(QSize)가 타일 표시 대상인지 확인"""
+    if not image_size.isValid():
+        return False
+    return (image_size.width() * image_size.height() > TILE_PIXEL_THRESHOLD or
+            max(image_size.width(), image_size.height()) > TILE_SIDE_THRESHOLD)
+
+
+class TileCache:
+    """(레벨, 열, 행) 키의 타일을 바이트 예산 안에서 보관하는 LRU 캐시"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            old = self._tiles.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.sizeInBytes()
+            self._tiles[key] = tile
+            self.current_bytes += tile.sizeInBytes()
+            while self.current_bytes > self.max_bytes and len(self._tiles) > 1:
+                _, evicted = self._tiles.popitem(last=False)
+                self.current_bytes -= evicted.sizeInBytes()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tiles)
+
+
+class TiledImageItem(QGraphicsObject):
+    """보이는 영역의 타일만 줌 레벨에 맞는 해상도로 디코딩하는 피라미드 이미지 아이템
+
+    씬 좌표는 원본 픽셀 좌표와 같으므로 라벨/오버레이 계산은 QPixmap 아이템과 동일하다.
+    레벨 L의 타일은 원본 (tile_size * 2^L) 영역을 tile_size 크기로 축소 디코딩한 것이다.
+    영역 디코딩(ClipRect)을 지원하지 않는 형식(PNG 등)은 전체를 디코딩할 때 그때 요청된 타일을 모두 잘라
+    타일 캐시에 넣고 전체 이미지는 바로 버린다 (메모리는 타일 캐시 예산 + 디코딩 중인 한 장).
+    전체 디코딩은 QImageReader 할당 한도(전역 설정, 바꾸지 않음) 안에서만 가능하다.
+    """
+    # 타일 디코딩 완료 시그널 (레벨, 열, 행)
+    tile_loaded = Signal(int, int, int)
+
+    def __init__(self, image_path, image_size=None, tile_size=512, max_bytes=256 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.image_path = image_path
+        self.image_size = image_size if image_size is not None else QImageReader(image_path).size()
+        self.tile_size = tile_size
+        self.cache = TileCache(max_bytes)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._current_level = None
+        self.supports_clip_rect = QImageReader(image_path).supportsOption(QImageIOHandler.ClipRect)
+        # ClipRect 미지원 형식의 전체 디코딩을 작업 스레드 사이에서 한 번에 하나만 (GUI 스레드는 잡지 않음)
+        self._full_decode_lock = threading.Lock()
+
+        longest = max(self.image_size.width(), self.image_size.height(), 1)
+        # 가장 거친 레벨은 타일 한 장에 전체 이미지가 들어가는 레벨
+        self.max_level = max(0, math.ceil(math.log2(longest / tile_size)))
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.tile_loaded.connect(self._on_tile_loaded)
+        self._request_tile(self.max_level, 0, 0)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.image_size.width(), self.image_size.height())
+
+    def level_for_scale(self, scale):
+        """화면 배율에 맞는 피라미드 레벨 (배율 1 이상이면 원본 레벨 0)"""
+        if scale <= 0:
+            return self.max_level
+        level = int(math.floor(math.log2(1 / scale))) if scale < 1 else 0
+        return max(0, min(self.max_level, level))
+
+    def tile_source_rect(self, level, col, row):
+        """타일이 덮는 원본 이미지 영역"""
+        extent = self.tile_size << level
+        rect = QRect(col * extent, row * extent, extent, extent)
+        return rect.intersected(QRect(0, 0, self.image_size.width(), self.image_size.height()))
+
+    def paint(self, painter, option, widget=None):
+        scale = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self.level_for_scale(scale)
+        if level != self._current_level:
+            self._current_level = level
+            self._cancel_pending(level)
+
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        if exposed.isEmpty():
+            return
+        extent = self.tile_size << level
+        first_col = int(exposed.left()) // extent
+        last_col = int(math.ceil(exposed.right())) // extent
+        first_row = int(exposed.top()) // extent
+        last_row = int(math.ceil(exposed.bottom())) // extent
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, scale < 1)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                source_rect = self.tile_source_rect(level, col, row)
+                if source_rect.isEmpty():
+                    continue
+                tile = self.cache.get((level, col, row))
+                if tile is not None:
+                    painter.drawImage(QRectF(source_rect), tile)
+                    continue
+                self._request_tile(level, col, row)
+                self._paint_fallback(painter, level, source_rect)
+
+    def _paint_fallback(self, painter, level, source_rect):
+        """고해상도 타일이 준비되기 전까지 더 거친 레벨 타일의 해당 부분을 늘려서 표시"""
+        for coarse_level in range(level + 1, self.max_level + 1):
+            extent = self.tile_size << coarse_level
+            col, row = source_rect.left() // extent, source_rect.top() // extent
+            tile = self.cache.get((coarse_level, col, row))
+            if tile is None:
+                continue
+            coarse_rect = self.tile_source_rect(coarse_level, col, row)
+            factor = 1 << coarse_level
+            part = QRectF((source_rect.left() - coarse_rect.left()) / factor,
+                          (source_rect.top() - coarse_rect.top()) / factor,
+                          source_rect.width() / factor, source_rect.height() / factor)
+            painter.drawImage(QRectF(source_rect), tile, part)
+            return
+
+    def _request_tile(self, level, col, row):
+        key = (level, col, row)
+        with self._lock:
+            if self._closed or key in self._pending:
+                return
+            self._pending[key] = _tile_executor.submit(self._decode_tile, key)
+
+    def _cancel_pending(self, keep_level):
+        """현재 레벨과 가장 거친 레벨을 제외한 대기 중 타일 요청 취소"""
+        with self._lock:
+            for key, future in list(self._pending.items()):
+                if key[0] not in (keep_level, self.max_level) and future.cancel():
+                    del self._pending[key]
+
+    def _decode_tile(self, key):
+        """워커 스레드에서 타일 영역만 축소 디코딩"""
+        level, col, row = key
+        try:
+            with self._lock:
+                if self._closed:
+                    return
+            # 다른 타일을 디코딩하며 함께 잘라 둔 타일
+            if self.cache.get(key) is not None:
+                return
+            if self.supports_clip_rect:
+                source_rect = self.tile_source_rect(level, col, row)
+                reader = QImageReader(self.image_path)
+                reader.setClipRect(source_rect)
+                reader.setScaledSize(self._tile_size_at(level, source_rect))
+                tile = reader.read()
+                if tile.isNull():
+                    print(f"Failed to decode tile {key} of {self.image_path}: {reader.errorString()}")
+                    return
+                self.cache.put(key, tile)
+            else:
+                self._cut_tiles_from_full_image(key)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+                closed = self._closed
+        if not closed:
+            try:
+                self.tile_loaded.emit(level, col, row)
+            except RuntimeError:
+                # 아이템이 씬에서 이미 삭제됨
+                pass
+
+    @staticmethod
+    def _tile_size_at(level, source_rect):
+        factor = 1 << level
+        return QSize(max(1, source_rect.width() // factor), max(1, source_rect.height() // factor))
+
+    def _cut_tiles_from_full_image(self, key):
+        """ClipRect 미지원 형식: 전체를 한 번 디코딩해 요청 타일과 대기 중인 타일을 모두 잘라 캐시에 넣고 전체 이미지는 버림"""
+        with self._full_decode_lock:
+            with self._lock:
+                if self._closed:
+                    return
+                keys = [key] + [pending_key for pending_key in self._pending if pending_key != key]
+            keys = [tile_key for tile_key in keys if self.cache.get(tile_key) is None]
+            if not keys:
+                return
+            reader = QImageReader(self.image_path)
+            full_image = reader.read()
+            if full_image.isNull():
+                print(f"Failed to decode tile {key} of {self.image_path}: {reader.errorString()}")
+                return
+            for level, col, row in keys:
+                with self._lock:
+                    if self._closed:
+                        return
+                source_rect = self.tile_source_rect(level, col, row)
+                self.cache.put((level, col, row), full_image.copy(source_rect).scaled(
+                    self._tile_size_at(level, source_rect), Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    def _on_tile_loaded(self, level, col, row):
+        self.update(QRectF(self.tile_source_rect(level, col, row)))
+
+    def read_region(self, x, y, width, height):
+        """원본 해상도의 일부 영역만 디코딩하여 QImage로 반환"""
+        rect = QRect(x, y, width, height).intersected(QRect(0, 0, self.image_size.width(), self.image_size.height()))
+        if rect.isEmpty():
+            return QImage()
+        # ClipRect 미지원 형식은 QImageReader가 전체를 디코딩한 뒤 잘라 줌 (결과만 남김)
+        reader = QImageReader(self.image_path)
+        reader.setClipRect(rect)
+        return reader.read()
+
+    def close(self):
+        """대기 중인 타일 요청을 모두 취소 (씬에서 제거하기 전에 호출)"""
+        with self._lock:
+            self._closed = True
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
@@ -0,0 +1,84 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class TreeExpander(QObject):
+    """트리 뷰의 최상위 항목(폴더 묶음)을 이벤트 루프를 막지 않고 조금씩 펼침
+
+    - 펼칠 목록은 모델이 이미 들고 있는 폴더 묶음 행이라 파일 시스템을 다시 읽지 않는다.
+    - 한 번에 frame_budget_ms 동안만 펼치고 이벤트 루프에 돌려줘 입력과 다시 그리기가 밀리지 않게 한다.
+    - cancel()로 언제든 멈출 수 있고, 모델이 초기화되면 스스로 멈춘다.
+    """
+    progress = Signal(int, int)  # (펼친 수, 전체 수)
+    finished = Signal(bool)  # 끝까지 펼쳤으면 True, 취소됐으면 False
+
+    def __init__(self, tree_view, frame_budget_ms=16, parent=None):
+        super().__init__(parent)
+        self.tree_view = tree_view
+        self.frame_budget = frame_budget_ms / 1000
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._expand_chunk)
+        self._model = None
+        self._next_row = 0
+        self._total = 0
+        self.max_chunk_ms = 0.0
+        self.chunks = 0
+
+    def is_running(self):
+        return self._model is not None
+
+    def start(self):
+        """최상위 항목 펼치기 시작 (이미 진행 중이면 처음부터 다시)"""
+        self.cancel()
+        model = self.tree_view.model()
+        if model is None:
+            return
+        self._model = model
+        self._model.modelReset.connect(self.cancel)
+        self._next_row = 0
+        self._total = model.rowCount(self.tree_view.rootIndex())
+        self.max_chunk_ms = 0.0
+        self.chunks = 0
+        self._timer.start()
+
+    def cancel(self):
+        """진행 중인 펼치기 중단 (이미 펼친 항목은 그대로 둠)"""
+        if self._model is None:
+            return
+        self._finish(False)
+
+    def _finish(self, completed):
+        self._timer.stop()
+        self._model.modelReset.disconnect(self.cancel)
+        self._model = None
+        self.finished.emit(completed)
+
+    def _expand_chunk(self):
+        started = time.perf_counter()
+        root = self.tree_view.rootIndex()
+        self._total = self._model.rowCount(root)
+        # 예산을 다 쓰면 이벤트 루프에 돌려줘 그 사이 입력 처리와 다시 그리기가 일어나게 함
+        while self._next_row < self._total and time.perf_counter() - started < self.frame_budget:
+            self.tree_view.expand(self._model.index(self._next_row, 0, root))
+            self._next_row += 1
+        self.max_chunk_ms = max(self.max_chunk_ms, (time.perf_counter() - started) * 1000)
+        self.chunks += 1
+        self.progress.emit(self._next_row, self._total)
+
+        if self._next_row >= self._total:
+            self._finish(True)
+            return
+        self._timer.start()
+
+    def stats(self):
+        """진행 상태와 가장 길었던 한 번의 펼치기 (ms)"""
+        return {
+            "running": self.is_running(),
+            "expanded": self._next_row,
+            "total": self._total,
+            "chunks": self.chunks,
+            "max_chunk_ms": self.max_chunk_ms,
+        }
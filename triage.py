@@ -0,0 +1,78 @@
+import time
+from collections import deque
+
+# 기본 단축키 -> 대상 폴더 접미사 ({데이터셋 폴더}{접미사})
+DEFAULT_BINS = {1: "_cut", 2: "_relabel", 3: "_hard"}
+
+
+def parse_bins(text):
+    """'1=_cut, 2=_relabel, 3=_hard' 형식을 {단축키: 접미사}로 변환 (잘못되면 ValueError)"""
+    bins = {}
+    for item in text.replace(';', ',').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        key, _, suffix = item.partition('=')
+        key, suffix = key.strip(), suffix.strip()
+        if not key.isdigit() or not 1 <= int(key) <= 9:
+            raise ValueError(f"단축키는 1~9: {item}")
+        if not suffix or '/' in suffix or '\\' in suffix:
+            raise ValueError(f"폴더 접미사가 올바르지 않음: {item}")
+        bins[int(key)] = suffix if suffix.startswith('_') else '_' + suffix
+    if not bins:
+        raise ValueError("분류 폴더가 하나도 없음")
+    return bins
+
+
+def format_bins(bins):
+    return ", ".join(f"{key}={suffix}" for key, suffix in sorted(bins.items()))
+
+
+class TriageStats:
+    """분류 폴더별 이동 수와 처리 속도 (장/시간)
+
+    - 이동이 끝난 것만 센다 (실패는 제외, 되돌리면 차감)
+    - 속도는 세션 전체 평균과 최근 window_seconds 동안의 속도 두 가지
+    """
+
+    def __init__(self, window_seconds=300):
+        self.window_seconds = window_seconds
+        self.counts = {}  # 접미사 -> 이동 수
+        self.started = None
+        self._recent = deque()  # 최근 이동 시각 (perf_counter)
+
+    def record(self, suffix, count=1):
+        now = time.perf_counter()
+        if self.started is None:
+            self.started = now
+        self.counts[suffix] = self.counts.get(suffix, 0) + count
+        for _ in range(count):
+            self._recent.append(now)
+
+    def record_undo(self, suffix):
+        if self.counts.get(suffix):
+            self.counts[suffix] -= 1
+
+    def images_per_hour(self):
+        """(세션 평균, 최근) 장/시간 - 시작 전이면 0"""
+        now = time.perf_counter()
+        while self._recent and now - self._recent[0] > self.window_seconds:
+            self._recent.popleft()
+        if self.started is None:
+            return 0.0, 0.0
+        total = sum(self.counts.values())
+        session_rate = total * 3600 / max(now - self.started, 1.0)
+        recent_span = min(self.window_seconds, max(now - self.started, 1.0))
+        return session_rate, len(self._recent) * 3600 / recent_span
+
+    def summary(self, bins):
+        """상태 표시줄 문구 - '1:_cut 12  2:_relabel 3 | 820/h (최근 1100/h)'"""
+        parts = [f"{key}:{suffix} {self.counts.get(suffix, 0)}" for key, suffix in sorted(bins.items())]
+        session_rate, recent_rate = self.images_per_hour()
+        return f"{'  '.join(parts)} | {session_rate:.0f}/h (최근 {recent_rate:.0f}/h)"
+
+    def stats(self):
+        session_rate, recent_rate = self.images_per_hour()
+        stats = {f"bin{suffix}": count for suffix, count in sorted(self.counts.items())}
+        stats.update({"per_hour": session_rate, "per_hour_recent": recent_rate})
+        return stats
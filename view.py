@@ -1,19 +1,31 @@
 import os
 import random
 from PySide6.QtWidgets import (QApplication, QMainWindow, QGraphicsView, QGraphicsScene,
-                               QGraphicsRectItem, QTreeView, QFileSystemModel, QSpinBox,
+                               QTreeView, QSpinBox,
                                QToolBar, QWidget, QSplitter, QMenu, QVBoxLayout, QLabel, QPushButton,
-                               QGraphicsPixmapItem, QHBoxLayout, QMessageBox, QFileDialog)
+                               QGraphicsPixmapItem, QHBoxLayout, QMessageBox, QFileDialog, QInputDialog,
+                               QProgressDialog)
 from PySide6.QtGui import QImage, QPixmap, QPen, QAction, QColor, QWheelEvent, QCursor, QGuiApplication, QShortcut, \
-    QKeySequence, QPainter, QTransform
-from PySide6.QtCore import Qt, QRectF, QFileInfo, QPoint, QPointF, QEvent
+    QKeySequence, QPainter, QTransform, QImageReader
+from PySide6.QtCore import Qt, QRectF, QFileInfo, QPoint, QPointF, QEvent, QTimer, Signal
 
+import box_geometry
+import label_matching
+from comparison_job import ComparisonJob
+from image_cache import read_proxy_image
 from image_list_window import ImageListWindow
+from navigation import Navigation, NavigationHistory
+from scene_layers import SceneLayers
+from tiled_image_item import TiledImageItem, should_tile
+from tree_expander import TreeExpander
+from zoom_box_renderer import ZoomBoxRenderer
 import numpy as np
 import cv2
-import re
 
 class CustomGraphicsView(QGraphicsView):
+    # 뷰 배율 변경 시그널 (씬 -> 화면 배율)
+    scale_changed = Signal(float)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -45,6 +57,7 @@ class CustomGraphicsView(QGraphicsView):
 
             # 이미지가 뷰어보다 작아졌을 경우 중앙에 배치
             self.centerImageIfNecessary()
+            self.scale_changed.emit(self.transform().m11())
         else:
             super().wheelEvent(event)
 
@@ -65,6 +78,7 @@ class CustomGraphicsView(QGraphicsView):
         """이미지를 뷰어에 맞추고 중앙에 배치"""
         super().fitInView(rect, mode)
         self.centerImageIfNecessary()
+        self.scale_changed.emit(self.transform().m11())
 
 
 class ImageViewerZoomHandler:
@@ -92,6 +106,7 @@ class ImageViewerZoomHandler:
         # 줌 레벨이 1.0 미만일 경우 중앙에 고정
         if self.zoom_level < 1.0:
             self.graphics_view.centerImageIfNecessary()
+        self.graphics_view.scale_changed.emit(self.graphics_view.transform().m11())
 
 
 class ImageViewerPanHandler:  # 패닝 핸들러 클래스 정의
@@ -145,6 +160,13 @@ class ImageViewerView(QMainWindow):
         self.graphics_view.setScene(self.graphics_scene)
         self.splitter.addWidget(self.graphics_view)
 
+        # 영구 씬 레이어 - 이미지 아이템 하나와 라벨 아이템 풀을 이미지마다 재사용
+        self.scene_layers = SceneLayers(self.graphics_scene,
+                                        QPen(QColor(173, 255, 47), 0.5),
+                                        QPen(QColor(255, 0, 0), 1),  # 빨간색 테두리
+                                        QPen(QColor(42, 172, 184), 1, Qt.DashLine))  # 청록색 테두리
+        self.current_image_rect = QRectF()
+
         # 오른쪽 레이아웃 설정
         self.right_widget = QWidget()
         self.right_layout = QVBoxLayout(self.right_widget)
@@ -175,31 +197,40 @@ class ImageViewerView(QMainWindow):
         self.zoom_box2_layout.addWidget(self.label_view2)
         self.zoom_box_layout.addLayout(self.zoom_box2_layout)
 
-        # 파일 시스템 모델 및 트리 뷰 설정 (탐색기)
-        self.file_model = QFileSystemModel()
-        self.file_model.setRootPath("")
+        # 줌 박스 렌더러 - 배율 변경 시 해당 박스만 다시 렌더링
+        self.zoom_box_renderer = ZoomBoxRenderer()
+        self.zoom_boxes = [(self.zoom_spinbox1, self.label_view1), (self.zoom_spinbox2, self.label_view2)]
+        self.zoom_focus_point = None
+        self.zoom_spinbox1.valueChanged.connect(lambda: self.update_zoom_box(0))
+        self.zoom_spinbox2.valueChanged.connect(lambda: self.update_zoom_box(1))
+
+        # 이미지 목록 모델 및 트리 뷰 설정 (탐색기) - 정렬은 데이터셋 인덱스에서 미리 끝남
+        self.image_list_model = self.controller.model.image_list_model
         self.tree_view = QTreeView()
-        self.tree_view.setModel(self.file_model)
+        self.tree_view.setModel(self.image_list_model)
+        # 트리 뷰가 자체 초기화를 마친 뒤 현재 이미지 위치를 맞추도록 setModel 다음에 연결
+        self.image_list_model.modelReset.connect(self.sync_tree_selection)
         self.tree_view.setRootIsDecorated(False)
-        self.tree_view.setSortingEnabled(True)
-        self.tree_view.sortByColumn(0, Qt.AscendingOrder)
-        self.tree_view.hideColumn(1)
-        self.tree_view.hideColumn(2)
-        self.tree_view.hideColumn(3)
+        self.tree_view.setUniformRowHeights(True)
         self.right_layout.addWidget(self.tree_view)
 
         self.splitter.addWidget(self.right_widget)
         self.splitter.setSizes([int(self.width() * 0.8), int(self.width() * 0.2)])
 
-        # 파일 필터 설정
-        self.file_model.setNameFilters(["*.png", "*.jpg", "*.jpeg"])
-        self.file_model.setNameFilterDisables(False)
-
         # 트리 뷰 열고 닫는 버튼
         self.tree_open_close_button = QPushButton("Tree Open/Close")
         self.tree_open_close_button.clicked.connect(self.toggle_tree_open_close)
+        self.tree_expander = TreeExpander(self.tree_view, parent=self)
+        self.tree_expander.progress.connect(self.on_tree_expand_progress)
+        self.tree_expander.finished.connect(self.on_tree_expand_finished)
         self.right_layout.addWidget(self.tree_open_close_button)
 
+        # 디버그 패널 (씬 아이템 / 캐시 통계)
+        self.debug_label = QLabel()
+        self.debug_label.setStyleSheet("font-family: monospace;")
+        self.debug_label.hide()
+        self.right_layout.addWidget(self.debug_label)
+
         # 줌 및 패닝 핸들러 초기화
         self.zoom_handler = ImageViewerZoomHandler(self.graphics_view)
         self.pan_handler = ImageViewerPanHandler(self.graphics_view)
@@ -225,9 +256,40 @@ class ImageViewerView(QMainWindow):
         self.save_shortcut = QShortcut(QKeySequence("Ctrl+S"), self)
         self.save_shortcut.activated.connect(self.save_overlay_image)
 
+        # 분류 단축키 1~9 (지정한 분류 폴더로 현재 이미지 이동)
+        self.triage_shortcuts = []
+        for key in range(1, 10):
+            shortcut = QShortcut(QKeySequence(str(key)), self)
+            shortcut.activated.connect(lambda key=key: self.controller.route_to_bin(key))
+            self.triage_shortcuts.append(shortcut)
+        self.triage_label = QLabel()
+        self.statusBar().addPermanentWidget(self.triage_label)
+        self.triage_timer = QTimer(self)
+        self.triage_timer.setInterval(5000)
+        self.triage_timer.timeout.connect(self.update_triage_status)
+        self.triage_timer.start()
+
         # 회전
         self.current_rotation = 0
 
+        # 초대형 이미지용 타일 아이템
+        self.tiled_image_item = None
+        self.current_pixmap = None
+
+        # 탐색 1회당 한 번 디코딩한 프레임 (QImage / NumPy 뷰 / QPixmap 공유)
+        self.current_frame = None
+        self.current_label_path = None
+        # 이미지 이동 단계별 소요 시간
+        self.navigation_history = NavigationHistory()
+
+        # 점진 표시: 축소본을 먼저 그리고 원본으로 교체
+        self.pixmap_item = self.scene_layers.pixmap_item
+        self.proxy_scale = 1.0  # 원본 크기 / 표시 중인 축소본 크기
+        self.proxy_transform = QTransform()
+        self.progressive_display = True
+        self.full_resolution_on_zoom_only = False
+        self.graphics_view.scale_changed.connect(self.on_view_scale_changed)
+
         # 미리보기
         self.preview_item = None
         self.graphics_view.viewport().installEventFilter(self)
@@ -240,17 +302,18 @@ class ImageViewerView(QMainWindow):
 
         # 추가 라벨 관련 변수
         self.additional_labels_visible = True
-        self.additional_label_items = []
         self.additional_label_dir = None
 
         # 초기화: 추가 라벨 2 관련 변수
         self.additional_labels_visible_2 = True  # 두 번째 라벨의 표시 여부
-        self.additional_label_items_2 = []  # 두 번째 라벨 아이템 리스트
         self.additional_label_dir_2 = None  # 두 번째 라벨 디렉토리
 
+        # 백그라운드 라벨 비교 작업과 진행 창
+        self.comparison_job = None
+        self.comparison_progress_dialog = None
+
         # 라벨 설정
         self.labels_visible = True
-        self.label_items = []
 
         # 메뉴 및 툴바 설정
         self.setup_menu()
@@ -260,129 +323,122 @@ class ImageViewerView(QMainWindow):
         self.show()
 
     def compare_labels_in_paths(self, main_folder, additional_folder, output_file, threshold=0.7):
-        """메인 폴더와 추가 라벨 폴더에서 동일 이미지의 라벨을 비교하여 겹치지 않거나 라벨 수가 다르면 기록"""
-
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff']
-        non_overlapping_image_paths = []
-
-        for root, dirs, files in os.walk(main_folder):
-            for file in files:
-                if os.path.splitext(file)[1].lower() in image_extensions:
-                    image_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(image_path, main_folder)
-
-                    # 메서드가 클래스 내에 있다면 self를 붙여야 합니다
-                    main_label_path = self.controller.model.get_label_path(image_path)
-                    additional_label_path = os.path.join(additional_folder, relative_path)
-                    additional_label_path = os.path.splitext(additional_label_path)[0] + '.txt'
-
-                    # 라벨 로드
-                    main_labels = self.load_labels(main_label_path)
-                    additional_labels = self.load_labels(additional_label_path)
-
-                    # 라벨 개수가 다르거나 라벨이 70% 이상 겹치지 않으면 기록
-                    if len(main_labels) != len(additional_labels) or not self.labels_overlap_by_percentage(
-                            main_labels, additional_labels, threshold):
-                        non_overlapping_image_paths.append(image_path)
-
-        # 텍스트 파일로 결과 저장
-        with open(output_file, 'w') as f:
-            for path in non_overlapping_image_paths:
-                f.write(path + '\n')
-        print(f"파일이 저장되었습니다: {output_file}")
-
+        """메인 폴더와 추가 라벨 폴더에서 동일 이미지의 라벨을 비교하여 겹치지 않거나 라벨 수가 다르면 기록 (백그라운드 작업)"""
+        return self.start_comparison_job(label_matching.MODE_OVERLAP, main_folder, additional_folder,
+                                         output_file, threshold)
+
+    def start_comparison_job(self, mode, main_folder, additional_folder, output_file, threshold):
+        """라벨 비교 작업 시작 - 진행 창(취소 버튼)을 띄우고 결과는 output_file에 바로바로 기록
+
+        진행 창은 모달이 아니므로 비교 중에도 이미지를 계속 볼 수 있다. 이미 실행 중이면 None
+        """
+        if self.comparison_job is not None and self.comparison_job.is_running():
+            QMessageBox.warning(self, "오류", "이미 라벨 비교가 실행 중입니다.")
+            return None
+
+        job = ComparisonJob(mode, main_folder, additional_folder, output_file, threshold, self)
+        progress_dialog = QProgressDialog("이미지 목록을 읽는 중...", "취소", 0, 0, self)
+        progress_dialog.setWindowTitle("라벨 비교")
+        progress_dialog.setWindowModality(Qt.NonModal)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.setMinimumDuration(0)
+        progress_dialog.canceled.connect(job.cancel)
+        job.progress.connect(self.on_comparison_progress)
+        job.finished.connect(self.on_comparison_finished)
+        job.failed.connect(self.on_comparison_failed)
+        self.comparison_job = job
+        self.comparison_progress_dialog = progress_dialog
+        progress_dialog.show()
+        job.start()
+        return job
+
+    def on_comparison_progress(self, done, total):
+        dialog = self.comparison_progress_dialog
+        if dialog is None or dialog.wasCanceled():
+            return
+        dialog.setMaximum(max(total, 1))
+        dialog.setValue(done)
+        dialog.setLabelText(f"라벨 비교 중... {done}/{total}")
+
+    def _close_comparison_progress(self):
+        if self.comparison_progress_dialog is not None:
+            # 취소 신호가 다시 나가지 않도록 연결을 끊고 닫음
+            self.comparison_progress_dialog.canceled.disconnect()
+            self.comparison_progress_dialog.close()
+            self.comparison_progress_dialog.deleteLater()
+            self.comparison_progress_dialog = None
+
+    def on_comparison_finished(self, completed):
+        self._close_comparison_progress()
+        job = self.comparison_job
+        title = "라벨 비교 완료" if completed else "라벨 비교 취소 (그때까지의 결과만 저장)"
+        QMessageBox.information(self, title, job.summary())
+
+    def on_comparison_failed(self, message):
+        self._close_comparison_progress()
+        QMessageBox.warning(self, "오류", f"라벨 비교에 실패했습니다: {message}")
+
+    def closeEvent(self, event):
+        """창을 닫을 때 라벨 비교를 중단하고 대기 중인 파일 이동을 끝까지 처리"""
+        if self.comparison_job is not None and self.comparison_job.is_running():
+            self.comparison_job.cancel()
+        self.controller.model.shutdown()
+        super().closeEvent(event)
 
     def load_labels(self, label_path):
         """라벨 파일에서 라벨을 로드"""
         labels = []
-        if not os.path.exists(label_path):
+        if not label_path or not os.path.exists(label_path):
             return labels  # 라벨 파일이 없으면 빈 리스트 반환
 
-        with open(label_path, 'r') as f:
-            lines = f.readlines()
-            for line in lines:
-                parts = line.strip().split()
-                if len(parts) == 5:
-                    class_id, x_center, y_center, width, height = map(float, parts)
-                    labels.append({
-                        'class_id': int(class_id),
-                        'x_center': x_center,
-                        'y_center': y_center,
-                        'width': width,
-                        'height': height
-                    })
+        for class_id, x_center, y_center, width, height in self.controller.model.load_labels(label_path).tolist():
+            labels.append({
+                'class_id': int(class_id),
+                'x_center': x_center,
+                'y_center': y_center,
+                'width': width,
+                'height': height
+            })
         return labels
 
     def labels_overlap(self, labels1, labels2):
         """두 라벨 세트 사이에 겹치는 라벨이 있는지 확인"""
-        for l1 in labels1:
-            for l2 in labels2:
-                if self.bounding_boxes_overlap(l1, l2):
-                    return True
-        return False
+        return bool(box_geometry.overlap_matrix(box_geometry.labels_to_array(labels1),
+                                                box_geometry.labels_to_array(labels2)).any())
 
     def bounding_boxes_overlap(self, box1, box2):
         """두 바운딩 박스가 겹치는지 확인"""
-        # YOLO 형식의 좌표를 바운딩 박스 좌표로 변환
-        x1_min = box1['x_center'] - box1['width'] / 2
-        x1_max = box1['x_center'] + box1['width'] / 2
-        y1_min = box1['y_center'] - box1['height'] / 2
-        y1_max = box1['y_center'] + box1['height'] / 2
-
-        x2_min = box2['x_center'] - box2['width'] / 2
-        x2_max = box2['x_center'] + box2['width'] / 2
-        y2_min = box2['y_center'] - box2['height'] / 2
-        y2_max = box2['y_center'] + box2['height'] / 2
-
-        # 겹치는 영역 계산
-        x_inter_min = max(x1_min, x2_min)
-        x_inter_max = min(x1_max, x2_max)
-        y_inter_min = max(y1_min, y2_min)
-        y_inter_max = min(y1_max, y2_max)
-
-        if x_inter_max <= x_inter_min or y_inter_max <= y_inter_min:
-            return False  # 겹치지 않음
-
-        return True  # 겹침
+        return bool(box_geometry.overlap_matrix(box_geometry.labels_to_array([box1]),
+                                                box_geometry.labels_to_array([box2]))[0, 0])
 
 
     def toggle_tree_open_close(self):
-        """트리뷰 열고 닫기 토글 메서드"""
-        root_index = self.tree_view.rootIndex()
-        if self.tree_view.isExpanded(root_index):
+        """트리뷰 열고 닫기 토글 메서드 (펼치는 중에 누르면 펼치기 취소)"""
+        if self.tree_expander.is_running():
+            self.tree_expander.cancel()
+            return
+        model = self.image_list_model
+        first_index = model.index(0, 0)
+        if first_index.isValid() and self.tree_view.isExpanded(first_index):
             self.collapse_all_items()
         else:
             self.expand_all_items()
 
     def expand_all_items(self):
-        """모든 항목을 확장"""
-        model = self.file_model
-        indexes_to_expand = [self.tree_view.rootIndex()]
-
-        while indexes_to_expand:
-            index = indexes_to_expand.pop(0)
-            if model.isDir(index):
-                # 디렉토리가 로드될 수 있도록 이벤트 루프 처리
-                if model.canFetchMore(index):
-                    model.fetchMore(index)
-                    QApplication.processEvents()
-                self.tree_view.expand(index)
-                for i in range(model.rowCount(index)):
-                    child_index = model.index(i, 0, index)
-                    indexes_to_expand.append(child_index)
+        """모든 폴더 묶음을 프레임 단위로 나눠 펼침 (이벤트 루프를 막지 않음)"""
+        self.tree_expander.start()
+
+    def on_tree_expand_progress(self, expanded, total):
+        self.tree_open_close_button.setText(f"Tree Open/Close ({expanded}/{total})")
+
+    def on_tree_expand_finished(self, completed):
+        self.tree_open_close_button.setText("Tree Open/Close")
 
     def collapse_all_items(self):
         """모든 항목을 축소"""
-        model = self.file_model
-        indexes_to_collapse = [self.tree_view.rootIndex()]
-
-        while indexes_to_collapse:
-            index = indexes_to_collapse.pop(0)
-            if model.isDir(index):
-                self.tree_view.collapse(index)
-                for i in range(model.rowCount(index)):
-                    child_index = model.index(i, 0, index)
-                    indexes_to_collapse.append(child_index)
+        self.tree_expander.cancel()
+        self.tree_view.collapseAll()
 
     def toggle_image_list_window(self):
         """이미지 리스트 윈도우 토글 메서드"""
@@ -431,8 +487,12 @@ class ImageViewerView(QMainWindow):
         save_image_path = os.path.join(save_dir, f"{file_name_without_ext}{ext}")
         save_txt_path = os.path.join(save_dir, f"{file_name_without_ext}.txt")
 
-        # 원본 이미지 로드
-        original_image = QImage(self.current_image_path)  # 원본 이미지 로드
+        # 원본 이미지 로드 (표시 중인 프레임 재사용)
+        self.upgrade_to_full_resolution()
+        if self.current_frame is not None:
+            original_image = self.current_frame.image
+        else:
+            original_image = QImage(self.current_image_path)
 
         # 원본 크기의 새 이미지 생성
         new_image = QImage(original_image.size(), QImage.Format_ARGB32)
@@ -462,7 +522,7 @@ class ImageViewerView(QMainWindow):
 
     def save_txt_file(self, save_txt_path):
         """텍스트 파일 저장 메서드"""
-        label_path = self.controller.model.get_label_path(self.current_image_path)
+        label_path = self.current_label_path
         scene_rect = self.graphics_scene.sceneRect()
         img_width = scene_rect.width()
         img_height = scene_rect.height()
@@ -489,6 +549,9 @@ class ImageViewerView(QMainWindow):
         dir_path = QFileDialog.getExistingDirectory(self, "추가 라벨 폴더 선택")
         if dir_path:
             self.additional_label_dir = dir_path
+            # 표시/비교 전에 라벨 파일 색인을 백그라운드에서 미리 읽음
+            self.controller.model.additional_label_index(dir_path)
+            self.scene_layers.additional_label_overlay.reset()
             if self.additional_labels_visible:
                 self.hide_additional_labels()
                 self.show_additional_labels()
@@ -502,52 +565,28 @@ class ImageViewerView(QMainWindow):
         self.additional_labels_visible = not self.additional_labels_visible
 
     def show_additional_labels(self):
-        """추가 라벨 표시"""
+        """추가 라벨 표시 (현재 이미지의 박스를 이미 불러왔으면 다시 읽지 않음)"""
         if not self.additional_label_dir:
             return  # 추가 라벨 경로가 설정되지 않았으면 아무 동작도 하지 않음
 
-        label_paths = self.get_additional_label_paths(self.current_image_path, self.additional_label_dir)
-        if label_paths:
-            for label_path in label_paths:
-                self.display_additional_labels(label_path)
+        overlay = self.scene_layers.additional_label_overlay
+        if overlay.loaded_path != self.current_image_path:
+            label_paths = self.get_additional_label_paths(self.current_image_path, self.additional_label_dir)
+            self.render_label_overlay(overlay, self.load_label_arrays(label_paths))
+        overlay.show()
 
     def hide_additional_labels(self):
         """추가 라벨 숨기기"""
-        for item in self.additional_label_items:
-            if item in self.graphics_scene.items():
-                self.graphics_scene.removeItem(item)
-        self.additional_label_items.clear()
-
-    def display_additional_labels(self, label_path):
-        """추가 라벨을 이미지에 표시"""
-        image_rect = self.graphics_scene.itemsBoundingRect()
-        image_width = image_rect.width()
-        image_height = image_rect.height()
-
-        try:
-            with open(label_path, 'r') as file:
-                for line in file:
-                    parts = line.strip().split()
-                    if len(parts) != 5:
-                        continue
-                    class_id, x_center, y_center, width, height = map(float, parts)
-                    rect_x = (x_center - width / 2) * image_width
-                    rect_y = (y_center - height / 2) * image_height
-                    rect_width = width * image_width + 2
-                    rect_height = height * image_height + 2
-                    rect = QGraphicsRectItem(QRectF(rect_x, rect_y, rect_width, rect_height))
-                    rect.setPen(QPen(QColor(255, 0, 0), 1))  # 빨간색 테두리로 설정
-                    rect.setZValue(1)  # Z-value를 높게 설정하여 앞쪽에 표시
-                    self.graphics_scene.addItem(rect)
-                    self.additional_label_items.append(rect)
-        except Exception as e:
-            print(f"추가 라벨 파일을 읽는 중 오류 발생: {e}")
+        self.scene_layers.additional_label_overlay.hide()
 
     def set_additional_label_path_2(self):
         """추가 라벨 경로 설정 2"""
         dir_path = QFileDialog.getExistingDirectory(self, "추가 라벨 폴더 선택 (2)")
         if dir_path:
             self.additional_label_dir_2 = dir_path
+            # 표시/비교 전에 라벨 파일 색인을 백그라운드에서 미리 읽음
+            self.controller.model.additional_label_index(dir_path)
+            self.scene_layers.additional_label_overlay_2.reset()
             if self.additional_labels_visible_2:
                 self.hide_additional_labels_2()
                 self.show_additional_labels_2()
@@ -561,47 +600,19 @@ class ImageViewerView(QMainWindow):
         self.additional_labels_visible_2 = not self.additional_labels_visible_2
 
     def show_additional_labels_2(self):
-        """추가 라벨 2 표시"""
+        """추가 라벨 2 표시 (현재 이미지의 박스를 이미 불러왔으면 다시 읽지 않음)"""
         if not self.additional_label_dir_2:
             return  # 추가 라벨 경로가 설정되지 않았으면 아무 동작도 하지 않음
 
-        label_paths = self.get_additional_label_paths(self.current_image_path, self.additional_label_dir_2)
-        if label_paths:
-            for label_path in label_paths:
-                self.display_additional_labels_2(label_path)
+        overlay = self.scene_layers.additional_label_overlay_2
+        if overlay.loaded_path != self.current_image_path:
+            label_paths = self.get_additional_label_paths(self.current_image_path, self.additional_label_dir_2)
+            self.render_label_overlay(overlay, self.load_label_arrays(label_paths))
+        overlay.show()
 
     def hide_additional_labels_2(self):
         """추가 라벨 2 숨기기"""
-        for item in self.additional_label_items_2:
-            if item in self.graphics_scene.items():
-                self.graphics_scene.removeItem(item)
-        self.additional_label_items_2.clear()
-
-    def display_additional_labels_2(self, label_path):
-        """추가 라벨 2을 이미지에 표시"""
-        image_rect = self.graphics_scene.itemsBoundingRect()
-        image_width = image_rect.width()
-        image_height = image_rect.height()
-
-        try:
-            with open(label_path, 'r') as file:
-                for line in file:
-                    parts = line.strip().split()
-                    if len(parts) != 5:
-                        continue
-                    class_id, x_center, y_center, width, height = map(float, parts)
-                    rect_x = (x_center - width / 2) * image_width
-                    rect_y = (y_center - height / 2) * image_height
-                    rect_width = width * image_width
-                    rect_height = height * image_height
-                    rect = QGraphicsRectItem(QRectF(rect_x, rect_y, rect_width, rect_height))
-                    rect.setPen(QPen(QColor(42, 172, 184), 1, Qt.DashLine))  # 청록색 테두리로 설정
-                    rect.setZValue(2)  # Z-value를 높게 설정하여 앞쪽에 표시
-                    self.graphics_scene.addItem(rect)
-                    self.additional_label_items_2.append(rect)
-        except Exception as e:
-            print(f"추가 라벨 파일을 읽는 중 오류 발생: {e}")
-
+        self.scene_layers.additional_label_overlay_2.hide()
 
     def setup_menu(self):
         """메뉴바 설정"""
@@ -617,6 +628,73 @@ class ImageViewerView(QMainWindow):
         file_menu.addMenu(self.recent_folders_menu)
         self.update_recent_folders_menu()
 
+        edit_menu = menu_bar.addMenu("Edit")
+
+        undo_move_action = QAction("Undo Move", self)
+        undo_move_action.setShortcut("Ctrl+Z")
+        undo_move_action.triggered.connect(self.controller.undo_move)
+        edit_menu.addAction(undo_move_action)
+
+        redo_move_action = QAction("Redo Move", self)
+        redo_move_action.setShortcuts([QKeySequence("Ctrl+Y"), QKeySequence("Ctrl+Shift+Z")])
+        redo_move_action.triggered.connect(self.controller.redo_move)
+        edit_menu.addAction(redo_move_action)
+
+        undo_session_moves_action = QAction("Undo All Moves In Session", self)
+        undo_session_moves_action.triggered.connect(self.controller.undo_session_moves)
+        edit_menu.addAction(undo_session_moves_action)
+
+        configure_triage_bins_action = QAction("Configure Triage Bins...", self)
+        configure_triage_bins_action.triggered.connect(self.controller.configure_triage_bins)
+        edit_menu.addAction(configure_triage_bins_action)
+
+        view_menu = menu_bar.addMenu("View")
+
+        progressive_display_action = QAction("Progressive Display", self)
+        progressive_display_action.setCheckable(True)
+        progressive_display_action.setChecked(self.progressive_display)
+        progressive_display_action.toggled.connect(self.toggle_progressive_display)
+        view_menu.addAction(progressive_display_action)
+
+        full_resolution_on_zoom_action = QAction("Load Full Resolution On Zoom Only", self)
+        full_resolution_on_zoom_action.setCheckable(True)
+        full_resolution_on_zoom_action.setChecked(self.full_resolution_on_zoom_only)
+        full_resolution_on_zoom_action.toggled.connect(self.toggle_full_resolution_on_zoom_only)
+        view_menu.addAction(full_resolution_on_zoom_action)
+
+        group_by_folder_action = QAction("Group Images By Folder", self)
+        group_by_folder_action.setCheckable(True)
+        group_by_folder_action.setChecked(self.image_list_model.grouped)
+        group_by_folder_action.toggled.connect(self.image_list_model.set_grouped)
+        view_menu.addAction(group_by_folder_action)
+
+        debug_panel_action = QAction("Debug Panel", self)
+        debug_panel_action.setCheckable(True)
+        debug_panel_action.toggled.connect(self.toggle_debug_panel)
+        view_menu.addAction(debug_panel_action)
+
+        filter_menu = menu_bar.addMenu("Filter")
+
+        query_labels_action = QAction("Query Labels...", self)
+        query_labels_action.setShortcut("Ctrl+F")
+        query_labels_action.triggered.connect(self.controller.query_labels)
+        filter_menu.addAction(query_labels_action)
+
+        clear_label_query_action = QAction("Clear Label Query", self)
+        clear_label_query_action.setShortcut("Ctrl+Shift+F")
+        clear_label_query_action.triggered.connect(self.controller.clear_label_query)
+        filter_menu.addAction(clear_label_query_action)
+
+        compare_menu = menu_bar.addMenu("Compare")
+
+        match_labels_action = QAction("Match Additional Labels...", self)
+        match_labels_action.triggered.connect(self.match_additional_labels)
+        compare_menu.addAction(match_labels_action)
+
+        non_overlapping_action = QAction("List Non-Overlapping Labels...", self)
+        non_overlapping_action.triggered.connect(self.generate_non_overlapping_label_list)
+        compare_menu.addAction(non_overlapping_action)
+
     def update_recent_folders_menu(self):
         "최근 폴더 메뉴 업데이트"
         self.recent_folders_menu.clear()
@@ -688,48 +766,12 @@ class ImageViewerView(QMainWindow):
 
     def bounding_boxes_overlap_percentage(self, box1, box2):
         """두 바운딩 박스가 겹치는 비율 계산"""
-        # YOLO 형식의 좌표를 바운딩 박스 좌표로 변환
-        x1_min = box1['x_center'] - box1['width'] / 2
-        x1_max = box1['x_center'] + box1['width'] / 2
-        y1_min = box1['y_center'] - box1['height'] / 2
-        y1_max = box1['y_center'] + box1['height'] / 2
-
-        x2_min = box2['x_center'] - box2['width'] / 2
-        x2_max = box2['x_center'] + box2['width'] / 2
-        y2_min = box2['y_center'] - box2['height'] / 2
-        y2_max = box2['y_center'] + box2['height'] / 2
-
-        # 겹치는 영역 계산
-        x_inter_min = max(x1_min, x2_min)
-        x_inter_max = min(x1_max, x2_max)
-        y_inter_min = max(y1_min, y2_min)
-        y_inter_max = min(y1_max, y2_max)
-
-        if x_inter_max <= x_inter_min or y_inter_max <= y_inter_min:
-            return 0  # 겹치지 않음
-
-        # 겹치는 면적 계산
-        inter_area = (x_inter_max - x_inter_min) * (y_inter_max - y_inter_min)
-
-        # 각 박스의 면적 계산
-        box1_area = (x1_max - x1_min) * (y1_max - y1_min)
-        box2_area = (x2_max - x2_min) * (y2_max - y2_min)
-
-        # 두 박스의 합집합 면적
-        union_area = box1_area + box2_area - inter_area
-
-        # 겹치는 비율 (IOU) 계산
-        overlap_percentage = inter_area / union_area
-        return overlap_percentage
+        return self.bounding_boxes_iou(box1, box2)
 
     def labels_overlap_by_percentage(self, labels1, labels2, threshold=0.7):
-        """두 라벨 세트가 한쪽이라도 70% 이상 겹치는지 확인"""
-        for l1 in labels1:
-            for l2 in labels2:
-                overlap_percentage = self.bounding_boxes_overlap_percentage(l1, l2)
-                if overlap_percentage >= threshold:
-                    return True
-        return False
+        """두 라벨 세트가 한쪽이라도 70% 이상 겹치는지 확인 (딕셔너리 목록 또는 (N, 5) 배열)"""
+        return box_geometry.any_iou_at_least(box_geometry.labels_to_array(labels1),
+                                             box_geometry.labels_to_array(labels2), threshold)
 
     # def labels_overlap_by_percentage(self, labels1, labels2, threshold):
     #     """두 라벨 세트가 겹치는지 확인"""
@@ -742,7 +784,7 @@ class ImageViewerView(QMainWindow):
 
 
     def generate_non_overlapping_label_list(self):
-        """라벨이 한쪽이라도 70% 이상 겹치지 않거나 라벨의 개수가 다른 이미지들의 경로를 텍스트 파일로 저장"""
+        """라벨이 한쪽이라도 70% 이상 겹치지 않거나 라벨의 개수가 다른 이미지들의 경로를 텍스트 파일로 저장 (백그라운드 작업)"""
         main_folder = self.controller.model.folder_path
         additional_folder = self.additional_label_dir
 
@@ -750,116 +792,277 @@ class ImageViewerView(QMainWindow):
             QMessageBox.warning(self, "오류", "메인 폴더와 추가 라벨 폴더를 모두 설정해야 합니다.")
             return
 
-        # 메인 폴더의 이미지 파일 리스트 가져오기
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff']
-        image_files = []
-        for root, dirs, files in os.walk(main_folder):
-            for file in files:
-                if os.path.splitext(file)[1].lower() in image_extensions:
-                    image_files.append(os.path.join(root, file))
-
-        # 이미지의 기본 파일명을 기준으로 중복 체크하기 위해 사용
-        unique_base_names = set()
-        non_overlapping_image_paths = []
-
-        for image_path in image_files:
-            # 이미지의 상대 경로 계산
-            relative_path = os.path.relpath(image_path, main_folder)
-
-            # 파일명에서 접미사 제거 (예: '_conf', '_TP', '_FP' 등)
-            base_name, _ = os.path.splitext(os.path.basename(relative_path))
-            base_name_clean = re.sub(r'(_conf\d+)?(_TP|_FP)?$', '', base_name)
-
-            # 만약 해당 기본 파일명이 이미 처리된 적이 있다면 비슷한 패턴으로 간주하여 건너뜀
-            if base_name_clean in unique_base_names:
-                continue
-
-            # 현재 기본 파일명을 기록하여 이후 중복 체크에 사용
-            unique_base_names.add(base_name_clean)
+        # 결과를 비교하는 동안 바로 기록하므로 저장 위치를 먼저 받음
+        output_file, _ = QFileDialog.getSaveFileName(self, "파일 저장", "", "텍스트 파일 (*.txt)")
+        if output_file:
+            self.start_comparison_job(label_matching.MODE_NON_OVERLAPPING, main_folder, additional_folder,
+                                      output_file, 0.7)
 
-            # 라벨 파일 경로 생성
-            main_label_path = self.controller.model.get_label_path(image_path)
-            additional_label_paths = self.get_additional_label_paths(image_path)
+    def match_additional_labels(self):
+        """메인 라벨(정답)과 추가 라벨 1을 클래스별 일대일 매칭해 이미지별 매칭/누락/추가 수를 CSV로 저장하고 정밀도/재현율 표시"""
+        main_folder = self.controller.model.folder_path
+        additional_folder = self.additional_label_dir
 
-            # 메인 라벨 파일이 없으면 건너뜀
-            if not os.path.exists(main_label_path):
-                continue
+        if not main_folder or not additional_folder:
+            QMessageBox.warning(self, "오류", "메인 폴더와 추가 라벨 폴더를 모두 설정해야 합니다.")
+            return
 
-            # 메인 라벨 파일 로드
-            main_labels = self.load_labels(main_label_path)
-
-            # 추가 라벨 파일들과 비교
-            has_overlap = False
-            for additional_label_path in additional_label_paths:
-                if os.path.exists(additional_label_path):
-                    additional_labels = self.load_labels(additional_label_path)
-                    if len(main_labels) == len(additional_labels) and self.labels_overlap_by_percentage(main_labels,
-                                                                                                        additional_labels,
-                                                                                                        0.7):
-                        has_overlap = True
-                        break
-
-            # 겹치는 라벨이 없는 경우에만 파일 경로를 추가
-            if not has_overlap:
-                non_overlapping_image_paths.append(image_path)
-
-        # 텍스트 파일로 저장
-        output_file, _ = QFileDialog.getSaveFileName(self, "파일 저장", "", "텍스트 파일 (*.txt)")
+        threshold, ok = QInputDialog.getDouble(self, "라벨 매칭", "매칭 IoU 기준:",
+                                               label_matching.DEFAULT_MATCH_IOU, 0.05, 1.0, 2)
+        if not ok:
+            return
+        output_file, _ = QFileDialog.getSaveFileName(self, "매칭 결과 저장", "", "CSV 파일 (*.csv)")
         if output_file:
-            with open(output_file, 'w') as f:
-                for path in non_overlapping_image_paths:
-                    f.write(path + '\n')
-            QMessageBox.information(self, "완료", f"파일이 저장되었습니다: {output_file}")
+            self.start_comparison_job(label_matching.MODE_MATCH, main_folder, additional_folder, output_file, threshold)
 
     def update_tree_view(self, folder_path):
-        """트리 뷰 업데이트"""
-        self.tree_view.setRootIndex(self.file_model.index(folder_path))
+        """트리 뷰 업데이트 - 목록은 데이터셋 인덱스를 따르므로 현재 이미지 위치만 맞춤"""
+        self.sync_tree_selection()
 
     def display_image(self, image_path):
-        """이미지 표시"""
+        """이미지 표시 - 경로 결정, 이미지 로드, 라벨 로드, 렌더링을 각각 한 번씩 실행"""
         self.current_image_path = image_path
-        image = QImage(image_path)
-        self.current_pixmap = QPixmap.fromImage(image)
-        self.graphics_scene.clear()
-        self.graphics_scene.addPixmap(self.current_pixmap)
-        self.graphics_view.fitInView(self.graphics_scene.itemsBoundingRect(), Qt.KeepAspectRatio)
+        navigation = Navigation(image_path)
+
+        with navigation.stage("resolve"):
+            self.resolve_navigation_paths(navigation)
+        with navigation.stage("load_image"):
+            self.load_navigation_image(image_path)
+        with navigation.stage("load_labels"):
+            self.load_navigation_labels(navigation)
+        with navigation.stage("render"):
+            self.render_navigation(navigation)
+
+        self.navigation_history.add(navigation)
+        self.sync_tree_selection()
+        self.update_debug_panel()
+
+    def resolve_navigation_paths(self, navigation):
+        """현재 이미지의 라벨 경로 결정 (표시 중인 추가 라벨 소스만)"""
+        image_path = navigation.image_path
+        navigation.label_path = self.controller.model.get_label_path(image_path)
+        self.current_label_path = navigation.label_path
+        self.controller.model.watch_label_file(navigation.label_path)
+        if self.additional_labels_visible and self.additional_label_dir:
+            navigation.additional_label_paths = self.get_additional_label_paths(image_path, self.additional_label_dir)
+        if self.additional_labels_visible_2 and self.additional_label_dir_2:
+            navigation.additional_label_paths_2 = self.get_additional_label_paths(image_path,
+                                                                                  self.additional_label_dir_2)
+
+    def load_navigation_image(self, image_path):
+        """이미지를 씬에 올리고 뷰를 맞춤 (이전 이미지의 타일/프레임/스탬프 정리)"""
+        if self.tiled_image_item is not None:
+            self.tiled_image_item.close()
+            self.graphics_scene.removeItem(self.tiled_image_item)
+            self.tiled_image_item = None
+        if self.current_frame is not None:
+            self.current_frame.release_pixmap()
+            self.current_frame = None
+        self.proxy_scale = 1.0
+        self.proxy_transform = QTransform()
+        self.clear_overlay_items()
+
+        # 초대형 이미지는 보이는 타일만 디코딩
+        image_size = QImageReader(image_path).size()
+        if should_tile(image_size):
+            self.current_pixmap = None
+            self.pixmap_item.hide()
+            self.pixmap_item.setPixmap(QPixmap())
+            self.tiled_image_item = TiledImageItem(image_path, image_size)
+            self.tiled_image_item.setZValue(-1)
+            self.graphics_scene.addItem(self.tiled_image_item)
+            self.current_image_rect = self.tiled_image_item.boundingRect()
+        else:
+            # 이미지 아이템은 재사용하고 픽스맵만 교체
+            self.current_pixmap = self.load_display_pixmap(image_path)
+            self.pixmap_item.setPixmap(self.current_pixmap)
+            # 축소본도 씬 좌표는 원본 픽셀 기준으로 유지
+            self.pixmap_item.setTransform(self.proxy_transform)
+            self.pixmap_item.show()
+            self.current_image_rect = self.pixmap_item.sceneBoundingRect()
+        self.controller.model.prefetch_around(image_path)
+        self.graphics_view.fitInView(self.current_image_rect, Qt.KeepAspectRatio)
         self.zoom_handler.zoom_level = 1.0
         self.restore_scroll_position()
 
-        label_path = self.controller.model.get_label_path(image_path)
-        self.display_label_focused_image(image_path, label_path)
+    def load_navigation_labels(self, navigation):
+        """표시할 라벨 소스의 배열 읽기 (메인 라벨은 줌 박스 초점에도 사용)"""
+        navigation.labels = self.load_label_arrays([navigation.label_path])
+        if self.additional_labels_visible and self.additional_label_dir:
+            navigation.additional_labels = self.load_label_arrays(navigation.additional_label_paths)
+        if self.additional_labels_visible_2 and self.additional_label_dir_2:
+            navigation.additional_labels_2 = self.load_label_arrays(navigation.additional_label_paths_2)
+
+    def render_navigation(self, navigation):
+        """라벨 오버레이와 줌 박스 갱신"""
+        layers = self.scene_layers
+        # 이전 이미지의 라벨 박스 비우기
+        for overlay in layers.overlays():
+            overlay.reset()
+            overlay.hide()
 
-        # 기존 라벨 표시
-        self.hide_labels()
         if self.labels_visible:
-            self.show_labels()
+            self.render_label_overlay(layers.label_overlay, navigation.labels)
+        if navigation.additional_labels is not None:
+            self.render_label_overlay(layers.additional_label_overlay, navigation.additional_labels)
+        if navigation.additional_labels_2 is not None:
+            self.render_label_overlay(layers.additional_label_overlay_2, navigation.additional_labels_2)
 
-        # 추가 라벨 표시 - 추가 라벨 경로가 설정된 경우에만 동작
-        self.hide_additional_labels()
-        if self.additional_labels_visible and self.additional_label_dir:
-            self.show_additional_labels()  # 경로가 없으면 호출되지 않음
+        self.zoom_focus_point = self.label_focus_point(navigation.labels)
+        self.render_zoom_boxes()
 
-        # 추가 라벨 2 표시 - 추가 라벨 경로가 설정된 경우에만 동작
-        self.hide_additional_labels_2()
-        if self.additional_labels_visible_2 and self.additional_label_dir_2:
-            self.show_additional_labels_2()
+        try:
+            if self.preview_item:
+                self.preview_item.hide()
+        except RuntimeError:
+            self.preview_item = None
 
-        valid_items = []
+    def load_label_arrays(self, label_paths):
+        """라벨 파일 목록을 (N, 5) 배열 목록으로 읽기 (없는 경로는 건너뜀)"""
+        label_arrays = []
+        for label_path in label_paths:
+            if not label_path:
+                continue
+            try:
+                label_arrays.append(self.controller.model.load_labels(label_path))
+            except Exception as e:
+                print(f"Error reading label file: {e}")
+        return label_arrays
+
+    def render_label_overlay(self, overlay, label_arrays):
+        """오버레이를 현재 이미지의 라벨 배열로 채우고 표시"""
+        overlay.reset()
+        overlay.loaded_path = self.current_image_path
+        for labels in label_arrays:
+            overlay.append_boxes(labels, self.current_image_rect)
+        overlay.show()
+
+    def clear_overlay_items(self):
+        """이전 이미지에 찍은 오버레이(스탬프) 아이템 제거 - 스탬프는 해당 이미지에만 속함"""
         for item in self.overlay_items:
             try:
-                _ = item.pos()
-                self.graphics_scene.addItem(item)
-                valid_items.append(item)
+                self.graphics_scene.removeItem(item)
             except RuntimeError:
                 pass
+            self.controller.overlay_data.pop(item, None)
+        self.overlay_items = []
 
-        self.overlay_items = valid_items
+    def update_triage_status(self):
+        """분류 폴더별 이동 수와 처리 속도 표시"""
+        model = self.controller.model
+        self.triage_label.setText(model.triage_stats.summary(model.triage_bins))
 
-        try:
-            if self.preview_item:
-                self.preview_item.hide()
-        except RuntimeError:
-            self.preview_item = None
+    def on_move_failed(self, image_path, error):
+        """이동하지 못한 이미지를 상태 표시줄에 알림 (목록에는 이미 되돌려 둠)"""
+        self.statusBar().showMessage(f"이동 실패: {os.path.basename(image_path)} ({error})", 10000)
+
+    def show_query_result(self, result):
+        """라벨 쿼리 결과 수를 상태 표시줄에 표시 (None이면 해제)"""
+        if result is None:
+            self.statusBar().showMessage("라벨 쿼리 해제")
+        else:
+            self.statusBar().showMessage(f"{result.query}: {len(result)}장 ({result.seconds * 1000:.1f} ms)")
+
+    def toggle_debug_panel(self, checked):
+        """디버그 패널 표시 전환"""
+        self.debug_label.setVisible(checked)
+        self.update_debug_panel()
+
+    def update_debug_panel(self):
+        """씬 아이템 수, 이미지/라벨 캐시 통계, 이동 단계별 소요 시간 표시"""
+        if not self.debug_label.isVisible():
+            return
+        scene_stats = self.scene_layers.stats()
+        cache_stats = self.controller.model.prefetcher.stats()
+        label_stats = self.controller.model.label_repository.stats()
+        navigation_stats = self.navigation_history.stats()
+        watcher_stats = self.controller.model.dataset_watcher.stats()
+        mover_stats = self.controller.model.file_mover.stats()
+        triage_stats = self.controller.model.triage_stats.stats()
+        expander_stats = self.tree_expander.stats()
+        comparison_stats = self.comparison_job.stats() if self.comparison_job is not None else {}
+        label_index = self.controller.model.additional_label_indexes.get(self.additional_label_dir)
+        label_index_stats = label_index.stats() if label_index is not None else {}
+        lines = [f"{key}: {value}" for key, value in scene_stats.items()]
+        for prefix, stats in (("cache", cache_stats), ("labels", label_stats), ("nav", navigation_stats),
+                              ("watch", watcher_stats), ("move", mover_stats),
+                              ("triage", triage_stats), ("expand", expander_stats),
+                              ("compare", comparison_stats), ("addlabel", label_index_stats)):
+            lines += [f"{prefix}_{key}: {value:.2f}" if isinstance(value, float) else f"{prefix}_{key}: {value}"
+                      for key, value in stats.items()]
+        self.debug_label.setText("\n".join(lines))
+
+    def on_dataset_changed(self, change):
+        """다른 프로세스가 현재 이미지의 라벨을 쓰거나 지웠으면 라벨만 다시 그림"""
+        image_path = getattr(self, 'current_image_path', None)
+        if not image_path:
+            return
+        label_path = image_path.rsplit('.', 1)[0] + ".txt"
+        if change.touches(label_path):
+            self.current_label_path = self.controller.model.get_label_path(image_path)
+            self.controller.model.watch_label_file(self.current_label_path)
+            overlay = self.scene_layers.label_overlay
+            overlay.reset()
+            if self.labels_visible:
+                self.show_labels()
+            else:
+                overlay.hide()
+            self.display_label_focused_image(image_path, self.current_label_path)
+        self.update_debug_panel()
+
+    def load_display_pixmap(self, image_path):
+        """표시할 QPixmap 로드 - 점진 표시 모드에서 캐시에 원본이 없으면 축소본을 먼저 반환"""
+        prefetcher = self.controller.model.prefetcher
+        if self.progressive_display and not prefetcher.is_cached(image_path):
+            target_size = self.graphics_view.viewport().size() * self.devicePixelRatioF()
+            result = read_proxy_image(image_path, target_size)
+            if result is not None:
+                proxy, full_size = result
+                self.proxy_scale = full_size.width() / proxy.width()
+                self.proxy_transform = QTransform.fromScale(self.proxy_scale,
+                                                            full_size.height() / proxy.height())
+                if not self.full_resolution_on_zoom_only:
+                    prefetcher.request(image_path)
+                return QPixmap.fromImage(proxy)
+        self.current_frame = prefetcher.get_frame(image_path)
+        return self.current_frame.pixmap() if self.current_frame is not None else QPixmap()
+
+    def upgrade_to_full_resolution(self):
+        """축소본을 원본 해상도 이미지로 교체"""
+        if self.proxy_scale == 1.0 or self.tiled_image_item is not None:
+            return
+        frame = self.controller.model.prefetcher.get_frame(self.current_image_path)
+        if frame is None:
+            return
+        self.current_frame = frame
+        self.current_pixmap = frame.pixmap()
+        self.pixmap_item.setPixmap(self.current_pixmap)
+        self.pixmap_item.setTransform(QTransform())
+        self.proxy_scale = 1.0
+        self.proxy_transform = QTransform()
+        # 원본이 준비될 때까지 미뤄 둔 줌 박스 표시
+        self.render_zoom_boxes()
+
+    def on_full_image_ready(self, image_path):
+        """백그라운드 원본 디코딩 완료 시 현재 이미지면 교체"""
+        if (self.proxy_scale != 1.0 and not self.full_resolution_on_zoom_only and
+                image_path == self.current_image_path):
+            self.upgrade_to_full_resolution()
+
+    def on_view_scale_changed(self, scale):
+        """축소본 해상도를 넘어 확대하면 원본으로 교체"""
+        if self.proxy_scale != 1.0 and scale * self.proxy_scale > 1.05:
+            self.upgrade_to_full_resolution()
+
+    def toggle_progressive_display(self, checked):
+        """점진 표시 모드 전환"""
+        self.progressive_display = checked
+        if not checked:
+            self.upgrade_to_full_resolution()
+
+    def toggle_full_resolution_on_zoom_only(self, checked):
+        """원본 교체 시점 전환 (백그라운드 즉시 / 확대 시에만)"""
+        self.full_resolution_on_zoom_only = checked
 
     def get_additional_label_paths(self, image_path, base_dir=None):
         # """이미지에 해당하는 추가 라벨 경로 목록 반환 (상대 경로 기반)"""
@@ -875,33 +1078,8 @@ class ImageViewerView(QMainWindow):
             # 모델의 folder_path가 설정되지 않은 경우, 현재 이미지의 상위 디렉토리를 사용
             main_folder_path = os.path.dirname(os.path.abspath(image_path))
 
-        # 원본 이미지의 상대 경로 계산
-        image_relative_path = os.path.relpath(image_path, main_folder_path)
-        ####
-        image_relative_dir = os.path.dirname(image_relative_path)
-        image_filename = os.path.basename(image_relative_path)
-        base_name, _ = os.path.splitext(image_filename)
-
-        # 파일명에서 접미사 제거
-        base_name_clean = re.sub(r'(_conf\d+)?(_TP|_FP)?$', '', base_name)
-
-        # 추가 라벨 경로에서 동일한 상대 경로를 가진 디렉토리 계산
-        label_dir = os.path.join(base_dir, image_relative_dir)
-
-        # 해당 디렉토리가 존재하는지 확인
-        if not os.path.exists(label_dir):
-            return []
-
-        # 해당 디렉토리에서 라벨 파일 검색
-        label_files = []
-        for f in os.listdir(label_dir):
-            if f.lower().endswith('.txt'):
-                label_base_name, _ = os.path.splitext(f)
-                label_base_name_clean = re.sub(r'(_conf\d+)?(_TP|_FP)?$', '', label_base_name)
-                if label_base_name_clean == base_name_clean:
-                    label_files.append(os.path.join(label_dir, f))
-
-        return label_files
+        # 추가 라벨 폴더 색인에서 같은 상대 폴더, 접미사를 뗀 이름이 같은 라벨 파일 조회
+        return self.controller.model.additional_label_index(base_dir).label_paths(image_path, main_folder_path)
 
     def toggle_labels(self):
         """라벨을 표시하거나 숨기는 메서드"""
@@ -912,64 +1090,48 @@ class ImageViewerView(QMainWindow):
         self.labels_visible = not self.labels_visible
 
     def show_labels(self):
-        """라벨을 표시하는 메서드"""
-        label_path = self.controller.model.get_label_path(self.current_image_path)
-        if label_path:
-            self.display_labels(label_path)
+        """라벨을 표시하는 메서드 (현재 이미지의 박스를 이미 불러왔으면 다시 읽지 않음)"""
+        overlay = self.scene_layers.label_overlay
+        if overlay.loaded_path != self.current_image_path:
+            self.render_label_overlay(overlay, self.load_label_arrays([self.current_label_path]))
+        overlay.show()
+
 
     def hide_labels(self):
         """라벨을 숨기는 메서드"""
-        for item in self.label_items:
-            if item in self.graphics_scene.items():
-                self.graphics_scene.removeItem(item)
-        self.label_items.clear()
-
-    def display_labels(self, label_path):
-        """레이블 표시"""
-        image_rect = self.graphics_scene.itemsBoundingRect()
-        image_width = image_rect.width()
-        image_height = image_rect.height()
-
-        try:
-            with open(label_path, 'r') as file:
-                for line in file:
-                    parts = line.split()
-                    if len(parts) != 5:
-                        continue
-                    class_id, x_center, y_center, width, height = map(float, parts)
-                    rect_x = (x_center - width / 2) * image_width
-                    rect_y = (y_center - height / 2) * image_height
-                    rect_width = width * image_width
-                    rect_height = height * image_height
-                    rect = QGraphicsRectItem(QRectF(rect_x, rect_y, rect_width, rect_height))
-                    rect.setPen(QPen(QColor(173, 255, 47), 0.5))
-                    self.graphics_scene.addItem(rect)
-                    self.label_items.append(rect)
-        except Exception as e:
-            print(f"Error reading label file: {e}")
+        self.scene_layers.label_overlay.hide()
 
     def get_current_image_path(self):
-        """현재 선택된 이미지 경로 반환"""
-        index = self.tree_view.currentIndex()
-        return self.file_model.filePath(index)
+        """현재 표시 중인 이미지 경로 반환 (없으면 트리 뷰에서 선택된 항목)"""
+        current_image_path = getattr(self, 'current_image_path', None)
+        if current_image_path:
+            return current_image_path
+        return self.image_list_model.image_path(self.tree_view.currentIndex())
 
     def select_next_image(self):
         """다음 이미지 선택"""
-        current_index = self.tree_view.currentIndex()
-        next_index = self.tree_view.indexBelow(current_index)
-        if next_index.isValid():
-            self.tree_view.setCurrentIndex(next_index)
-            return self.file_model.filePath(next_index)
-        return None
+        return self.select_neighbor_image(1)
 
     def select_previous_image(self):
         """이전 이미지 선택"""
-        current_index = self.tree_view.currentIndex()
-        previous_index = self.tree_view.indexAbove(current_index)
-        if previous_index.isValid():
-            self.tree_view.setCurrentIndex(previous_index)
-            return self.file_model.filePath(previous_index)
-        return None
+        return self.select_neighbor_image(-1)
+
+    def select_neighbor_image(self, step):
+        """목록 순서상 step만큼 떨어진 이미지 선택 (아직 노출되지 않은 페이지도 바로 선택)"""
+        image_path = self.image_list_model.neighbor_path(self.get_current_image_path(), step)
+        if image_path:
+            self.tree_view.setCurrentIndex(self.image_list_model.index_for_path(image_path))
+        return image_path
+
+    def sync_tree_selection(self):
+        """트리 뷰의 현재 항목을 표시 중인 이미지에 맞춤 (목록 교체/항목 제거 후)"""
+        image_path = getattr(self, 'current_image_path', None)
+        if not image_path or self.image_list_model.image_path(self.tree_view.currentIndex()) == image_path:
+            return
+        index = self.image_list_model.index_for_path(image_path)
+        if index.isValid():
+            self.tree_view.setCurrentIndex(index)
+            self.tree_view.scrollTo(index)
 
     def save_scroll_position(self):
         """스크롤 위치 저장"""
@@ -989,13 +1151,14 @@ class ImageViewerView(QMainWindow):
         if indexes:
             index = indexes[0]
             menu = QMenu()
-            folder_path = QFileInfo(self.file_model.filePath(index)).absolutePath()
+            item_path = index.data(Qt.UserRole)
+            folder_path = QFileInfo(item_path).absolutePath()
             copy_folder_path_action = QAction("Copy Folder Path", self)
             copy_folder_path_action.triggered.connect(lambda: self.copy_to_clipboard(folder_path))
             menu.addAction(copy_folder_path_action)
 
             copy_file_path_action = QAction("Copy File Path", self)
-            copy_file_path_action.triggered.connect(lambda: self.copy_to_clipboard(self.file_model.filePath(index)))
+            copy_file_path_action.triggered.connect(lambda: self.copy_to_clipboard(item_path))
             menu.addAction(copy_file_path_action)
 
             menu.exec_(QCursor.pos())
@@ -1059,9 +1222,15 @@ class ImageViewerView(QMainWindow):
         x = int(pos.x() - overlay_width / 2)
         y = int(pos.y() - overlay_height / 2)
 
-        background_region = self.current_pixmap.toImage().copy(x, y, overlay_width, overlay_height)
-
-        background_region_cv = self.qimage_to_cv2(background_region)
+        # 축소본 표시 중이면 원본 좌표와 맞지 않으므로 원본으로 교체
+        self.upgrade_to_full_resolution()
+        if self.current_frame is not None:
+            background_region_cv = self.current_frame.bgr_region(x, y, overlay_width, overlay_height)
+        elif self.tiled_image_item is not None:
+            background_region = self.tiled_image_item.read_region(x, y, overlay_width, overlay_height)
+            background_region_cv = self.qimage_to_cv2(background_region)
+        else:
+            return 0.0
         main_direction, _, _ = get_main_direction(background_region_cv)
         return np.degrees(main_direction)
 
@@ -1137,55 +1306,55 @@ class ImageViewerView(QMainWindow):
     def update_zoom(self):
         """새 뷰어 확대 비율 업데이트"""
         if hasattr(self, 'current_image_path') and self.current_image_path:
-            self.display_label_focused_image(self.current_image_path,
-                                             self.controller.model.get_label_path(self.current_image_path))
+            self.display_label_focused_image(self.current_image_path, self.current_label_path)
 
     def display_label_focused_image(self, image_path, label_path=None):
-        """라벨 이미지 중심 미리보기"""
+        """라벨 이미지 중심 미리보기 - 첫 번째 라벨 중심을 초점으로 두 줌 박스를 렌더링"""
         try:
-            image = QImage(image_path)
-            if image.isNull():
-                print(f"Failed to load image: {image_path}")
+            if not label_path:
                 return
-
-            if label_path:
-                image_width = image.width()
-                image_height = image.height()
-
-                zoom_spinboxes = [self.zoom_spinbox1, self.zoom_spinbox2]
-                label_views = [self.label_view1, self.label_view2]
-
-                for zoom_spinbox, label_view in zip(zoom_spinboxes, label_views):
-                    zoom_factor = zoom_spinbox.value() / 100
-                    scaled_image = image.scaled(image_width * zoom_factor, image_height * zoom_factor,
-                                                Qt.KeepAspectRatio)
-
-                    if label_path:
-                        with open(label_path, 'r') as file:
-                            for line in file:
-                                parts = line.split()
-                                if len(parts) != 5:
-                                    continue
-                                _, x_center, y_center, width, height = map(float, parts)
-
-                                center_x = x_center * image_width
-                                center_y = y_center * image_height
-
-                                crop_x = max(0, int(center_x * zoom_factor - 300))
-                                crop_y = max(0, int(center_y * zoom_factor - 300))
-                                crop_width = min(600, scaled_image.width() - crop_x)
-                                crop_height = min(600, scaled_image.height() - crop_y)
-
-                                cropped_image = scaled_image.copy(crop_x, crop_y, crop_width, crop_height)
-                                label_view.setPixmap(QPixmap.fromImage(cropped_image))
-                                label_view.setScaledContents(True)
-                                break
-                    else:
-                        label_view.setPixmap(QPixmap.fromImage(scaled_image))
-                        label_view.setScaledContents(True)
+            self.zoom_focus_point = self.label_focus_point(self.load_label_arrays([label_path]))
+            self.render_zoom_boxes()
         except Exception as e:
             print(f"Error displaying label-focused image: {e}")
 
+    @staticmethod
+    def label_focus_point(label_arrays):
+        """첫 번째 라벨의 중심 (x_center, y_center) - 라벨이 없으면 None"""
+        for labels in label_arrays:
+            if len(labels):
+                return float(labels[0, 1]), float(labels[0, 2])
+        return None
+
+    def render_zoom_boxes(self):
+        """모든 줌 박스를 현재 초점으로 다시 렌더링"""
+        for index in range(len(self.zoom_boxes)):
+            self.update_zoom_box(index)
+
+    def update_zoom_box(self, index):
+        """줌 박스 하나만 다시 렌더링 (파일 재디코딩 없이 원본 영역만 잘라 확대)"""
+        if self.zoom_focus_point is None or not getattr(self, 'current_image_path', None):
+            return
+        zoom_spinbox, label_view = self.zoom_boxes[index]
+        zoom_factor = zoom_spinbox.value() / 100
+        center_x, center_y = self.zoom_focus_point
+
+        if self.current_frame is not None and self.current_frame.image_path == self.current_image_path:
+            # 표시 중인 프레임 재사용
+            cropped_image = self.zoom_box_renderer.render(self.current_frame.image, center_x, center_y, zoom_factor)
+        elif self.tiled_image_item is not None or self.full_resolution_on_zoom_only:
+            # 원본 전체를 디코딩하지 않는 모드에서는 파일에서 해당 영역만 읽음
+            cropped_image = self.zoom_box_renderer.render_from_file(self.current_image_path,
+                                                                    center_x, center_y, zoom_factor)
+        else:
+            # 축소본 표시 중 - 원본 교체 시 다시 호출됨
+            return
+
+        if cropped_image.isNull():
+            return
+        label_view.setPixmap(QPixmap.fromImage(cropped_image))
+        label_view.setScaledContents(True)
+
     def eventFilter(self, source, event):
         """이벤트 조건 필터 처리"""
         if source == self.graphics_view.viewport():
@@ -1197,32 +1366,8 @@ class ImageViewerView(QMainWindow):
 
     def bounding_boxes_iou(self, box1, box2):
         """두 바운딩 박스의 IOU(Intersection Over Union)를 계산"""
-        x1_min = box1['x_center'] - box1['width'] / 2
-        x1_max = box1['x_center'] + box1['width'] / 2
-        y1_min = box1['y_center'] - box1['height'] / 2
-        y1_max = box1['y_center'] + box1['height'] / 2
-
-        x2_min = box2['x_center'] - box2['width'] / 2
-        x2_max = box2['x_center'] + box2['width'] / 2
-        y2_min = box2['y_center'] - box2['height'] / 2
-        y2_max = box2['y_center'] + box2['height'] / 2
-
-        # 겹치는 영역 계산
-        x_inter_min = max(x1_min, x2_min)
-        x_inter_max = min(x1_max, x2_max)
-        y_inter_min = max(y1_min, y2_min)
-        y_inter_max = min(y1_max, y2_max)
-
-        if x_inter_max <= x_inter_min or y_inter_max <= y_inter_min:
-            return 0.0  # 겹치지 않음
-
-        inter_area = (x_inter_max - x_inter_min) * (y_inter_max - y_inter_min)
-        box1_area = (x1_max - x1_min) * (y1_max - y1_min)
-        box2_area = (x2_max - x2_min) * (y2_max - y2_min)
-
-        # IOU 계산
-        iou = inter_area / (box1_area + box2_area - inter_area)
-        return iou
+        return float(box_geometry.iou_matrix(box_geometry.labels_to_array([box1]),
+                                             box_geometry.labels_to_array([box2]))[0, 0])
 
     #
     def update_preview(self, pos):
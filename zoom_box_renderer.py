@@ -0,0 +1,65 @@
+from PySide6.QtGui import QImage, QImageReader
+from PySide6.QtCore import Qt, QRect, QSize
+
+
+class ZoomBoxRenderer:
+    """줌 박스 렌더러 - 전체 이미지를 확대하지 않고 보일 영역만 잘라낸 뒤 그 영역만 확대
+
+    결과는 기존 방식(전체를 zoom_factor 배 확대 후 초점 주변 window_size 창을 잘라냄)과 같은 영역/크기이다.
+    """
+
+    def __init__(self, window_size=600):
+        self.window_size = window_size
+
+    def crop_geometry(self, image_width, image_height, center_x, center_y, zoom_factor):
+        """확대 좌표계의 잘라낼 창과 그에 대응하는 원본 영역 계산
+
+        반환값: (원본 영역 QRect, 확대된 원본 영역 안에서의 출력 창 QRect) - 영역이 비면 None
+        """
+        scaled_width = int(image_width * zoom_factor)
+        scaled_height = int(image_height * zoom_factor)
+        half = self.window_size // 2
+        crop_x = max(0, int(center_x * image_width * zoom_factor - half))
+        crop_y = max(0, int(center_y * image_height * zoom_factor - half))
+        crop_width = min(self.window_size, scaled_width - crop_x)
+        crop_height = min(self.window_size, scaled_height - crop_y)
+        if crop_width <= 0 or crop_height <= 0:
+            return None
+
+        # 확대 좌표 -> 원본 좌표 (경계 픽셀이 잘리지 않도록 바깥쪽으로 반올림)
+        left = int(crop_x / zoom_factor)
+        top = int(crop_y / zoom_factor)
+        right = min(image_width, int((crop_x + crop_width) / zoom_factor + 0.999))
+        bottom = min(image_height, int((crop_y + crop_height) / zoom_factor + 0.999))
+        source_rect = QRect(left, top, max(1, right - left), max(1, bottom - top))
+        window_rect = QRect(crop_x - int(left * zoom_factor), crop_y - int(top * zoom_factor), crop_width, crop_height)
+        return source_rect, window_rect
+
+    def render(self, image, center_x, center_y, zoom_factor):
+        """디코딩된 QImage에서 초점 주변 영역만 잘라 확대"""
+        geometry = self.crop_geometry(image.width(), image.height(), center_x, center_y, zoom_factor)
+        if geometry is None:
+            return QImage()
+        return self._scale_region(image.copy(geometry[0]), geometry[1], zoom_factor)
+
+    def render_from_file(self, image_path, center_x, center_y, zoom_factor):
+        """원본 전체를 디코딩하지 않고 파일에서 해당 영역만 읽어 확대 (타일/축소본 표시 중일 때)"""
+        reader = QImageReader(image_path)
+        image_size = reader.size()
+        if not image_size.isValid():
+            return QImage()
+        geometry = self.crop_geometry(image_size.width(), image_size.height(), center_x, center_y, zoom_factor)
+        if geometry is None:
+            return QImage()
+        reader.setClipRect(geometry[0])
+        region = reader.read()
+        if region.isNull():
+            return QImage()
+        return self._scale_region(region, geometry[1], zoom_factor)
+
+    @staticmethod
+    def _scale_region(region, window_rect, zoom_factor):
+        """잘라낸 원본 영역만 확대한 뒤 출력 창 부분을 반환"""
+        scaled = region.scaled(QSize(max(1, int(region.width() * zoom_factor)),
+                                     max(1, int(region.height() * zoom_factor))), Qt.IgnoreAspectRatio)
+        return scaled.copy(window_rect)